@@ -0,0 +1,174 @@
+"""Shared setup for the root-level unit tests."""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+import time
+from contextlib import ExitStack
+from importlib.abc import Loader
+from importlib.machinery import ModuleSpec
+from pathlib import Path
+from types import MappingProxyType, ModuleType, SimpleNamespace
+from typing import cast
+from unittest.mock import patch
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent / "scripts"
+
+
+def load_script_module(module_name: str, filename: str) -> ModuleType:
+    """Execute ``scripts/<filename>`` once per session, registered as ``module_name``."""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    # A path with a .py suffix always yields a spec with a source loader.
+    spec = cast(
+        ModuleSpec, importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / filename)
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        cast(Loader, spec.loader).exec_module(module)
+    except BaseException:
+        sys.modules.pop(module_name, None)
+        raise
+    return module
+
+
+# Test modules import these names rather than each resolving and executing the script.
+load_script_module("binja_cli_script", "binja-cli.py")
+load_script_module("binja_restart_script", "binja-restart.py")
+load_script_module("check_unicode_safety_script", "check_unicode_safety.py")
+
+
+# Switch values every CLI unit test starts from; modules override what they exercise.
+_APP_DEFAULTS = {
+    "server_url": "http://localhost:9009",
+    "request_timeout": 5.0,
+    "verbose": False,
+    "json_output": True,
+    "no_auto_errors": True,
+    "fail_on_new_errors": False,
+    "error_probe_count": 50,
+}
+
+_OPEN_DEFAULTS = {
+    "platform": None,
+    "view_type": None,
+    "no_click": False,
+    "inspect_only": False,
+    "wait_open_target": 0.5,
+    "wait_analysis": False,
+    "analysis_timeout": 120.0,
+}
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Make ``time.sleep`` advance a fake ``time.monotonic`` instead of blocking.
+
+    Returns a one-element list holding the current fake time, so poll/timeout loops run
+    instantly while still observing their deadlines.
+    """
+    now = [0.0]
+
+    def _sleep(seconds: float) -> None:
+        now[0] += max(0.0, seconds)
+
+    monkeypatch.setattr(time, "sleep", _sleep)
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def make_app():
+    """Factory for a ``BinaryNinjaCLI`` with test switch values (``**attrs`` override them).
+
+    Apps are built fresh rather than copied from a prototype: plumbum keeps switch values in a
+    per-instance ``__plumbum_switchattr_dict__`` that a shallow copy would share, and
+    ``copy.copy`` goes through ``Application.__new__``, which runs the CLI when called bare.
+    Construction costs tens of microseconds, so there is nothing to win back.
+    """
+    binja_cli = sys.modules["binja_cli_script"]
+
+    def _make(**attrs):
+        app = binja_cli.BinaryNinjaCLI("binja-mcp")
+        for name, value in {**_APP_DEFAULTS, **attrs}.items():
+            setattr(app, name, value)
+        return app
+
+    return _make
+
+
+@pytest.fixture
+def make_open_cmd():
+    """Factory for an ``open`` subcommand attached to ``app``."""
+    binja_cli = sys.modules["binja_cli_script"]
+
+    def _make(app, **attrs):
+        open_cmd = binja_cli.Open("open")
+        open_cmd.parent = app
+        for name, value in {**_OPEN_DEFAULTS, **attrs}.items():
+            setattr(open_cmd, name, value)
+        return open_cmd
+
+    return _make
+
+
+@pytest.fixture
+def mocked_app(app):
+    """``app`` with its server-facing methods mocked; tests set return values and side effects.
+
+    Defaults: the open preflight succeeds, error snapshots are skipped and requests return
+    ``None`` until configured.
+    """
+    with ExitStack() as stack:
+
+        def _mock(name, **kwargs):
+            return stack.enter_context(patch.object(app, name, **kwargs))
+
+        yield SimpleNamespace(
+            app=app,
+            request=_mock("_request"),
+            output=_mock("_output"),
+            capture_error_snapshot=_mock("_capture_error_snapshot", return_value=None),
+            ensure_server_for_open=_mock("_ensure_server_for_open", return_value={"ok": True}),
+        )
+
+
+# Scalar fields of a successful /ui/open contract; containers are built per payload because the
+# CLI appends to ``actions`` and rewrites ``warnings`` the way it would on a decoded response.
+_UI_OPEN_CONTRACT_SCALARS = MappingProxyType(
+    {"ok": True, "schema_version": 1, "endpoint": "/ui/open", "_api_version": 2}
+)
+
+
+@pytest.fixture
+def ui_open_contract():
+    """Factory for a successful ``/ui/open`` contract payload for ``filepath``.
+
+    Passing ``loaded_filename`` builds the variant where the server reports a different
+    loaded file, mirroring ``state`` and ``warnings`` into ``result`` as the plugin does.
+    """
+
+    def _make(
+        filepath: str, *, loaded_filename: str | None = None, warnings: tuple[str, ...] = ()
+    ) -> dict:
+        state = {"loaded_filename": filepath if loaded_filename is None else loaded_filename}
+        result = {"ok": True, "input": {"filepath": filepath}}
+        if loaded_filename is not None:
+            result["warnings"] = list(warnings)
+            result["state"] = dict(state)
+        return {
+            **_UI_OPEN_CONTRACT_SCALARS,
+            "actions": ["scheduled_open_workflow_on_main_thread"],
+            "warnings": list(warnings),
+            "errors": [],
+            "state": state,
+            "result": result,
+        }
+
+    return _make
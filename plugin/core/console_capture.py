@@ -4,6 +4,7 @@ Captures Python console output using the ScriptingOutputListener API
 """
 
 import threading
+import itertools
 from collections import deque
 from datetime import datetime
 from typing import List, Dict, Optional, Any
@@ -16,6 +17,9 @@ class MCPConsoleCapture:
     def __init__(self, max_entries: int = 10000):
         self.max_entries = max_entries
         self.output_buffer = deque(maxlen=max_entries)
+        # Monotonic ids (not buffer positions) so ``start_id`` stays meaningful once the
+        # deque starts dropping old entries.
+        self._next_id = itertools.count()
         self.lock = threading.RLock()
         self.listener = None
         self.is_registered = False
@@ -67,7 +71,7 @@ class MCPConsoleCapture:
         with self.lock:
             self.output_buffer.append(
                 {
-                    "id": len(self.output_buffer),
+                    "id": next(self._next_id),
                     "timestamp": datetime.now().isoformat(),
                     "type": output_type,  # 'output', 'error', 'warning', 'input'
                     "text": text,
@@ -163,7 +167,7 @@ class MCPConsoleCapture:
 
         # Mark where we are in the buffer before execution
         with self.lock:
-            start_id = len(self.output_buffer) - 1 if self.output_buffer else -1
+            start_id = self.output_buffer[-1]["id"] if self.output_buffer else -1
 
         # Add the input command to our buffer
         self.add_output("input", command)
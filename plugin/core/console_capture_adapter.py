@@ -2,7 +2,37 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import inspect
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+# Argument shapes to try, newest first: (positional args, keyword args) after ``command``.
+_CALL_SHAPES = (
+    lambda binary_view, timeout: ((), {"binary_view": binary_view, "timeout": timeout}),
+    lambda binary_view, timeout: ((binary_view,), {}),
+    lambda binary_view, timeout: ((), {}),
+)
+
+
+def _first_bindable_shape(signature: inspect.Signature, *leading: Any) -> Optional[Callable]:
+    for shape in _CALL_SHAPES:
+        args, kwargs = shape(None, 0.0)
+        try:
+            signature.bind(*leading, "", *args, **kwargs)
+        except TypeError:
+            continue
+        return shape
+    return None
+
+
+@lru_cache(maxsize=16)
+def _method_call_shape(func: Callable) -> Optional[Callable]:
+    """Call shape of a backend class's ``execute_command`` function, shared by its instances."""
+    try:
+        signature = inspect.signature(func)
+    except (TypeError, ValueError):
+        return None
+    return _first_bindable_shape(signature, None)
 
 
 class ConsoleCaptureAdapter:
@@ -10,6 +40,27 @@ class ConsoleCaptureAdapter:
 
     def __init__(self, backend: Any):
         self._backend = backend
+        self._call_shape = self._resolve_call_shape(getattr(backend, "execute_command", None))
+
+    @staticmethod
+    def _resolve_call_shape(execute_command: Any) -> Optional[Callable]:
+        """Pick the newest argument shape ``execute_command`` accepts, once per backend.
+
+        Returns None when the signature cannot be inspected (or nothing binds), in which
+        case ``execute_command`` falls back to trying each shape by calling it.
+        """
+        if execute_command is None:
+            return None
+        # The server builds an adapter per request around the same backend; bound methods
+        # are classified once per underlying function.
+        func = getattr(execute_command, "__func__", None)
+        if func is not None:
+            return _method_call_shape(func)
+        try:
+            signature = inspect.signature(execute_command)
+        except (TypeError, ValueError):
+            return None
+        return _first_bindable_shape(signature)
 
     def execute_command(
         self,
@@ -22,21 +73,16 @@ class ConsoleCaptureAdapter:
             raise RuntimeError("console capture backend does not support command execution")
 
         execute_command = self._backend.execute_command
-        errors = []
-
-        try:
-            return execute_command(command, binary_view=binary_view, timeout=timeout)
-        except TypeError as exc:
-            errors.append(str(exc))
+        if self._call_shape is not None:
+            args, kwargs = self._call_shape(binary_view, timeout)
+            return execute_command(command, *args, **kwargs)
 
-        try:
-            return execute_command(command, binary_view)
-        except TypeError as exc:
-            errors.append(str(exc))
-
-        try:
-            return execute_command(command)
-        except TypeError as exc:
-            errors.append(str(exc))
-            detail = "; ".join(errors)
-            raise RuntimeError(f"unsupported console backend execute_command signature: {detail}")
+        errors = []
+        for shape in _CALL_SHAPES:
+            args, kwargs = shape(binary_view, timeout)
+            try:
+                return execute_command(command, *args, **kwargs)
+            except TypeError as exc:
+                errors.append(str(exc))
+        detail = "; ".join(errors)
+        raise RuntimeError(f"unsupported console backend execute_command signature: {detail}")
@@ -4,6 +4,7 @@ Fallback implementation that doesn't require ScriptingOutputListener
 """
 
 import threading
+import itertools
 from collections import deque
 from datetime import datetime
 from typing import List, Dict, Optional, Any
@@ -16,6 +17,7 @@ class SimpleConsoleCapture:
     def __init__(self, max_entries: int = 10000):
         self.max_entries = max_entries
         self.output_buffer = deque(maxlen=max_entries)
+        self._next_id = itertools.count()
         self.lock = threading.RLock()
         self.is_registered = False
 
@@ -40,7 +42,7 @@ class SimpleConsoleCapture:
         with self.lock:
             self.output_buffer.append(
                 {
-                    "id": len(self.output_buffer),
+                    "id": next(self._next_id),
                     "timestamp": datetime.now().isoformat(),
                     "type": output_type,
                     "text": text,
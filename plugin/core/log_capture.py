@@ -7,6 +7,7 @@ import threading
 import os
 import tempfile
 import time
+import itertools
 from collections import deque
 from datetime import datetime
 from typing import List, Dict, Optional, Any
@@ -19,6 +20,9 @@ class MCPLogCapture:
     def __init__(self, max_entries: int = 10000):
         self.max_entries = max_entries
         self.logs = deque(maxlen=max_entries)
+        # Entry ids keep increasing after the bounded buffer starts evicting, so
+        # ``start_id`` filters stay correct.
+        self._next_id = itertools.count()
         self.lock = threading.RLock()
         self.is_registered = False
         self.log_file_path = None
@@ -77,7 +81,7 @@ class MCPLogCapture:
         with self.lock:
             self.logs.append(
                 {
-                    "id": len(self.logs),
+                    "id": next(self._next_id),
                     "timestamp": datetime.now().isoformat(),
                     "level": level,
                     "message": message,
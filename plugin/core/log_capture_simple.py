@@ -4,6 +4,7 @@ Fallback implementation that doesn't rely on LogListener
 """
 
 import threading
+import itertools
 from collections import deque
 from datetime import datetime
 from typing import List, Dict, Optional, Any
@@ -16,6 +17,7 @@ class SimpleLogCapture:
     def __init__(self, max_entries: int = 10000):
         self.max_entries = max_entries
         self.logs = deque(maxlen=max_entries)
+        self._next_id = itertools.count()
         self.lock = threading.RLock()
         self.is_registered = False
         self.original_functions = {}
@@ -86,7 +88,7 @@ class SimpleLogCapture:
         with self.lock:
             self.logs.append(
                 {
-                    "id": len(self.logs),
+                    "id": next(self._next_id),
                     "timestamp": datetime.now().isoformat(),
                     "level": level,
                     "message": message,
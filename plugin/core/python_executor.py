@@ -8,6 +8,7 @@ import traceback
 import ast
 import time
 import threading
+import itertools
 from contextlib import redirect_stdout, redirect_stderr
 from collections import deque
 from datetime import datetime
@@ -413,6 +414,7 @@ class EnhancedConsoleCapture:
     def __init__(self):
         self.executor = PythonExecutor()
         self.output_buffer = deque(maxlen=10000)
+        self._next_id = itertools.count()
         self.initialized = True
         bn.log_info("Enhanced Python console initialized")
 
@@ -445,7 +447,7 @@ class EnhancedConsoleCapture:
             for line in result["stdout"].splitlines():
                 self.output_buffer.append(
                     {
-                        "id": len(self.output_buffer),
+                        "id": next(self._next_id),
                         "timestamp": timestamp,
                         "type": "output",
                         "text": line,
@@ -457,7 +459,7 @@ class EnhancedConsoleCapture:
             for line in result["stderr"].splitlines():
                 self.output_buffer.append(
                     {
-                        "id": len(self.output_buffer),
+                        "id": next(self._next_id),
                         "timestamp": timestamp,
                         "type": "error",
                         "text": line,
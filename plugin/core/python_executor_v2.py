@@ -8,6 +8,7 @@ import ast
 import time
 import threading
 import queue
+import itertools
 from contextlib import redirect_stdout, redirect_stderr
 from collections import deque
 from datetime import datetime
@@ -623,6 +624,7 @@ class SmartConsoleCapture:
     def __init__(self):
         self.executor = SmartPythonExecutor()
         self.output_buffer = deque(maxlen=10000)
+        self._next_id = itertools.count()
         self.initialized = True
         self._server_context = None
 
@@ -665,7 +667,7 @@ class SmartConsoleCapture:
             for line in result["stdout"].splitlines():
                 self.output_buffer.append(
                     {
-                        "id": len(self.output_buffer),
+                        "id": next(self._next_id),
                         "timestamp": timestamp,
                         "type": "output",
                         "text": line,
@@ -676,7 +678,7 @@ class SmartConsoleCapture:
             for line in result["stderr"].splitlines():
                 self.output_buffer.append(
                     {
-                        "id": len(self.output_buffer),
+                        "id": next(self._next_id),
                         "timestamp": timestamp,
                         "type": "error",
                         "text": line,
@@ -15,7 +15,10 @@ try:
         expected_api_version,
         normalize_endpoint_path,
     )
-    from shared.endpoints_manifest import get_endpoint_registry_json
+    from shared.endpoints_manifest import (
+        get_endpoint_registry_json,
+        get_endpoint_registry_json_bytes,
+    )
 except ImportError:
     # Binary Ninja can import plugin modules with plugin/ as sys.path[0].
     repo_root = Path(__file__).resolve().parents[2]
@@ -29,7 +32,10 @@ except ImportError:
         expected_api_version,
         normalize_endpoint_path,
     )
-    from shared.endpoints_manifest import get_endpoint_registry_json
+    from shared.endpoints_manifest import (
+        get_endpoint_registry_json,
+        get_endpoint_registry_json_bytes,
+    )
 
 __all__ = [
     "DEFAULT_ENDPOINT_API_VERSION",
@@ -40,6 +46,7 @@ __all__ = [
     "expected_api_version",
     "normalize_endpoint_path",
     "get_endpoint_registry_json",
+    "get_endpoint_registry_json_bytes",
     "as_list",
     "as_contract_list",
     "as_dict",
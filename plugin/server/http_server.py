@@ -1,11 +1,12 @@
 from http.server import BaseHTTPRequestHandler, HTTPServer
+import gzip
 import json
 import urllib.parse
 import errno
 import os
 import time
 import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import binaryninja as bn
 import threading
 from ..core.binary_operations import BinaryOperations
@@ -17,7 +18,7 @@ from .api_contracts import (
     as_list,
     allows_missing_api_version,
     expected_api_version,
-    get_endpoint_registry_json,
+    get_endpoint_registry_json_bytes,
     normalize_endpoint_path,
     normalize_ui_contract,
 )
@@ -108,6 +109,26 @@ def get_active_log_capture():
     return _active_log_capture
 
 
+def _error_probe_payload(errors: List[Dict[str, Any]], start_id: Optional[int]) -> Dict[str, Any]:
+    """Build an ``/logs/errors`` or ``/console/errors`` body, keeping only ids above ``start_id``.
+
+    ``start_id`` is echoed only when every entry carries an integer id, so clients can tell an
+    incremental answer from a full one and fall back to diffing the latter.
+    """
+    if start_id is None or not all(
+        isinstance(entry, dict) and isinstance(entry.get("id"), int) for entry in errors
+    ):
+        return {"errors": errors}
+    return {"errors": [entry for entry in errors if entry["id"] > start_id], "start_id": start_id}
+
+
+# Bodies smaller than this are sent uncompressed; gzip framing would outweigh the savings.
+GZIP_MIN_BODY_BYTES = 1024
+
+# (path, key, payload bytes) -> (body, gzip body) for responses that never change.
+_STATIC_JSON_BODIES: Dict[tuple, tuple] = {}
+
+
 class MCPRequestHandler(BaseHTTPRequestHandler):
     binary_ops = None  # Will be set by the server
     mcp_server = None
@@ -127,9 +148,20 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
     def log_message(self, format, *args):
         bn.log_info(format % args)
 
-    def _set_headers(self, content_type="application/json", status_code=200):
+    def _set_headers(
+        self,
+        content_type="application/json",
+        status_code=200,
+        content_encoding=None,
+        content_length=None,
+    ):
         self.send_response(status_code)
         self.send_header("Content-Type", content_type)
+        if content_length is not None:
+            self.send_header("Content-Length", str(content_length))
+        if content_encoding:
+            self.send_header("Content-Encoding", content_encoding)
+            self.send_header("Vary", "Accept-Encoding")
         self.send_header("Access-Control-Allow-Origin", "*")
         path = urllib.parse.urlparse(self.path).path
         version = self._expected_api_version(path)
@@ -137,8 +169,41 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
         self.send_header("X-Binja-MCP-Endpoint", path)
         self.end_headers()
 
+    def _accepts_gzip(self) -> bool:
+        for item in str(self.headers.get("Accept-Encoding") or "").split(","):
+            coding, _, params = item.partition(";")
+            if coding.strip().lower() != "gzip":
+                continue
+            quality = params.strip().lower()
+            return quality not in {"q=0", "q=0.0", "q=0.00", "q=0.000"}
+        return False
+
+    def _send_body(
+        self,
+        body: bytes,
+        content_type: str,
+        status_code: int,
+        gzipped_body: Optional[bytes] = None,
+    ):
+        """Send a response body, gzip-compressed when it is large and the client accepts it.
+
+        ``gzipped_body`` may carry a precompressed copy of ``body`` to skip per-request gzip.
+        """
+        if len(body) >= GZIP_MIN_BODY_BYTES and self._accepts_gzip():
+            if gzipped_body is None:
+                gzipped_body = gzip.compress(body, compresslevel=6)
+            self._set_headers(
+                content_type,
+                status_code,
+                content_encoding="gzip",
+                content_length=len(gzipped_body),
+            )
+            self.wfile.write(gzipped_body)
+            return
+        self._set_headers(content_type, status_code, content_length=len(body))
+        self.wfile.write(body)
+
     def _send_json_response(self, data: Dict[str, Any], status_code: int = 200):
-        self._set_headers(status_code=status_code)
         path = urllib.parse.urlparse(self.path).path
         version = self._expected_api_version(path)
         if isinstance(data, dict):
@@ -147,7 +212,37 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
             payload.setdefault("_api_version", version)
         else:
             payload = data
-        self.wfile.write(json.dumps(payload).encode("utf-8"))
+        self._send_body(json.dumps(payload).encode("utf-8"), "application/json", status_code)
+
+    def _send_static_json_field(self, key: str, value_json: bytes):
+        """Send ``{key: <value_json>}`` plus the usual envelope for an immutable payload.
+
+        The full body and its gzip form are built once per (path, key, payload) and reused.
+        """
+        path = urllib.parse.urlparse(self.path).path
+        cache_key = (path, key, value_json)
+        cached = _STATIC_JSON_BODIES.get(cache_key)
+        if cached is None:
+            version = self._expected_api_version(path)
+            body = b"".join(
+                (
+                    b"{" + json.dumps(key).encode("utf-8") + b": ",
+                    value_json,
+                    b', "_endpoint": ' + json.dumps(path).encode("utf-8"),
+                    b', "_api_version": ' + json.dumps(version).encode("utf-8") + b"}",
+                )
+            )
+            cached = (body, gzip.compress(body, compresslevel=9))
+            _STATIC_JSON_BODIES[cache_key] = cached
+        body, gzipped_body = cached
+        self._send_body(body, "application/json", 200, gzipped_body=gzipped_body)
+
+    def _wants_text_response(self) -> bool:
+        """Whether the client asked for a bare text body instead of a JSON envelope."""
+        return "text/plain" in str(self.headers.get("Accept") or "").lower()
+
+    def _send_text_response(self, text: str, status_code: int = 200):
+        self._send_body(text.encode("utf-8"), "text/plain; charset=utf-8", status_code)
 
     def _instance_metadata(self) -> Dict[str, Any]:
         server = getattr(self, "mcp_server", None)
@@ -652,7 +747,7 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
                 )
 
             elif path == "/meta/endpoints":
-                self._send_json_response({"endpoints": get_endpoint_registry_json()})
+                self._send_static_json_field("endpoints", get_endpoint_registry_json_bytes())
 
             elif path == "/meta/instance":
                 self._send_json_response(self._instance_metadata())
@@ -745,6 +840,8 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
                             },
                             500,
                         )
+                    elif self._wants_text_response():
+                        self._send_text_response(assembly)
                     else:
                         self._send_json_response({"assembly": assembly, "function": func_info})
                 except Exception as e:
@@ -1285,12 +1382,10 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
 
             elif path == "/logs/errors":
                 count = parse_int_or_default(params.get("count"), 10)
+                start_id = parse_int_or_default(params.get("start_id"), None)
                 log_capture = get_active_log_capture()
-                if log_capture:
-                    errors = log_capture.get_latest_errors(count)
-                    self._send_json_response({"errors": errors})
-                else:
-                    self._send_json_response({"errors": []})
+                errors = log_capture.get_latest_errors(count) if log_capture else []
+                self._send_json_response(_error_probe_payload(errors, start_id))
 
             elif path == "/logs/warnings":
                 count = parse_int_or_default(params.get("count"), 10)
@@ -1319,9 +1414,10 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
 
             elif path == "/console/errors":
                 count = parse_int_or_default(params.get("count"), 10)
+                start_id = parse_int_or_default(params.get("start_id"), None)
                 console_capture = get_console_capture()
                 errors = console_capture.get_latest_errors(count)
-                self._send_json_response({"errors": errors})
+                self._send_json_response(_error_probe_payload(errors, start_id))
 
             elif path == "/console/complete":
                 partial = params.get("partial", "")
@@ -1345,6 +1441,9 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
         Sends JSON response with either:
         - Decompiled function code and metadata
         - Error message with available functions list
+
+        Clients that send ``Accept: text/plain`` get the decompiled code as a
+        bare text body on success instead.
         """
         try:
             func_info = self.binary_ops.get_function_info(function_name)
@@ -1372,6 +1471,8 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
                     },
                     500,
                 )
+            elif self._wants_text_response():
+                self._send_text_response(decompiled)
             else:
                 self._send_json_response({"decompiled": decompiled, "function": func_info})
         except Exception as e:
@@ -4,14 +4,15 @@ Binary Ninja MCP CLI - Command-line interface for Binary Ninja MCP server
 Uses the plugin server HTTP API from a terminal interface
 """
 
+import importlib
 import json
 import os
 import subprocess
 import sys
 import time
 from collections import Counter
+from itertools import repeat
 from pathlib import Path
-import requests
 from plumbum import cli, colors
 
 SCRIPT_DIR = Path(__file__).resolve().parent
@@ -27,8 +28,11 @@ from shared.api_versions import (  # noqa: E402
 from shared.platform import (  # noqa: E402
     find_binary_ninja_pids,
     get_platform_adapter,
+    gui_launch_env,
+    launch_with_new_session,
     prepare_log_file,
     terminate_pid_tree,
+    terminate_pids,
 )
 
 STARTUP_FATAL_PATTERNS = (
@@ -39,6 +43,26 @@ STARTUP_FATAL_PATTERNS = (
     "fatal error",
 )
 
+
+class _LazyModule:
+    """Import a module on first attribute access.
+
+    `requests` (and urllib3/certifi behind it) dominates CLI startup, so `--help` and
+    argument errors should not pay for it.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+requests = _LazyModule("requests")
+
 DEFAULT_SERVER_URL = "http://localhost:9009"
 DISCOVERY_HOST = "localhost"
 DISCOVERY_PORTS = (9009, 9000, 9001, 9002, 9003, 9004, 9005, 9006, 9007, 9008)
@@ -132,9 +156,20 @@ class BinaryNinjaCLI(cli.Application):
         ),
     )
 
+    no_compress = cli.Flag(
+        ["--no-compress"],
+        help=(
+            "Ask the server for uncompressed responses. Saves decompression CPU on loopback "
+            "connections where bandwidth is not the bottleneck."
+        ),
+    )
+
     no_auto_errors = cli.Flag(
         ["--no-auto-errors"],
-        help=("Disable automatic post-command checks for new Binary Ninja console/log errors."),
+        help=(
+            "Disable automatic post-command checks for new Binary Ninja console/log errors. "
+            "The checks run only with --json, --verbose or --fail-on-new-errors."
+        ),
     )
 
     fail_on_new_errors = cli.Flag(
@@ -433,8 +468,13 @@ class BinaryNinjaCLI(cli.Application):
         params: dict = None,
         data: dict = None,
         timeout: float = None,
+        stream_text: bool = False,
     ) -> dict:
-        """Make HTTP request to the server"""
+        """Make HTTP request to the server
+
+        With ``stream_text``, servers that support it answer with a bare text body;
+        it is returned unread as ``text_chunks`` so callers can stream it to stdout.
+        """
         endpoint_path = self._normalize_endpoint_path(endpoint)
         request_timeout = self.request_timeout if timeout is None else float(timeout)
         http_timeout = self._http_timeout(request_timeout)
@@ -446,6 +486,10 @@ class BinaryNinjaCLI(cli.Application):
         request_headers = {
             "X-Binja-MCP-Api-Version": str(expected_api_version),
         }
+        if stream_text:
+            request_headers["Accept"] = "text/plain, application/json;q=0.9"
+        if self.no_compress:
+            request_headers["Accept-Encoding"] = "identity"
         request_params = dict(params or {})
         request_data = dict(data or {})
         if self.target_filename:
@@ -489,12 +533,14 @@ class BinaryNinjaCLI(cli.Application):
                     self._assert_strict_target_selected(timeout=request_timeout)
                 )
 
+            stream_kwargs = {"stream": True} if stream_text else {}
             if method == "GET":
                 response = requests.get(
                     url,
                     params=request_params,
                     headers=request_headers,
                     timeout=http_timeout,
+                    **stream_kwargs,
                 )
             else:
                 response = requests.post(
@@ -502,10 +548,19 @@ class BinaryNinjaCLI(cli.Application):
                     json=request_data,
                     headers=request_headers,
                     timeout=http_timeout,
+                    **stream_kwargs,
                 )
 
             response.raise_for_status()
-            response_data = response.json()
+            streamed = stream_text and str(response.headers.get("Content-Type") or "").startswith(
+                "text/plain"
+            )
+            if streamed:
+                response_data = {
+                    "text_chunks": response.iter_content(chunk_size=65536, decode_unicode=True)
+                }
+            else:
+                response_data = response.json()
 
             header_version_raw = response.headers.get("X-Binja-MCP-Api-Version")
             if header_version_raw is None:
@@ -524,22 +579,25 @@ class BinaryNinjaCLI(cli.Application):
                     f"client={expected_api_version}, server_header={header_version}"
                 )
 
-            body_version_raw = (
-                response_data.get("_api_version") if isinstance(response_data, dict) else None
-            )
-            if body_version_raw is None:
-                raise RuntimeError(f"missing _api_version response field for {endpoint_path}")
-            try:
-                body_version = int(body_version_raw)
-            except (TypeError, ValueError):
-                raise RuntimeError(
-                    f"invalid _api_version response field '{body_version_raw}' for {endpoint_path}"
-                )
-            if body_version != expected_api_version:
-                raise RuntimeError(
-                    f"endpoint API version mismatch for {endpoint_path}: "
-                    f"client={expected_api_version}, server_body={body_version}"
+            # Text bodies carry no envelope; the header version above is authoritative.
+            if not streamed:
+                body_version_raw = (
+                    response_data.get("_api_version") if isinstance(response_data, dict) else None
                 )
+                if body_version_raw is None:
+                    raise RuntimeError(f"missing _api_version response field for {endpoint_path}")
+                try:
+                    body_version = int(body_version_raw)
+                except (TypeError, ValueError):
+                    raise RuntimeError(
+                        f"invalid _api_version response field '{body_version_raw}' "
+                        f"for {endpoint_path}"
+                    )
+                if body_version != expected_api_version:
+                    raise RuntimeError(
+                        f"endpoint API version mismatch for {endpoint_path}: "
+                        f"client={expected_api_version}, server_body={body_version}"
+                    )
 
             if isinstance(response_data, dict):
                 observed_filename = (
@@ -887,13 +945,14 @@ class BinaryNinjaCLI(cli.Application):
             sleep_s = 0.1
 
         deadline = time.monotonic() + timeout_s
+        remaining = timeout_s
+        params = {"filename": requested}
         last_payload: dict = {}
         last_views: list = []
         last_current_filename = None
         last_current_view_id = None
 
         while True:
-            remaining = max(0.0, deadline - time.monotonic())
             req_timeout = max(self.request_timeout, 1.0)
             if timeout_s > 0.0:
                 req_timeout = max(1.0, min(req_timeout, remaining + 1.0))
@@ -901,7 +960,7 @@ class BinaryNinjaCLI(cli.Application):
             payload = self._request(
                 "GET",
                 "views",
-                params={"filename": requested},
+                params=params,
                 timeout=req_timeout,
             )
             if isinstance(payload, dict):
@@ -930,11 +989,15 @@ class BinaryNinjaCLI(cli.Application):
                         "views_payload": last_payload,
                     }
 
-            if time.monotonic() >= deadline:
-                break
             if timeout_s == 0.0:
                 break
-            time.sleep(min(sleep_s, max(0.0, deadline - time.monotonic())))
+            # Same single clock read per poll as _wait_for_analysis_on_target.
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            delay = min(sleep_s, deadline - now)
+            time.sleep(delay)
+            remaining = max(0.0, deadline - now - delay)
 
         return {
             "ok": False,
@@ -1001,20 +1064,19 @@ class BinaryNinjaCLI(cli.Application):
             }
 
         poll_interval = 5.0
-        deadline = time.monotonic() + timeout_s
         start = time.monotonic()
+        deadline = start + timeout_s
+        remaining = max(0.0, timeout_s)
         last_status = None
         last_target: dict | None = None
+        params = {}
+        if requested_filename:
+            params["filename"] = requested_filename
+        if requested_view_id is not None:
+            params["view_id"] = requested_view_id
 
         while True:
-            remaining = max(0.0, deadline - time.monotonic())
             req_timeout = max(1.0, min(max(self.request_timeout, 1.0), remaining + 1.0))
-            params = {}
-            if requested_filename:
-                params["filename"] = requested_filename
-            if requested_view_id is not None:
-                params["view_id"] = requested_view_id
-
             views_payload = self._request("GET", "views", params=params, timeout=req_timeout)
             views = []
             if isinstance(views_payload, dict):
@@ -1093,9 +1155,14 @@ class BinaryNinjaCLI(cli.Application):
                         "wait_seconds": elapsed,
                     }
 
-            if time.monotonic() >= deadline:
+            # One clock read per poll: the deadline check, the sleep length and the next
+            # request timeout all derive from it.
+            now = time.monotonic()
+            if now >= deadline:
                 break
-            time.sleep(min(poll_interval, max(0.0, deadline - time.monotonic())))
+            delay = min(poll_interval, deadline - now)
+            time.sleep(delay)
+            remaining = max(0.0, deadline - now - delay)
 
         elapsed = time.monotonic() - start
         return {
@@ -1253,11 +1320,8 @@ class BinaryNinjaCLI(cli.Application):
         )
 
     def _kill_existing_binja_processes(self, binary_path: str, include_any: bool = False) -> int:
-        killed = 0
-        for pid in self._find_running_binja_pids(binary_path=binary_path, include_any=include_any):
-            if self._terminate_launched_binary(pid):
-                killed += 1
-        return killed
+        pids = self._find_running_binja_pids(binary_path=binary_path, include_any=include_any)
+        return len(terminate_pids(pids, grace_s=0.5))
 
     def _launch_binary_ninja(self, filepath: str = "", force_restart: bool = False) -> dict:
         """Best-effort Binary Ninja launch for supported desktop platforms."""
@@ -1268,7 +1332,7 @@ class BinaryNinjaCLI(cli.Application):
                 "error": f"auto-launch is not supported on platform '{sys.platform}'",
             }
 
-        env = adapter.prepare_gui_env(os.environ.copy())
+        env = gui_launch_env(adapter)
 
         binary_path = self._resolve_binary_path()
 
@@ -1307,12 +1371,11 @@ class BinaryNinjaCLI(cli.Application):
             pass
         try:
             with open(log_path, "ab") as log_fp:
-                proc = subprocess.Popen(
+                proc = launch_with_new_session(
                     args,
                     env=env,
                     stdout=log_fp,
                     stderr=subprocess.STDOUT,
-                    start_new_session=True,
                 )
         except Exception as exc:
             return {"ok": False, "error": f"failed to launch Binary Ninja: {exc}", "log": log_path}
@@ -1320,7 +1383,8 @@ class BinaryNinjaCLI(cli.Application):
         return {"ok": True, "binary": binary_path, "log": log_path, "pid": int(proc.pid)}
 
     def _terminate_launched_binary(self, pid: int) -> bool:
-        return terminate_pid_tree(pid, grace_s=0.5)
+        # The pid comes from our own Popen, so reap it instead of leaving a zombie behind.
+        return terminate_pid_tree(pid, grace_s=0.5, reap=True)
 
     @staticmethod
     def _tail_log(log_path: str, max_lines: int = 60) -> str:
@@ -1418,7 +1482,13 @@ class BinaryNinjaCLI(cli.Application):
         *,
         count: int,
         timeout: float,
-    ) -> tuple[list, str | None]:
+        start_id: int | None = None,
+    ) -> tuple[list, str | None, int | None]:
+        """Fetch recent error entries; the third item is ``start_id`` if the server applied it.
+
+        When it is set the entries are exactly the ones logged after ``start_id``. Servers that
+        predate incremental probes ignore the parameter and return the full window instead.
+        """
         endpoint_path = self._normalize_endpoint_path(endpoint)
         expected_api_version = self._expected_api_version(endpoint_path)
         url = f"{self.server_url}/{endpoint.lstrip('/')}"
@@ -1426,6 +1496,8 @@ class BinaryNinjaCLI(cli.Application):
             "count": int(count),
             "_api_version": expected_api_version,
         }
+        if start_id is not None:
+            params["start_id"] = int(start_id)
         headers = {"X-Binja-MCP-Api-Version": str(expected_api_version)}
 
         try:
@@ -1433,18 +1505,48 @@ class BinaryNinjaCLI(cli.Application):
             response.raise_for_status()
             payload = response.json()
         except Exception as exc:
-            return [], f"{endpoint}: {exc}"
+            return [], f"{endpoint}: {exc}", None
 
         if not isinstance(payload, dict):
-            return [], f"{endpoint}: unexpected non-object payload"
+            return [], f"{endpoint}: unexpected non-object payload", None
 
         entries = payload.get("errors", [])
         if not isinstance(entries, list):
-            return [], f"{endpoint}: expected list in 'errors'"
-        return entries, None
+            return [], f"{endpoint}: expected list in 'errors'", None
+        applied = payload.get("start_id")
+        if start_id is None or applied != start_id:
+            applied = None
+        return entries, None, applied
 
-    def _capture_error_snapshot(self, *, count: int | None = None) -> dict | None:
-        if bool(getattr(self, "no_auto_errors", False)):
+    @staticmethod
+    def _last_error_entry_id(entries: list) -> int | None:
+        """Highest server-assigned entry id in a snapshot, or None if any entry lacks one."""
+        ids = [entry.get("id") if isinstance(entry, dict) else None for entry in entries or []]
+        if not ids or not all(isinstance(value, int) for value in ids):
+            return None
+        return max(ids)
+
+    def _error_report_has_consumer(self) -> bool:
+        """Whether anything reads the new-errors report, so the error probes are worth taking.
+
+        The report is attached to --json output, printed in --verbose text output, and turned
+        into the exit status by --fail-on-new-errors.
+        """
+        return bool(self.json_output or self.verbose or getattr(self, "fail_on_new_errors", False))
+
+    def _capture_error_snapshot(
+        self,
+        *,
+        count: int | None = None,
+        since: dict | None = None,
+    ) -> dict | None:
+        """Probe console and log errors.
+
+        ``since`` maps ``"console"``/``"log"`` to the last entry id already seen. Sources the
+        server answered incrementally have their ``<source>_errors_since`` key set, meaning the
+        list holds only entries newer than that id.
+        """
+        if bool(getattr(self, "no_auto_errors", False)) or not self._error_report_has_consumer():
             return None
 
         if self.target_view_id:
@@ -1467,15 +1569,18 @@ class BinaryNinjaCLI(cli.Application):
             timeout_s = 1.0
         timeout_s = max(0.25, min(timeout_s, 3.0))
 
-        console_errors, console_probe_error = self._probe_error_endpoint(
+        since = since or {}
+        console_errors, console_probe_error, console_since = self._probe_error_endpoint(
             "console/errors",
             count=count_n,
             timeout=timeout_s,
+            start_id=since.get("console"),
         )
-        log_errors, log_probe_error = self._probe_error_endpoint(
+        log_errors, log_probe_error, log_since = self._probe_error_endpoint(
             "logs/errors",
             count=count_n,
             timeout=timeout_s,
+            start_id=since.get("log"),
         )
 
         warnings = [item for item in (console_probe_error, log_probe_error) if item]
@@ -1484,26 +1589,24 @@ class BinaryNinjaCLI(cli.Application):
             "console_errors": console_errors,
             "log_errors": log_errors,
             "probe_warnings": warnings,
+            "console_errors_since": console_since,
+            "log_errors_since": log_since,
         }
 
-    @staticmethod
-    def _error_entry_signature(entry: object, source: str) -> str:
+    _ERROR_SIGNATURE_FIELDS = ("level", "type", "logger", "message", "text")
+
+    @classmethod
+    def _error_entry_signature(cls, entry: object, source: str) -> tuple:
+        # Hashable tuple keys; only entries without any identifying field pay for serialization.
         if isinstance(entry, dict):
-            normalized = {
-                "source": source,
-                "level": str(entry.get("level") or ""),
-                "type": str(entry.get("type") or ""),
-                "logger": str(entry.get("logger") or ""),
-                "message": str(entry.get("message") or ""),
-                "text": str(entry.get("text") or ""),
-            }
-            if any(normalized.get(key) for key in ("level", "type", "logger", "message", "text")):
-                return json.dumps(normalized, sort_keys=True)
+            fields = tuple(str(entry.get(key) or "") for key in cls._ERROR_SIGNATURE_FIELDS)
+            if any(fields):
+                return (source, *fields)
             try:
-                return f"{source}:{json.dumps(entry, sort_keys=True, default=str)}"
+                return (source, json.dumps(entry, sort_keys=True, default=str))
             except Exception:
-                return f"{source}:{entry!r}"
-        return f"{source}:{entry!r}"
+                return (source, repr(entry))
+        return (source, repr(entry))
 
     @classmethod
     def _new_error_entries(
@@ -1513,18 +1616,28 @@ class BinaryNinjaCLI(cli.Application):
         *,
         source: str,
     ) -> list:
-        before_counts = Counter(
-            cls._error_entry_signature(entry, source) for entry in (before_entries or [])
-        )
-        after_counts = Counter()
+        if not after_entries or after_entries == before_entries:
+            # The common case: nothing new was logged, so no entry needs a signature.
+            return []
+        # Each "before" occurrence cancels one matching "after" entry; the rest are new.
+        signature = cls._error_entry_signature
+        remaining = Counter(map(signature, before_entries or (), repeat(source)))
         new_entries = []
-        for entry in after_entries or []:
-            sig = cls._error_entry_signature(entry, source)
-            after_counts[sig] += 1
-            if after_counts[sig] > before_counts.get(sig, 0):
+        for entry, sig in zip(after_entries, map(signature, after_entries, repeat(source))):
+            if remaining[sig]:
+                remaining[sig] -= 1
+            else:
                 new_entries.append(entry)
         return new_entries
 
+    @classmethod
+    def _snapshot_new_errors(cls, before_snapshot: dict, after_snapshot: dict, source: str) -> list:
+        key = f"{source}_errors"
+        after_entries = after_snapshot.get(key, [])
+        if after_snapshot.get(f"{key}_since") is not None:
+            return list(after_entries)
+        return cls._new_error_entries(before_snapshot.get(key, []), after_entries, source=source)
+
     @staticmethod
     def _format_error_entry(entry: object) -> str:
         if not isinstance(entry, dict):
@@ -1559,20 +1672,26 @@ class BinaryNinjaCLI(cli.Application):
         if before_snapshot is None:
             return False
 
-        after_snapshot = self._capture_error_snapshot(count=before_snapshot.get("count"))
-        if after_snapshot is None:
+        fail_on_new_errors = bool(getattr(self, "fail_on_new_errors", False))
+        if self.json_output and not isinstance(output_payload, dict) and not fail_on_new_errors:
+            # JSON mode prints nothing itself, so with no payload to attach the report to and
+            # no exit status riding on it, the second probe round trip would be wasted.
             return False
 
-        new_console_errors = self._new_error_entries(
-            before_snapshot.get("console_errors", []),
-            after_snapshot.get("console_errors", []),
-            source="console",
-        )
-        new_log_errors = self._new_error_entries(
-            before_snapshot.get("log_errors", []),
-            after_snapshot.get("log_errors", []),
-            source="log",
+        # Ask only for entries logged after the "before" probe; the server echoes the id back
+        # when it honoured it, and otherwise the full windows are diffed as before.
+        after_snapshot = self._capture_error_snapshot(
+            count=before_snapshot.get("count"),
+            since={
+                "console": self._last_error_entry_id(before_snapshot.get("console_errors")),
+                "log": self._last_error_entry_id(before_snapshot.get("log_errors")),
+            },
         )
+        if after_snapshot is None:
+            return False
+
+        new_console_errors = self._snapshot_new_errors(before_snapshot, after_snapshot, "console")
+        new_log_errors = self._snapshot_new_errors(before_snapshot, after_snapshot, "log")
 
         warnings = []
         warnings.extend(before_snapshot.get("probe_warnings", []))
@@ -1615,7 +1734,22 @@ class BinaryNinjaCLI(cli.Application):
             for warning in warnings:
                 print(colors.yellow | f"  - {warning}")
 
-        return bool(has_new_errors and bool(getattr(self, "fail_on_new_errors", False)))
+        return bool(has_new_errors and fail_on_new_errors)
+
+    @staticmethod
+    def _write_lines(lines) -> None:
+        """Emit many output lines with a single write instead of one print() per line."""
+        sys.stdout.write("".join(f"{line}\n" for line in lines))
+
+    def _write_text_chunks(self, chunks) -> None:
+        """Copy a streamed text body to stdout, ending it with a newline like print()."""
+        try:
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+        except requests.exceptions.RequestException as exc:
+            print(colors.red | f"\nError: response stream interrupted: {exc}", file=sys.stderr)
+            sys.exit(1)
+        sys.stdout.write("\n")
 
     def _output(self, data: dict):
         """Output data in JSON or formatted text"""
@@ -2410,8 +2544,7 @@ class Functions(cli.Application):
                 matches = data.get("matches", [])
                 if matches:
                     print(f"Found {len(matches)} matching functions:")
-                    for func in matches:
-                        print(f"  • {func}")
+                    self.parent._write_lines(f"  • {func}" for func in matches)
                 else:
                     print("No matching functions found")
         else:
@@ -2425,8 +2558,7 @@ class Functions(cli.Application):
                 functions = data.get("functions", [])
                 if functions:
                     print(f"Functions ({self.offset}-{self.offset + len(functions)}):")
-                    for func in functions:
-                        print(f"  • {func}")
+                    self.parent._write_lines(f"  • {func}" for func in functions)
                 else:
                     print("No functions found")
 
@@ -2442,6 +2574,7 @@ class Decompile(cli.Application):
             "decompile",
             {"name": function_name},
             timeout=max(self.parent.request_timeout, 30.0),
+            stream_text=not self.parent.json_output,
         )
 
         if self.parent.json_output:
@@ -2458,7 +2591,10 @@ class Decompile(cli.Application):
                 print(colors.red | f"Error: {data['error']}")
             else:
                 print(colors.cyan | f"Decompiled code for {function_name}:")
-                print(data.get("decompiled", "No decompilation available"))
+                if "text_chunks" in data:
+                    self.parent._write_text_chunks(data["text_chunks"])
+                else:
+                    print(data.get("decompiled", "No decompilation available"))
             should_fail = self.parent._apply_post_command_error_report(
                 "decompile",
                 error_snapshot,
@@ -2478,6 +2614,7 @@ class Assembly(cli.Application):
             "assembly",
             {"name": function_name},
             timeout=max(self.parent.request_timeout, 30.0),
+            stream_text=not self.parent.json_output,
         )
 
         if self.parent.json_output:
@@ -2494,7 +2631,10 @@ class Assembly(cli.Application):
                 print(colors.red | f"Error: {data['error']}")
             else:
                 print(colors.cyan | f"Assembly for {function_name}:")
-                print(data.get("assembly", "No assembly available"))
+                if "text_chunks" in data:
+                    self.parent._write_text_chunks(data["text_chunks"])
+                else:
+                    print(data.get("assembly", "No assembly available"))
             should_fail = self.parent._apply_post_command_error_report(
                 "assembly",
                 error_snapshot,
@@ -2570,15 +2710,13 @@ class References(cli.Application):
         if self.parent.json_output:
             self.parent._output(data)
         else:
-            refs = json.loads(data) if isinstance(data, str) else data
-            if "error" in refs:
-                print(colors.red | f"Error: {refs['error']}")
+            if "error" in data:
+                print(colors.red | f"Error: {data['error']}")
             else:
-                code_refs = refs.get("code_references", [])
+                code_refs = data.get("code_references", [])
                 if code_refs:
                     print(f"Functions that call {function_name}:")
-                    for ref in code_refs:
-                        print(f"  • {ref}")
+                    self.parent._write_lines(f"  • {ref}" for ref in code_refs)
                 else:
                     print(f"No references found to {function_name}")
 
@@ -2642,22 +2780,33 @@ class Logs(cli.Application):
         else:
             logs = data.get("logs", data.get("errors", data.get("warnings", [])))
             if logs:
+                # Resolve ANSI open/close codes once instead of wrapping via plumbum per entry.
+                dim_on, dim_off = str(colors.dim), str(~colors.dim)
+                level_codes: dict[str, tuple[str, str]] = {}
+                lines = []
                 for log in logs:
                     level = log.get("level", "INFO")
                     timestamp = log.get("timestamp", "")[:19]  # Trim microseconds
                     message = log.get("message", "")
 
-                    # Color based on level
-                    if "Error" in level:
-                        level_color = colors.red
-                    elif "Warn" in level:
-                        level_color = colors.yellow
-                    elif "Debug" in level:
-                        level_color = colors.blue
-                    else:
-                        level_color = colors.white
-
-                    print(f"{colors.dim | timestamp} {level_color | f'[{level:>8}]'} {message}")
+                    codes = level_codes.get(level)
+                    if codes is None:
+                        # Color based on level
+                        if "Error" in level:
+                            level_color = colors.red
+                        elif "Warn" in level:
+                            level_color = colors.yellow
+                        elif "Debug" in level:
+                            level_color = colors.blue
+                        else:
+                            level_color = colors.white
+                        codes = level_codes[level] = (str(level_color), str(~level_color))
+                    level_on, level_off = codes
+
+                    lines.append(
+                        f"{dim_on}{timestamp}{dim_off} {level_on}[{level:>8}]{level_off} {message}"
+                    )
+                self.parent._write_lines(lines)
             else:
                 print("No logs found")
 
@@ -2679,14 +2828,13 @@ class Type(cli.Application):
         if self.parent.json_output:
             self.parent._output(data)
         else:
-            result = json.loads(data) if isinstance(data, str) else data
-            if "error" in result:
-                print(colors.red | f"Error: {result['error']}")
-            elif "type_definition" in result:
-                print(f"Type: {result.get('type_name', type_name_or_code)}")
-                print(result.get("type_definition", "No definition"))
+            if "error" in data:
+                print(colors.red | f"Error: {data['error']}")
+            elif "type_definition" in data:
+                print(f"Type: {data.get('type_name', type_name_or_code)}")
+                print(data.get("type_definition", "No definition"))
             else:
-                print(result)
+                print(data)
 
 
 @BinaryNinjaCLI.subcommand("imports")
@@ -2705,8 +2853,7 @@ class Imports(cli.Application):
             imports = data.get("imports", [])
             if imports:
                 print(f"Imports ({self.offset}-{self.offset + len(imports)}):")
-                for imp in imports:
-                    print(f"  • {imp}")
+                self.parent._write_lines(f"  • {imp}" for imp in imports)
             else:
                 print("No imports found")
 
@@ -2727,8 +2874,7 @@ class Exports(cli.Application):
             exports = data.get("exports", [])
             if exports:
                 print(f"Exports ({self.offset}-{self.offset + len(exports)}):")
-                for exp in exports:
-                    print(f"  • {exp}")
+                self.parent._write_lines(f"  • {exp}" for exp in exports)
             else:
                 print("No exports found")
 
@@ -2813,8 +2959,6 @@ class Python(cli.Application):
         elif self.stdin or (args and args[0] == "-"):
             # Read from stdin
             try:
-                import sys
-
                 code = sys.stdin.read()
                 if not code.strip():
                     print(colors.red | "No input received from stdin")
@@ -2829,8 +2973,6 @@ class Python(cli.Application):
         elif args:
             # Check if first argument is a file
             if len(args) == 1 and not args[0].startswith("-"):
-                from pathlib import Path
-
                 file_path = Path(args[0])
                 if file_path.exists() and file_path.is_file():
                     # It's a file, read it
@@ -2847,10 +2989,7 @@ class Python(cli.Application):
                 code = " ".join(args)
 
         else:
-            # No arguments, check if stdin is piped
-            import sys
-
-            # Check if stdin has data (works on Unix-like systems)
+            # No arguments, check if stdin is piped (works on Unix-like systems)
             if sys.stdin.isatty():
                 # No piped input, show usage
                 print("Usage: python [options] <code|file|->")
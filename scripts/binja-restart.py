@@ -6,6 +6,7 @@ Advanced Binary Ninja control script with enhanced monitoring and API integratio
 import os
 import subprocess
 import tempfile
+import threading
 import time
 from pathlib import Path
 from typing import Optional
@@ -143,28 +144,22 @@ class BinaryNinjaAdvancedController(cli.Application):
 
     def _is_running(self) -> bool:
         """Check if Binary Ninja is running from a valid .app bundle."""
+        # One streamed `ps` scan instead of pgrep plus a `ps -p` per match; stop at the first hit.
         try:
-            # Get all processes named binaryninja
-            result = subprocess.run(["pgrep", "-x", "binaryninja"], capture_output=True, text=True)
-
-            if result.returncode != 0:
-                return False
-
-            # Check each PID to verify it's from an .app bundle
-            pids = result.stdout.strip().split("\n")
-            for pid in pids:
-                if pid:
-                    # Get the full path of the process
-                    ps_result = subprocess.run(
-                        ["ps", "-p", pid, "-o", "comm="], capture_output=True, text=True
-                    )
-                    if ps_result.returncode == 0:
-                        path = ps_result.stdout.strip()
+            with subprocess.Popen(
+                ["ps", "-axo", "comm="], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            ) as proc:
+                timer = threading.Timer(5.0, proc.kill)
+                timer.start()
+                try:
+                    for raw_line in proc.stdout:
+                        path = raw_line.rstrip()
                         # Check if it's from a valid .app bundle
-                        if "/Binary Ninja.app/Contents/MacOS/binaryninja" in path or path.endswith(
-                            "/Contents/MacOS/binaryninja"
-                        ):
+                        if path.endswith(b"/Contents/MacOS/binaryninja"):
+                            proc.kill()
                             return True
+                finally:
+                    timer.cancel()
 
             return False
         except Exception:
@@ -4,8 +4,11 @@
 from __future__ import annotations
 
 import argparse
+import os
+import re
 import sys
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 FORBIDDEN_CODEPOINTS = {
@@ -28,16 +31,84 @@ FORBIDDEN_CODEPOINTS = {
     0x2069,  # POP DIRECTIONAL ISOLATE
 }
 
+# "U+XXXX NAME" report labels, resolved once for the fixed codepoint set.
+_CODEPOINT_LABELS = {
+    chr(cp): f"U+{cp:04X} {unicodedata.name(chr(cp), 'UNKNOWN')}" for cp in FORBIDDEN_CODEPOINTS
+}
+
+# Single C-level scanner for all forbidden codepoints.
+_FORBIDDEN_RE = re.compile("[" + "".join(chr(cp) for cp in sorted(FORBIDDEN_CODEPOINTS)) + "]")
+
+# The same codepoints as UTF-8 byte sequences, so clean files are never decoded.
+_FORBIDDEN_UTF8 = [chr(cp).encode("utf-8") for cp in sorted(FORBIDDEN_CODEPOINTS)]
+_FORBIDDEN_UTF8_RE = re.compile(b"|".join(re.escape(seq) for seq in _FORBIDDEN_UTF8))
+# Bytes carried between chunks so a sequence split across a boundary is still seen.
+_UTF8_OVERLAP = max(len(seq) for seq in _FORBIDDEN_UTF8) - 1
+
+# Files are scanned this many bytes (or decoded characters) at a time to bound memory.
+_CHUNK_SIZE = 1 << 20
+
 SKIP_DIRS = {".git", ".venv", "__pycache__", ".ruff_cache"}
 
 
 def iter_files(root: Path):
-    for path in root.rglob("*"):
-        if not path.is_file():
-            continue
-        if any(part in SKIP_DIRS for part in path.parts):
-            continue
-        yield path
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Prune in place so os.walk never descends into skipped trees.
+        dirnames[:] = [name for name in dirnames if name not in SKIP_DIRS]
+        base = Path(dirpath)
+        for filename in filenames:
+            path = base / filename
+            if path.is_file():
+                yield path
+
+
+def scan_file(path: Path, root: Path) -> list[str]:
+    """Return failure lines for `path`, decoding it only if its raw bytes have a hit."""
+    try:
+        with path.open("rb") as handle:
+            tail = b""
+            while chunk := handle.read(_CHUNK_SIZE):
+                if _FORBIDDEN_UTF8_RE.search(chunk) or _FORBIDDEN_UTF8_RE.search(
+                    tail + chunk[:_UTF8_OVERLAP]
+                ):
+                    break
+                tail = (tail + chunk[-_UTF8_OVERLAP:])[-_UTF8_OVERLAP:]
+            else:
+                return []
+    except OSError:
+        return []
+    return _locate_violations(path, root)
+
+
+def _locate_violations(path: Path, root: Path) -> list[str]:
+    """Return failure lines for `path`, reading it in bounded chunks."""
+    failures = []
+    line_num = 1
+    line_len = 0  # Characters of the current line carried over from earlier chunks.
+    try:
+        with path.open("r", encoding="utf-8", errors="strict") as handle:
+            while chunk := handle.read(_CHUNK_SIZE):
+                pos = 0
+                line_start = -line_len
+                for match in _FORBIDDEN_RE.finditer(chunk):
+                    offset = match.start()
+                    newlines = chunk.count("\n", pos, offset)
+                    if newlines:
+                        line_num += newlines
+                        line_start = chunk.rfind("\n", pos, offset) + 1
+                    pos = offset
+                    failures.append(
+                        f"{path.relative_to(root)}:{line_num}:{offset - line_start + 1} "
+                        f"{_CODEPOINT_LABELS[match.group()]}"
+                    )
+                newlines = chunk.count("\n", pos)
+                if newlines:
+                    line_num += newlines
+                    line_start = chunk.rfind("\n", pos) + 1
+                line_len = len(chunk) - line_start
+    except (UnicodeDecodeError, OSError):
+        return []
+    return failures
 
 
 def main() -> int:
@@ -46,22 +117,13 @@ def main() -> int:
     args = parser.parse_args()
     root = Path(args.root).resolve()
 
+    # executor.map preserves input order, so sorting paths keeps the report deterministic.
+    paths = sorted(iter_files(root))
     failures = []
-    for path in iter_files(root):
-        try:
-            text = path.read_text(encoding="utf-8")
-        except (UnicodeDecodeError, OSError):
-            continue
-
-        for line_num, line in enumerate(text.splitlines(), start=1):
-            for col_num, ch in enumerate(line, start=1):
-                codepoint = ord(ch)
-                if codepoint not in FORBIDDEN_CODEPOINTS:
-                    continue
-                name = unicodedata.name(ch, "UNKNOWN")
-                failures.append(
-                    f"{path.relative_to(root)}:{line_num}:{col_num} U+{codepoint:04X} {name}"
-                )
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for file_failures in executor.map(lambda path: scan_file(path, root), paths):
+            failures.extend(file_failures)
 
     if failures:
         print("Found forbidden hidden/bidi Unicode characters:")
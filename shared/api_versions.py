@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 DEFAULT_ENDPOINT_API_VERSION = 1
 ENDPOINT_API_VERSION_OVERRIDES = {
     "/ui/open": 2,
@@ -20,8 +22,13 @@ SUPPORTED_UI_CONTRACT_SCHEMA_VERSIONS = {
 }
 
 
-def normalize_endpoint_path(path: str) -> str:
-    raw = str(path or "").strip()
+# Endpoint paths come from request lines, so bound the caches against arbitrary input.
+_PATH_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=_PATH_CACHE_SIZE)
+def _normalize_endpoint_path(raw: str) -> str:
+    raw = raw.strip()
     if not raw:
         return "/"
     if "?" in raw:
@@ -31,11 +38,20 @@ def normalize_endpoint_path(path: str) -> str:
     return raw
 
 
+def normalize_endpoint_path(path: str) -> str:
+    # Most callers already pass a canonical path; hand it back without allocating.
+    if type(path) is str and path.startswith("/") and "?" not in path and not path[-1].isspace():
+        return path
+    return _normalize_endpoint_path(str(path or ""))
+
+
+@lru_cache(maxsize=_PATH_CACHE_SIZE)
 def expected_api_version(path: str) -> int:
     endpoint_path = normalize_endpoint_path(path)
     return ENDPOINT_API_VERSION_OVERRIDES.get(endpoint_path, DEFAULT_ENDPOINT_API_VERSION)
 
 
+@lru_cache(maxsize=_PATH_CACHE_SIZE)
 def allows_missing_api_version(path: str) -> bool:
     endpoint_path = normalize_endpoint_path(path)
     return endpoint_path in MISSING_VERSION_ALLOWED_ENDPOINTS
@@ -2,27 +2,40 @@
 
 from __future__ import annotations
 
+import json
+import sys
 from dataclasses import dataclass
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from .api_versions import expected_api_version, normalize_endpoint_path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EndpointSpec:
     method: str
     path: str
     requires_binary: bool
-    minimal_params: dict[str, Any] | None = None
-    minimal_json: dict[str, Any] | None = None
+    minimal_params: Mapping[str, Any] | None = None
+    minimal_json: Mapping[str, Any] | None = None
+
+    def __post_init__(self) -> None:
+        # The path set is closed, so intern the canonical strings: every registry table and
+        # API-version cache keyed on them then shares one object per path.
+        object.__setattr__(self, "method", sys.intern(self.method.upper()))
+        object.__setattr__(self, "path", sys.intern(normalize_endpoint_path(self.path)))
+        # Freeze the sample payloads so specs can be shared without defensive copies.
+        for name in ("minimal_params", "minimal_json"):
+            value = getattr(self, name)
+            if value is not None and not isinstance(value, MappingProxyType):
+                object.__setattr__(self, name, MappingProxyType(dict(value)))
 
     def as_dict(self) -> dict[str, Any]:
-        path = normalize_endpoint_path(self.path)
         out: dict[str, Any] = {
-            "method": self.method.upper(),
-            "path": path,
+            "method": self.method,
+            "path": self.path,
             "requires_binary": bool(self.requires_binary),
-            "api_version": expected_api_version(path),
+            "api_version": expected_api_version(self.path),
         }
         if self.minimal_params:
             out["minimal_params"] = dict(self.minimal_params)
@@ -142,9 +155,36 @@ ENDPOINT_SPECS: tuple[EndpointSpec, ...] = (
 )
 
 
+ENDPOINT_INDEX: Mapping[tuple[str, str], EndpointSpec] = MappingProxyType(
+    {(spec.method, spec.path): spec for spec in ENDPOINT_SPECS}
+)
+ENDPOINT_PATHS_BY_METHOD: Mapping[str, frozenset[str]] = MappingProxyType(
+    {
+        method: frozenset(path for key_method, path in ENDPOINT_INDEX if key_method == method)
+        for method in {key_method for key_method, _ in ENDPOINT_INDEX}
+    }
+)
+
+# The registry is frozen at import, so its JSON form is serialized exactly once.
+_ENDPOINT_JSON_BYTES: bytes = json.dumps([spec.as_dict() for spec in ENDPOINT_SPECS]).encode(
+    "utf-8"
+)
+
+
 def get_endpoint_registry() -> list[EndpointSpec]:
     return list(ENDPOINT_SPECS)
 
 
+def lookup_endpoint(method: str, path: str) -> EndpointSpec | None:
+    """Return the spec registered for ``method`` and ``path``, or None."""
+    return ENDPOINT_INDEX.get((str(method or "").upper(), normalize_endpoint_path(path)))
+
+
 def get_endpoint_registry_json() -> list[dict[str, Any]]:
+    # Fresh dicts (including the nested sample payloads) so callers can never edit shared state.
     return [spec.as_dict() for spec in ENDPOINT_SPECS]
+
+
+def get_endpoint_registry_json_bytes() -> bytes:
+    """Return the registry JSON array pre-serialized with ``json.dumps`` defaults."""
+    return _ENDPOINT_JSON_BYTES
@@ -2,18 +2,28 @@
 
 from .adapter import (
     BinaryNinjaPlatformAdapter,
+    apply_env_overlay,
     find_binary_ninja_pids,
     get_platform_adapter,
+    gui_launch_env,
+    invalidate_binary_path_cache,
+    launch_with_new_session,
     prepare_log_file,
     signal_pid,
     terminate_pid_tree,
+    terminate_pids,
 )
 
 __all__ = [
     "BinaryNinjaPlatformAdapter",
+    "apply_env_overlay",
     "find_binary_ninja_pids",
     "get_platform_adapter",
+    "gui_launch_env",
+    "invalidate_binary_path_cache",
+    "launch_with_new_session",
     "prepare_log_file",
     "signal_pid",
     "terminate_pid_tree",
+    "terminate_pids",
 ]
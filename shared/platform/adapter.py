@@ -6,15 +6,21 @@ management for CLI and integration harnesses.
 
 from __future__ import annotations
 
+import itertools
+import math
 import os
 import re
+import select
 import shutil
 import signal
+import stat
 import subprocess
 import sys
+import threading
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Mapping, Protocol, Sequence
+from typing import Any, Callable, Iterable, Iterator, Mapping, Protocol, Sequence
 
 
 class BinaryNinjaPlatformAdapter(Protocol):
@@ -33,28 +39,164 @@ class BinaryNinjaPlatformAdapter(Protocol):
         extra_candidates: Sequence[str | None] | None = None,
     ) -> str | None: ...
 
+    # Returns a new dict and never mutates source_env, so callers can pass os.environ directly.
     def prepare_gui_env(self, source_env: Mapping[str, str]) -> dict[str, str]: ...
 
+    # Only the variables prepare_gui_env changes; None means the variable is removed.
+    def prepare_gui_env_overlay(self, source_env: Mapping[str, str]) -> dict[str, str | None]: ...
+
     def process_name_tokens(self) -> tuple[str, ...]: ...
 
+    def lower_process_name_tokens(self) -> tuple[str, ...]: ...
+
+    def iter_process_cmdlines(self) -> Iterator[tuple[int, str]]: ...
+
+
+# The real uid cannot change under us (no setuid), so look it up once.
+_UID = os.getuid() if hasattr(os, "getuid") else 0
+
+# One `ps -eo pid=,args=` line: leading padding, pid, then the (right-trimmed) command line.
+_PS_PID_ARGS_RE = re.compile(r"\s*(\d+)\s+(.*\S)")
+
+
+def _read_small_file(path: str) -> bytes:
+    """Read ``path`` with raw ``os.read`` calls, skipping buffered file-object setup."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    try:
+        chunk = os.read(fd, 4096)
+        if len(chunk) < 4096:
+            return chunk
+        chunks = [chunk]
+        while chunk:
+            chunk = os.read(fd, 65536)
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _iter_command_output(argv: Sequence[str], *, timeout_s: float) -> Iterator[str]:
+    """Yield stdout lines of ``argv`` as they arrive; its process group is killed on timeout.
+
+    Closing the generator early kills the process, so callers may stop at the first match.
+    """
+    try:
+        # Own process group, so a timeout or early close also takes down anything it forked.
+        proc = subprocess.Popen(
+            list(argv),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            errors="replace",
+            start_new_session=hasattr(os, "killpg"),
+        )
+    except OSError:
+        # Missing or non-executable tool: behave like empty output.
+        return
+
+    def _kill() -> None:
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+                return
+            except OSError:
+                pass
+        proc.kill()
+
+    timer = threading.Timer(timeout_s, _kill)
+    timer.daemon = True
+    timer.start()
+    try:
+        assert proc.stdout is not None
+        yield from proc.stdout
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        if proc.poll() is None:
+            _kill()
+        proc.wait()
+
+
+def _is_executable_regular(path: str) -> bool:
+    """One ``stat`` instead of ``isfile`` + ``access``: a regular file with any execute bit."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return stat.S_ISREG(st.st_mode) and bool(st.st_mode & 0o111)
+
+
+def _qpa_platform_override(env: Mapping[str, str]) -> str:
+    return str(env.get("BINJA_QPA_PLATFORM", "")).strip().lower()
+
+
+def _changed_only(
+    source_env: Mapping[str, str], overlay: dict[str, str | None]
+) -> dict[str, str | None]:
+    """Drop overlay entries that would leave ``source_env`` unchanged."""
+    return {key: value for key, value in overlay.items() if source_env.get(key) != value}
+
+
+def apply_env_overlay(
+    source_env: Mapping[str, str], overlay: Mapping[str, str | None]
+) -> dict[str, str]:
+    """Return a copy of ``source_env`` with ``overlay`` applied; None values remove the key."""
+    env = dict(source_env)
+    for key, value in overlay.items():
+        if value is None:
+            env.pop(key, None)
+        else:
+            env[key] = value
+    return env
+
+
+def gui_launch_env(adapter: BinaryNinjaPlatformAdapter) -> dict[str, str] | None:
+    """The ``env`` to pass to Popen for a GUI launch from this process.
+
+    None (inherit the current environment) when the adapter changes nothing, so the common
+    case does not copy ``os.environ``.
+    """
+    overlay = adapter.prepare_gui_env_overlay(os.environ)
+    if not overlay:
+        return None
+    return apply_env_overlay(os.environ, overlay)
+
 
 class _BaseAdapter:
     platform_key = "generic"
 
+    def __init__(self) -> None:
+        self._lower_tokens = tuple(token.lower() for token in self.process_name_tokens())
+
     def supports_auto_launch(self) -> bool:
         return False
 
     def normalize_binary_path(self, path: str) -> str:
         return str(path or "").strip()
 
-    def _default_binary_candidates(self) -> list[str]:
-        return []
+    def _default_binary_candidates(self) -> tuple[str, ...]:
+        return ()
 
     def process_name_tokens(self) -> tuple[str, ...]:
         return ("binaryninja", "binja")
 
+    def lower_process_name_tokens(self) -> tuple[str, ...]:
+        """``process_name_tokens()`` lowercased, computed once per adapter."""
+        return self._lower_tokens
+
+    def iter_process_cmdlines(self) -> Iterator[tuple[int, str]]:
+        """Yield ``(pid, command line)`` for every visible process via ``ps``."""
+        match_line = _PS_PID_ARGS_RE.match
+        for line in _iter_command_output(["ps", "-eo", "pid=,args="], timeout_s=5.0):
+            match = match_line(line)
+            if match is not None:
+                yield int(match.group(1)), match.group(2)
+
     def prepare_gui_env(self, source_env: Mapping[str, str]) -> dict[str, str]:
-        return dict(source_env)
+        return apply_env_overlay(source_env, self.prepare_gui_env_overlay(source_env))
+
+    def prepare_gui_env_overlay(self, source_env: Mapping[str, str]) -> dict[str, str | None]:
+        return {}
 
     def resolve_binary_path(
         self,
@@ -62,11 +204,35 @@ class _BaseAdapter:
         explicit_path: str | None = None,
         extra_candidates: Sequence[str | None] | None = None,
     ) -> str | None:
-        candidates: list[str | None] = [explicit_path]
-        if extra_candidates:
-            candidates.extend(extra_candidates)
-        candidates.extend(self._default_binary_candidates())
-        candidates.extend(["binaryninja", "BinaryNinja"])
+        # PATH is part of the key because shutil.which() reads it from the environment.
+        key = (type(self), explicit_path, tuple(extra_candidates or ()), os.environ.get("PATH", ""))
+        cached = _RESOLVED_BINARY_PATHS.get(key)
+        if cached is not None:
+            path, signature = cached
+            if _file_signature(path) == signature:
+                return path
+            _RESOLVED_BINARY_PATHS.pop(key, None)
+
+        resolved = self._resolve_binary_path_uncached(explicit_path, key[2])
+        if resolved is not None:
+            signature = _file_signature(resolved)
+            if signature is not None:
+                if len(_RESOLVED_BINARY_PATHS) >= _RESOLVED_BINARY_PATHS_MAX:
+                    _RESOLVED_BINARY_PATHS.clear()
+                _RESOLVED_BINARY_PATHS[key] = (resolved, signature)
+        return resolved
+
+    def _resolve_binary_path_uncached(
+        self,
+        explicit_path: str | None,
+        extra_candidates: Sequence[str | None],
+    ) -> str | None:
+        candidates = itertools.chain(
+            (explicit_path,),
+            extra_candidates,
+            self._default_binary_candidates(),
+            ("binaryninja", "BinaryNinja"),
+        )
 
         seen: set[str] = set()
         for candidate in candidates:
@@ -79,36 +245,75 @@ class _BaseAdapter:
 
             if os.path.sep not in normalized:
                 resolved = shutil.which(normalized)
-                if resolved and os.path.isfile(resolved) and os.access(resolved, os.X_OK):
+                if resolved and _is_executable_regular(resolved):
                     return resolved
                 continue
 
             expanded = os.path.expanduser(normalized)
-            if os.path.isfile(expanded) and os.access(expanded, os.X_OK):
+            if _is_executable_regular(expanded):
                 return expanded
         return None
 
 
+@lru_cache(maxsize=16)
+def _compile_display_pattern(number: int) -> re.Pattern[str]:
+    # Match :N or :N.screen but avoid accidental matches like :10 when looking for :1.
+    return re.compile(rf"(?<![0-9]):{number}(?:\.[0-9]+)?(?![0-9])")
+
+
 class LinuxAdapter(_BaseAdapter):
     platform_key = "linux"
 
+    def __init__(self) -> None:
+        super().__init__()
+        # (DISPLAY, WAYLAND_DISPLAY, XDG_RUNTIME_DIR) -> successfully detected (backend, display).
+        self._backend_cache: dict[tuple[str, str, str], tuple[str | None, str | None]] = {}
+
+    def refresh(self) -> None:
+        """Forget cached display-backend detection (e.g. after starting a VNC server)."""
+        self._backend_cache.clear()
+
     def supports_auto_launch(self) -> bool:
         return True
 
-    def _default_binary_candidates(self) -> list[str]:
+    def _default_binary_candidates(self) -> tuple[str, ...]:
         home = Path.home()
-        return [
+        return (
             str(home / "src" / "binja" / "binaryninja" / "binaryninja"),
             str(home / "binaryninja" / "binaryninja"),
             str(home / ".binaryninja" / "binaryninja"),
             "/opt/binaryninja/binaryninja",
-        ]
+        )
+
+    def iter_process_cmdlines(self) -> Iterator[tuple[int, str]]:
+        """Yield ``(pid, command line)`` by reading ``/proc`` directly instead of forking ``ps``."""
+        try:
+            entries = os.scandir("/proc")
+        except OSError:
+            yield from super().iter_process_cmdlines()
+            return
+
+        with entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    raw = _read_small_file(f"/proc/{entry.name}/cmdline")
+                except OSError:
+                    # Process exited mid-scan or is not readable.
+                    continue
+                if not raw:
+                    # Kernel threads and zombies have no command line.
+                    continue
+                cmd = raw.rstrip(b"\x00").replace(b"\x00", b" ").decode("utf-8", "replace")
+                yield int(entry.name), cmd
 
     @staticmethod
     def _runtime_dir(env: Mapping[str, str]) -> str:
-        return str(env.get("XDG_RUNTIME_DIR") or f"/run/user/{os.getuid()}")
+        return str(env.get("XDG_RUNTIME_DIR") or f"/run/user/{_UID}")
 
     @staticmethod
+    @lru_cache(maxsize=16)
     def _parse_display_number(display_value: str | None) -> int | None:
         raw = str(display_value or "").strip()
         if not raw:
@@ -133,14 +338,14 @@ class LinuxAdapter(_BaseAdapter):
         number = self._parse_display_number(display_value)
         if number is None:
             return False
-        return Path(f"/tmp/.X11-unix/X{number}").exists()
+        return os.path.exists(f"/tmp/.X11-unix/X{number}")
 
     @staticmethod
     def _has_wayland_socket(runtime_dir: str, display_name: str | None) -> bool:
         raw = str(display_name or "").strip()
         if not raw:
             return False
-        return Path(runtime_dir, raw).exists()
+        return os.path.exists(os.path.join(runtime_dir, raw))
 
     def _detect_wayland_display(self, env: Mapping[str, str], runtime_dir: str) -> str | None:
         current = str(env.get("WAYLAND_DISPLAY", "")).strip()
@@ -169,21 +374,8 @@ class LinuxAdapter(_BaseAdapter):
         if pattern is None:
             return False
 
-        try:
-            proc = subprocess.run(
-                ["ps", "-eo", "args="],
-                capture_output=True,
-                text=True,
-                timeout=3,
-                check=False,
-            )
-        except Exception:
-            return False
-
-        if not proc.stdout:
-            return False
-
-        for line in proc.stdout.splitlines():
+        # Stop reading (and kill ps) at the first match.
+        for line in _iter_command_output(["ps", "-eo", "args="], timeout_s=3.0):
             lowered = line.lower()
             has_tigervnc_marker = ("xtigervnc" in lowered) or (
                 "tigervnc" in lowered and "vncserver" in lowered
@@ -197,8 +389,7 @@ class LinuxAdapter(_BaseAdapter):
         number = LinuxAdapter._parse_display_number(display_value)
         if number is None:
             return None
-        # Match :N or :N.screen but avoid accidental matches like :10 when looking for :1.
-        return re.compile(rf"(?<![0-9]):{number}(?:\.[0-9]+)?(?![0-9])")
+        return _compile_display_pattern(number)
 
     def _detect_tigervnc_display(self) -> str | None:
         display = ":1"
@@ -208,8 +399,7 @@ class LinuxAdapter(_BaseAdapter):
             return display
         return None
 
-    def _detect_existing_x11_display(self, env: Mapping[str, str]) -> str | None:
-        display = str(env.get("DISPLAY", "")).strip()
+    def _detect_existing_x11_display(self, display: str) -> str | None:
         if not display:
             return None
         if self._is_network_x11_display(display):
@@ -218,15 +408,30 @@ class LinuxAdapter(_BaseAdapter):
             return display
         return None
 
-    def _detect_display_backend(self, env: Mapping[str, str]) -> tuple[str | None, str | None]:
-        runtime_dir = self._runtime_dir(env)
-
+    def _detect_display_backend(
+        self, env: Mapping[str, str], runtime_dir: str | None = None
+    ) -> tuple[str | None, str | None]:
+        if runtime_dir is None:
+            runtime_dir = self._runtime_dir(env)
+        key = (str(env.get("DISPLAY", "")), str(env.get("WAYLAND_DISPLAY", "")), runtime_dir)
+        detected = self._backend_cache.get(key)
+        if detected is None:
+            detected = self._detect_display_backend_uncached(env, runtime_dir)
+            # A miss is not cached: a display that comes up later (e.g. VNC started after
+            # the first probe) must be found without an explicit refresh().
+            if detected[0] is not None:
+                self._backend_cache[key] = detected
+        return detected
+
+    def _detect_display_backend_uncached(
+        self, env: Mapping[str, str], runtime_dir: str
+    ) -> tuple[str | None, str | None]:
         # Priority 1: Wayland (validated by socket where possible).
         wayland_display = self._detect_wayland_display(env, runtime_dir)
         if wayland_display:
             return "wayland", wayland_display
 
-        x11_display = self._detect_existing_x11_display(env)
+        x11_display = self._detect_existing_x11_display(str(env.get("DISPLAY", "")).strip())
         if x11_display:
             return "x11", x11_display
 
@@ -237,32 +442,40 @@ class LinuxAdapter(_BaseAdapter):
 
         return None, None
 
-    def prepare_gui_env(self, source_env: Mapping[str, str]) -> dict[str, str]:
-        env = dict(source_env)
-        runtime_dir = self._runtime_dir(env)
-        backend, display_value = self._detect_display_backend(env)
-
+    @staticmethod
+    def _wayland_overlay(
+        source_env: Mapping[str, str], runtime_dir: str, display_value: str | None
+    ) -> dict[str, str | None]:
+        overlay: dict[str, str | None] = {
+            "WAYLAND_DISPLAY": str(display_value or "wayland-0"),
+            "XDG_RUNTIME_DIR": runtime_dir,
+            "DISPLAY": None,
+        }
+        if "DBUS_SESSION_BUS_ADDRESS" not in source_env:
+            overlay["DBUS_SESSION_BUS_ADDRESS"] = f"unix:path={runtime_dir}/bus"
+        if not source_env.get("XDG_SESSION_TYPE"):
+            overlay["XDG_SESSION_TYPE"] = "wayland"
+        return overlay
+
+    def prepare_gui_env_overlay(self, source_env: Mapping[str, str]) -> dict[str, str | None]:
+        runtime_dir = self._runtime_dir(source_env)
+        backend, display_value = self._detect_display_backend(source_env, runtime_dir)
+
+        overlay: dict[str, str | None] = {}
         if backend == "wayland":
-            env["WAYLAND_DISPLAY"] = str(display_value or "wayland-0")
-            env["XDG_RUNTIME_DIR"] = runtime_dir
-            env["DBUS_SESSION_BUS_ADDRESS"] = env.get(
-                "DBUS_SESSION_BUS_ADDRESS", f"unix:path={runtime_dir}/bus"
-            )
-            env["XDG_SESSION_TYPE"] = env.get("XDG_SESSION_TYPE") or "wayland"
-            env.pop("DISPLAY", None)
+            overlay = self._wayland_overlay(source_env, runtime_dir, display_value)
         elif backend == "x11":
-            env["DISPLAY"] = str(display_value or "")
-            env.pop("WAYLAND_DISPLAY", None)
+            overlay = {"DISPLAY": str(display_value or ""), "WAYLAND_DISPLAY": None}
 
-        qpa_platform = str(env.get("BINJA_QPA_PLATFORM", "")).strip().lower()
+        qpa_platform = _qpa_platform_override(source_env)
         if qpa_platform:
-            env["QT_QPA_PLATFORM"] = qpa_platform
+            overlay["QT_QPA_PLATFORM"] = qpa_platform
         elif backend == "wayland":
-            env["QT_QPA_PLATFORM"] = "wayland"
+            overlay["QT_QPA_PLATFORM"] = "wayland"
         elif backend == "x11":
-            env.pop("QT_QPA_PLATFORM", None)
+            overlay["QT_QPA_PLATFORM"] = None
 
-        return env
+        return _changed_only(source_env, overlay)
 
 
 class MacOSAdapter(_BaseAdapter):
@@ -281,13 +494,13 @@ class MacOSAdapter(_BaseAdapter):
             return str(Path(expanded) / "Contents" / "MacOS" / "binaryninja")
         return expanded
 
-    def _default_binary_candidates(self) -> list[str]:
-        return [
+    def _default_binary_candidates(self) -> tuple[str, ...]:
+        return (
             "/Applications/Binary Ninja.app",
             "~/Applications/Binary Ninja.app",
             "/Applications/Binary Ninja.app/Contents/MacOS/binaryninja",
             "~/Applications/Binary Ninja.app/Contents/MacOS/binaryninja",
-        ]
+        )
 
     def process_name_tokens(self) -> tuple[str, ...]:
         return (
@@ -296,21 +509,51 @@ class MacOSAdapter(_BaseAdapter):
             "binja",
         )
 
-    def prepare_gui_env(self, source_env: Mapping[str, str]) -> dict[str, str]:
-        env = dict(source_env)
-        qpa_platform = str(env.get("BINJA_QPA_PLATFORM", "")).strip().lower()
-        if qpa_platform:
-            env["QT_QPA_PLATFORM"] = qpa_platform
-        return env
+    def prepare_gui_env_overlay(self, source_env: Mapping[str, str]) -> dict[str, str | None]:
+        qpa_platform = _qpa_platform_override(source_env)
+        if not qpa_platform:
+            return {}
+        return _changed_only(source_env, {"QT_QPA_PLATFORM": qpa_platform})
+
+
+# (adapter type, explicit path, extra candidates, PATH) -> (resolved path, file signature).
+# Only hits are cached, so installing Binary Ninja mid-run is still noticed.
+_RESOLVED_BINARY_PATHS: dict[tuple, tuple[str, tuple[int, int, int]]] = {}
+_RESOLVED_BINARY_PATHS_MAX = 32
+
+
+def _file_signature(path: str) -> tuple[int, int, int] | None:
+    """(inode, mtime, mode) of ``path``; changes when the binary is replaced or chmod-ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_mode)
+
+
+def invalidate_binary_path_cache() -> None:
+    """Forget cached ``resolve_binary_path`` results."""
+    _RESOLVED_BINARY_PATHS.clear()
+
+
+# sys.platform prefix -> adapter class; anything else gets the generic adapter.
+_ADAPTERS: dict[str, type[_BaseAdapter]] = {
+    "linux": LinuxAdapter,
+    "darwin": MacOSAdapter,
+}
+
 
+@lru_cache(maxsize=None)
+def _shared_adapter(adapter_type: type[_BaseAdapter]) -> _BaseAdapter:
+    # One instance per platform so per-adapter caches survive across calls.
+    return adapter_type()
 
+
+@lru_cache(maxsize=8)
 def get_platform_adapter(platform_name: str | None = None) -> BinaryNinjaPlatformAdapter:
     key = (platform_name or sys.platform or "").lower()
-    if key.startswith("linux"):
-        return LinuxAdapter()
-    if key.startswith("darwin"):
-        return MacOSAdapter()
-    return _BaseAdapter()
+    adapter_type = next((cls for prefix, cls in _ADAPTERS.items() if key.startswith(prefix)), None)
+    return _shared_adapter(adapter_type or _BaseAdapter)
 
 
 def prepare_log_file(log_path: str) -> None:
@@ -319,47 +562,41 @@ def prepare_log_file(log_path: str) -> None:
     path.write_text("")
 
 
+@lru_cache(maxsize=16)
+def _compile_substring_pattern(needles: tuple[str, ...]) -> re.Pattern[str] | None:
+    """Compile one alternation that matches when any of ``needles`` occurs as a substring."""
+    parts = [re.escape(needle) for needle in dict.fromkeys(needles) if needle]
+    if not parts:
+        return None
+    return re.compile("|".join(parts))
+
+
+@lru_cache(maxsize=32)
+def _path_hint(normalize: Callable[[str], str], binary_path: str) -> str:
+    # Keyed on the bound method, so the shared adapters hit the cache on every poll.
+    return normalize(binary_path).lower()
+
+
 def find_binary_ninja_pids(
     *,
     binary_path: str,
     include_any: bool = False,
     adapter: BinaryNinjaPlatformAdapter | None = None,
 ) -> list[int]:
-    out: list[int] = []
     runtime = adapter or get_platform_adapter()
-    path_hint = runtime.normalize_binary_path(binary_path).lower()
-    tokens = tuple(token.lower() for token in runtime.process_name_tokens())
-
-    try:
-        proc = subprocess.run(
-            ["ps", "-eo", "pid=,args="],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            check=False,
-        )
-    except Exception:
-        return out
+    path_hint = _path_hint(runtime.normalize_binary_path, binary_path)
+    needles = (path_hint,)
+    if include_any:
+        needles += runtime.lower_process_name_tokens()
+    pattern = _compile_substring_pattern(needles)
+    if pattern is None:
+        return []
 
-    for raw_line in proc.stdout.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        parts = line.split(None, 1)
-        if len(parts) != 2:
-            continue
-        pid_text, cmd = parts
-        try:
-            pid = int(pid_text)
-        except ValueError:
-            continue
-        cmd_lower = cmd.lower()
-        if path_hint and path_hint in cmd_lower:
-            out.append(pid)
-            continue
-        if include_any and any(token in cmd_lower for token in tokens):
-            out.append(pid)
-    return sorted(set(pid for pid in out if pid > 1))
+    # Lowercasing then searching measures ~3x faster than a re.IGNORECASE search.
+    search = pattern.search
+    return sorted(
+        {pid for pid, cmd in runtime.iter_process_cmdlines() if pid > 1 and search(cmd.lower())}
+    )
 
 
 def _pid_exists(pid: int) -> bool:
@@ -377,20 +614,181 @@ def _pid_exists(pid: int) -> bool:
     return True
 
 
+def _pid_reap(pid: int) -> bool:
+    """Return True once ``pid`` has exited, reaping it when it is our own child.
+
+    For children this is a single non-blocking wait that also collects the zombie (which
+    ``kill(pid, 0)`` would still report as alive); other pids fall back to probing.
+    """
+    try:
+        if hasattr(os, "waitid"):
+            return os.waitid(os.P_PID, pid, os.WEXITED | os.WNOHANG) is not None
+        return os.waitpid(pid, os.WNOHANG)[0] != 0
+    except ChildProcessError:
+        # Not our child (or already reaped).
+        return not _pid_exists(pid)
+    except OSError:
+        return not _pid_exists(pid)
+
+
+def _pid_exited(pid: int, *, reap: bool) -> bool:
+    """Non-blocking exit probe; only reaps (and so only trusts waitid) for our own children."""
+    return _pid_reap(pid) if reap else not _pid_exists(pid)
+
+
+class _PidfdExitWatcher:
+    """Process-exit notifications through Linux pidfds (5.3+)."""
+
+    def __init__(self) -> None:
+        self._poller = select.poll()
+        self._pids: dict[int, int] = {}
+
+    def watch(self, pid: int) -> bool | None:
+        """Start watching ``pid``: False if it is already gone, None if it cannot be watched."""
+        try:
+            pidfd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return None
+        self._pids[pidfd] = pid
+        self._poller.register(pidfd, select.POLLIN)
+        return True
+
+    def wait(self, timeout_s: float) -> list[int]:
+        exited: list[int] = []
+        for pidfd, _event in self._poller.poll(math.ceil(timeout_s * 1000)):
+            exited.append(self._pids.pop(pidfd))
+            self._poller.unregister(pidfd)
+            os.close(pidfd)
+        return exited
+
+    def close(self) -> None:
+        for pidfd in self._pids:
+            os.close(pidfd)
+        self._pids.clear()
+
+
+class _KqueueExitWatcher:
+    """Process-exit notifications through kqueue ``EVFILT_PROC``/``NOTE_EXIT`` (macOS, BSD)."""
+
+    def __init__(self) -> None:
+        self._kqueue = select.kqueue()
+        self._pids: set[int] = set()
+
+    def watch(self, pid: int) -> bool | None:
+        """Start watching ``pid``: False if it is already gone, None if it cannot be watched."""
+        event = select.kevent(
+            pid,
+            filter=select.KQ_FILTER_PROC,
+            flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+            fflags=select.KQ_NOTE_EXIT,
+        )
+        try:
+            self._kqueue.control([event], 0, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return None
+        self._pids.add(pid)
+        return True
+
+    def wait(self, timeout_s: float) -> list[int]:
+        events = self._kqueue.control(None, max(1, len(self._pids)), timeout_s)
+        exited = [int(event.ident) for event in events if event.ident in self._pids]
+        self._pids.difference_update(exited)
+        return exited
+
+    def close(self) -> None:
+        self._kqueue.close()
+        self._pids.clear()
+
+
+def _new_exit_watcher() -> _PidfdExitWatcher | _KqueueExitWatcher | None:
+    if getattr(os, "pidfd_open", None) is not None:
+        return _PidfdExitWatcher()
+    if hasattr(select, "kqueue"):
+        return _KqueueExitWatcher()
+    return None
+
+
+def _wait_for_pids_exit(pids: Iterable[int], timeout_s: float, *, reap: bool = False) -> set[int]:
+    """Wait up to ``timeout_s`` for all ``pids`` to exit; return the ones still running.
+
+    Exits are reported by pidfds (Linux 5.3+) or kqueue (macOS/BSD), so the wait ends as soon
+    as the last process exits; pids neither can watch are probed every 50 ms. With ``reap``
+    the caller owns the pids as children and exited ones are reaped instead of left as
+    zombies.
+    """
+    deadline = time.monotonic() + max(0.0, float(timeout_s))
+    pending = set(pids)
+    watcher = _new_exit_watcher()
+    try:
+        probed: set[int] = set()
+        for pid in sorted(pending):
+            status = watcher.watch(pid) if watcher is not None else None
+            if status is False:
+                pending.discard(pid)
+            elif status is None:
+                probed.add(pid)
+
+        wait_s = 0.0
+        while pending:
+            if watcher is not None and len(pending) > len(probed):
+                for pid in watcher.wait(wait_s):
+                    if reap:
+                        _pid_reap(pid)
+                    pending.discard(pid)
+            elif wait_s > 0:
+                time.sleep(wait_s)
+            for pid in [pid for pid in probed if _pid_exited(pid, reap=reap)]:
+                probed.discard(pid)
+                pending.discard(pid)
+
+            remaining = deadline - time.monotonic()
+            if not pending or remaining <= 0:
+                break
+            wait_s = min(remaining, 0.05) if probed else remaining
+    finally:
+        if watcher is not None:
+            watcher.close()
+    return pending
+
+
+def launch_with_new_session(argv: Sequence[str], **popen_kwargs: Any) -> subprocess.Popen:
+    """Start ``argv`` as the leader of a new session and process group.
+
+    A group leader lets :func:`signal_pid` reach the whole process tree with one ``killpg``.
+    """
+    popen_kwargs["start_new_session"] = True
+    return subprocess.Popen(list(argv), **popen_kwargs)
+
+
 def signal_pid(pid: int, sig: int) -> bool:
+    """Signal the process group led by ``pid``, or just ``pid`` when it leads none.
+
+    The group is only used when ``pid`` is its leader (see :func:`launch_with_new_session`):
+    the group of a non-leader is its parent's, which may be our own.
+    """
     if not isinstance(pid, int) or pid <= 1:
         return False
-    try:
-        if hasattr(os, "killpg"):
-            os.killpg(pid, sig)
-            return True
-    except ProcessLookupError:
-        # Not a group leader or group missing; try direct pid below.
-        pass
-    except PermissionError:
-        return False
-    except Exception:
-        pass
+    if hasattr(os, "killpg"):
+        try:
+            pgid = os.getpgid(pid)
+        except ProcessLookupError:
+            return False
+        except Exception:
+            pgid = None
+        if pgid == pid and pgid != os.getpgrp():
+            try:
+                os.killpg(pgid, sig)
+                return True
+            except ProcessLookupError:
+                return False
+            except PermissionError:
+                return False
+            except Exception:
+                pass
     try:
         os.kill(pid, sig)
         return True
@@ -402,25 +800,54 @@ def signal_pid(pid: int, sig: int) -> bool:
         return False
 
 
-def terminate_pid_tree(pid: int, grace_s: float = 0.5) -> bool:
-    if not isinstance(pid, int) or pid <= 1:
-        return False
-    if not _pid_exists(pid):
-        return False
+def _signal_pids(pids: Sequence[int], sig: int) -> list[int]:
+    """Send ``sig`` to ``pids`` with one ``killpg`` per group whose leader is among them.
 
-    sent_term = signal_pid(pid, signal.SIGTERM)
-    if not sent_term:
-        return False
-    time.sleep(max(0.0, float(grace_s)))
-    if not _pid_exists(pid):
-        return True
+    Group members are not signalled again when their leader's ``killpg`` succeeded; if it
+    failed (the leader already exited), they fall back to :func:`signal_pid` individually.
+    Returns the pids that were reached, in input order.
+    """
+    if not hasattr(os, "killpg"):
+        return [pid for pid in pids if signal_pid(pid, sig)]
+
+    own_pgrp = os.getpgrp()
+    groups: dict[int, list[int]] = {}
+    for pid in pids:
+        try:
+            pgid = os.getpgid(pid)
+        except ProcessLookupError:
+            continue
+        except OSError:
+            pgid = pid
+        groups.setdefault(pgid, []).append(pid)
+
+    reached: set[int] = set()
+    for pgid, members in groups.items():
+        if pgid in members and pgid != own_pgrp and signal_pid(pgid, sig):
+            reached.update(members)
+            continue
+        reached.update(pid for pid in members if pid != pgid and signal_pid(pid, sig))
+    return [pid for pid in pids if pid in reached]
+
+
+def terminate_pids(pids: Iterable[int], grace_s: float = 0.5, *, reap: bool = False) -> list[int]:
+    """Terminate several processes sharing one grace period; return the pids that exited.
+
+    Every live pid gets SIGTERM up front (one ``killpg`` per group led by one of ``pids``),
+    survivors of the shared ``grace_s`` wait are probed once more and only those still
+    running get SIGKILL (so a pid that exited, and may have been reused, right at the
+    deadline is left alone); the final wait covers all of them. Pass ``reap=True`` only for
+    pids this process spawned, so they are reaped rather than left as zombies.
+    """
+    candidates = dict.fromkeys(pid for pid in pids if isinstance(pid, int) and pid > 1)
+    signalled = _signal_pids(list(candidates), signal.SIGTERM)
+    survivors = _wait_for_pids_exit(signalled, grace_s, reap=reap)
+    survivors = {pid for pid in survivors if not _pid_exited(pid, reap=reap)}
+
+    killed = set(_signal_pids(sorted(survivors), signal.SIGKILL))
+    still_running = _wait_for_pids_exit(killed, 1.0, reap=reap) | (survivors - killed)
+    return [pid for pid in signalled if pid not in still_running]
 
-    sent_kill = signal_pid(pid, signal.SIGKILL)
-    if not sent_kill:
-        return False
 
-    for _ in range(20):
-        if not _pid_exists(pid):
-            return True
-        time.sleep(0.05)
-    return not _pid_exists(pid)
+def terminate_pid_tree(pid: int, grace_s: float = 0.5, *, reap: bool = False) -> bool:
+    return bool(terminate_pids([pid], grace_s=grace_s, reap=reap))
@@ -3,8 +3,16 @@
 Automated test script for all Binary Ninja MCP commands
 """
 
+import contextlib
+import functools
+import importlib.util
+import io
 import json
+import os
+import shlex
 import subprocess
+import sys
+from dataclasses import dataclass
 from typing import Dict, Any
 import urllib.parse
 
@@ -12,6 +20,9 @@ import requests
 
 # Configuration
 CLI_PATH = "scripts/binja-cli.py"
+# Optional command prefix (e.g. "uv run python scripts/binja-cli.py") to run the CLI in a
+# separate environment; by default it is imported and run in-process.
+CLI_RUNNER = os.environ.get("BINJA_CLI_RUNNER", "")
 HTTP_URL = "http://localhost:9009"
 DEFAULT_ENDPOINT_API_VERSION = 1
 ENDPOINT_API_VERSION_OVERRIDES = {
@@ -21,6 +32,41 @@ ENDPOINT_API_VERSION_OVERRIDES = {
 }
 
 
+@dataclass(frozen=True)
+class CommandSpec:
+    name: str
+    cli_cmd: str = None
+    http_endpoint: str = None
+    method: str = "GET"
+    data: Dict = None
+    params: Dict = None
+
+    @property
+    def display_command(self) -> str:
+        if self.cli_cmd or not self.params:
+            return self.cli_cmd or self.http_endpoint
+        return f"{self.http_endpoint}?{urllib.parse.urlencode(self.params)}"
+
+
+@functools.lru_cache(maxsize=1)
+def _load_cli_app():
+    """Import the CLI script once so commands run in-process instead of per-call subprocesses.
+
+    Reuses the module the root conftest registers, so a pytest session executes it only once.
+    """
+    module = sys.modules.get("binja_cli_script")
+    if module is None:
+        spec = importlib.util.spec_from_file_location("binja_cli_script", CLI_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["binja_cli_script"] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            sys.modules.pop("binja_cli_script", None)
+            raise
+    return module.BinaryNinjaCLI
+
+
 class CommandTester:
     def __init__(self):
         self.results = []
@@ -29,9 +75,18 @@ class CommandTester:
 
     def run_cli(self, command: str) -> Dict[str, Any]:
         """Run CLI command and return result"""
-        full_cmd = f"uv run python {CLI_PATH} --json {command}"
+        if CLI_RUNNER:
+            return self._run_cli_subprocess(
+                [*shlex.split(CLI_RUNNER), "--json", *shlex.split(command)]
+            )
+        argv = [CLI_PATH, "--json", *shlex.split(command)]
+        stdout, stderr = io.StringIO(), io.StringIO()
+        return self._run_cli_in_process(argv, stdout, stderr)
+
+    @staticmethod
+    def _run_cli_subprocess(argv: list) -> Dict[str, Any]:
         try:
-            result = subprocess.run(full_cmd, shell=True, capture_output=True, text=True)
+            result = subprocess.run(argv, capture_output=True, text=True)
             if result.returncode == 0:
                 return {"success": True, "output": json.loads(result.stdout)}
             else:
@@ -39,18 +94,42 @@ class CommandTester:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @staticmethod
+    def _run_cli_in_process(argv, stdout: io.StringIO, stderr: io.StringIO) -> Dict[str, Any]:
+        saved_argv = sys.argv
+        try:
+            app = _load_cli_app()
+            # The top-level app shows help when sys.argv has no arguments.
+            sys.argv = argv
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    _, retcode = app.run(argv, exit=False)
+                except SystemExit as exc:
+                    retcode = exc.code if isinstance(exc.code, int) else 1
+            if retcode == 0:
+                return {"success": True, "output": json.loads(stdout.getvalue())}
+            else:
+                return {"success": False, "error": stderr.getvalue() or stdout.getvalue()}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        finally:
+            sys.argv = saved_argv
+
     @staticmethod
     def _expected_api_version(endpoint: str) -> int:
-        path = str(endpoint or "").split("?", 1)[0]
+        endpoint = str(endpoint or "")
+        query_start = endpoint.find("?")
+        path = endpoint if query_start < 0 else endpoint[:query_start]
         if not path.startswith("/"):
             path = f"/{path}"
         return ENDPOINT_API_VERSION_OVERRIDES.get(path, DEFAULT_ENDPOINT_API_VERSION)
 
-    def run_http(self, endpoint: str, method: str = "GET", data: Dict = None) -> Dict[str, Any]:
+    def run_http(
+        self, endpoint: str, method: str = "GET", data: Dict = None, params: Dict = None
+    ) -> Dict[str, Any]:
         """Run HTTP request to test endpoints without CLI wrappers."""
-        path, _, query = endpoint.partition("?")
-        url = f"{HTTP_URL}/{path}"
-        params = dict(urllib.parse.parse_qsl(query)) if query else {}
+        url = f"{HTTP_URL}/{endpoint}"
+        params = dict(params or {})
         api_version = self._expected_api_version(endpoint)
         params["_api_version"] = api_version
         headers = {"X-Binja-MCP-Api-Version": str(api_version)}
@@ -101,32 +180,38 @@ class CommandTester:
         http_endpoint: str = None,
         method: str = "GET",
         data: Dict = None,
+        params: Dict = None,
     ) -> Dict[str, Any]:
         """Test a single command"""
-        print(f"Testing {name}...")
+        test_result = self._run_spec(
+            CommandSpec(name, cli_cmd, http_endpoint, method, data, params)
+        )
+        self.results.append(test_result)
+        return test_result
 
-        if cli_cmd:
-            result = self.run_cli(cli_cmd)
+    def _run_spec(self, spec: CommandSpec) -> Dict[str, Any]:
+        """Run one command and build its result entry without recording it"""
+        print(f"Testing {spec.name}...")
+
+        if spec.cli_cmd:
+            result = self.run_cli(spec.cli_cmd)
             interface = "CLI"
-        elif http_endpoint:
-            result = self.run_http(http_endpoint, method, data)
+        elif spec.http_endpoint:
+            result = self.run_http(spec.http_endpoint, spec.method, spec.data, spec.params)
             interface = "HTTP"
         else:
             result = {"success": False, "error": "No command specified"}
             interface = "Unknown"
 
-        test_result = {
-            "name": name,
+        return {
+            "name": spec.name,
             "interface": interface,
-            "command": cli_cmd or http_endpoint,
+            "command": spec.display_command,
             "success": result["success"],
             "output": result.get("output"),
             "error": result.get("error"),
         }
 
-        self.results.append(test_result)
-        return test_result
-
     def run_all_tests(self):
         """Run all command tests"""
         print("Starting comprehensive MCP command tests...\n")
@@ -136,18 +221,20 @@ class CommandTester:
 
         # 2. Code Listing & Search
         self.test_command("list_methods", cli_cmd="functions --limit 5")
-        self.test_command("list_classes", http_endpoint="classes?limit=5")
-        self.test_command("list_segments", http_endpoint="segments?limit=5")
+        self.test_command("list_classes", http_endpoint="classes", params={"limit": 5})
+        self.test_command("list_segments", http_endpoint="segments", params={"limit": 5})
         self.test_command("list_imports", cli_cmd="imports --limit 5")
         self.test_command("list_exports", cli_cmd="exports --limit 5")
-        self.test_command("list_namespaces", http_endpoint="namespaces?limit=5")
-        self.test_command("list_data_items", http_endpoint="data?limit=5")
+        self.test_command("list_namespaces", http_endpoint="namespaces", params={"limit": 5})
+        self.test_command("list_data_items", http_endpoint="data", params={"limit": 5})
         self.test_command("search_functions_by_name", cli_cmd="functions --search room --limit 5")
 
         # 3. Code Analysis
         self.test_command("decompile_function", cli_cmd=f"decompile {self.test_function}")
         self.test_command("fetch_disassembly", cli_cmd=f"assembly {self.test_function}")
-        self.test_command("function_at", http_endpoint=f"functionAt?address={self.test_address}")
+        self.test_command(
+            "function_at", http_endpoint="functionAt", params={"address": self.test_address}
+        )
         self.test_command("code_references", cli_cmd=f"refs {self.test_function}")
         self.test_command("get_user_defined_type", cli_cmd="type Point")
 
@@ -156,18 +243,21 @@ class CommandTester:
         self.test_command("rename_data", cli_cmd="rename data 0x8282 my_data")
         self.test_command(
             "rename_variable",
-            http_endpoint="renameVariable?functionName=room2_entry&variableName=var_1&newName=counter",
+            http_endpoint="renameVariable",
+            params={"functionName": "room2_entry", "variableName": "var_1", "newName": "counter"},
         )
         self.test_command(
             "retype_variable",
-            http_endpoint="retypeVariable?functionName=room2_entry&variableName=counter&type=uint32_t",
+            http_endpoint="retypeVariable",
+            params={"functionName": "room2_entry", "variableName": "counter", "type": "uint32_t"},
         )
         self.test_command(
             "define_types", cli_cmd='type --define "struct Rectangle { int width; int height; };"'
         )
         self.test_command(
             "edit_function_signature",
-            http_endpoint="editFunctionSignature?functionName=room2_entry&signature=void room2_entry(int param)",
+            http_endpoint="editFunctionSignature",
+            params={"functionName": "room2_entry", "signature": "void room2_entry(int param)"},
         )
 
         # 5. Comments
@@ -177,7 +267,9 @@ class CommandTester:
             "set_function_comment",
             cli_cmd='comment --function room2_entry "Entry point for room 2"',
         )
-        self.test_command("get_function_comment", http_endpoint="comment/function?name=room2_entry")
+        self.test_command(
+            "get_function_comment", http_endpoint="comment/function", params={"name": "room2_entry"}
+        )
         self.test_command("delete_comment", cli_cmd="comment --delete 0x8250")
         self.test_command(
             "delete_function_comment",
@@ -194,9 +286,9 @@ class CommandTester:
         self.test_command("clear_logs", cli_cmd="logs --clear")
 
         # 7. Console
-        self.test_command("get_console_output", http_endpoint="console?count=5")
+        self.test_command("get_console_output", http_endpoint="console", params={"count": 5})
         self.test_command("get_console_stats", http_endpoint="console/stats")
-        self.test_command("get_console_errors", http_endpoint="console/errors?count=5")
+        self.test_command("get_console_errors", http_endpoint="console/errors", params={"count": 5})
         self.test_command(
             "execute_python_command",
             http_endpoint="console/execute",
@@ -212,7 +304,8 @@ class CommandTester:
         passed = sum(1 for r in self.results if r["success"])
         failed = sum(1 for r in self.results if not r["success"])
 
-        report = f"""# MCP Commands Test Results
+        parts = [
+            f"""# MCP Commands Test Results
 
 ## Summary
 - Total Commands Tested: {len(self.results)}
@@ -223,22 +316,24 @@ class CommandTester:
 ## Detailed Results
 
 """
+        ]
 
         for result in self.results:
             status = "✅" if result["success"] else "❌"
-            report += f"### {result['name']}\n"
-            report += f"- **Status**: {status}\n"
-            report += f"- **Interface**: {result['interface']}\n"
-            report += f"- **Command**: `{result['command']}`\n"
+            parts.append(f"### {result['name']}\n")
+            parts.append(f"- **Status**: {status}\n")
+            parts.append(f"- **Interface**: {result['interface']}\n")
+            parts.append(f"- **Command**: `{result['command']}`\n")
 
             if result["success"] and result.get("output"):
-                report += f"- **Sample Output**:\n```json\n{json.dumps(result['output'], indent=2)[:500]}\n```\n"
+                sample = json.dumps(result["output"], indent=2)[:500]
+                parts.append(f"- **Sample Output**:\n```json\n{sample}\n```\n")
             elif not result["success"]:
-                report += f"- **Error**: {result.get('error', 'Unknown error')}\n"
+                parts.append(f"- **Error**: {result.get('error', 'Unknown error')}\n")
 
-            report += "\n"
+            parts.append("\n")
 
-        return report
+        return "".join(parts)
 
 
 if __name__ == "__main__":
@@ -2,16 +2,10 @@
 
 from __future__ import annotations
 
-import importlib.util
 from pathlib import Path
 from unittest.mock import Mock
 
-
-SCRIPT_PATH = Path(__file__).resolve().parent / "scripts" / "binja-restart.py"
-SPEC = importlib.util.spec_from_file_location("binja_restart_script", SCRIPT_PATH)
-assert SPEC is not None and SPEC.loader is not None
-binja_restart = importlib.util.module_from_spec(SPEC)
-SPEC.loader.exec_module(binja_restart)
+import binja_restart_script as binja_restart  # registered by conftest.py
 
 
 def _new_app(*, prefer_raw: bool = False):
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import check_unicode_safety_script as check_unicode_safety  # registered by conftest.py
+
+
+def _run(root: Path) -> int:
+    with patch.object(sys, "argv", ["check_unicode_safety.py", str(root)]):
+        return check_unicode_safety.main()
+
+
+def test_clean_tree_passes(tmp_path: Path, capsys):
+    (tmp_path / "clean.py").write_text("print('hello')\n", encoding="utf-8")
+    (tmp_path / "blob.bin").write_bytes(b"\xff\xfe\x00\x01")
+
+    assert _run(tmp_path) == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_reports_line_and_column_of_forbidden_codepoints(tmp_path: Path, capsys):
+    (tmp_path / "bad.py").write_text("ok = 1\nx = 'a\u200bb'\n\u202eend\n", encoding="utf-8")
+
+    assert _run(tmp_path) == 1
+
+    out = capsys.readouterr().out
+    assert "bad.py:2:7 U+200B ZERO WIDTH SPACE" in out
+    assert "bad.py:3:1 U+202E RIGHT-TO-LEFT OVERRIDE" in out
+
+
+def test_skip_dirs_are_not_scanned(tmp_path: Path):
+    skipped = tmp_path / ".venv" / "lib"
+    skipped.mkdir(parents=True)
+    (skipped / "vendored.py").write_text("x = '\u200b'\n", encoding="utf-8")
+
+    assert _run(tmp_path) == 0
+
+
+def test_line_and_column_survive_chunk_boundaries(tmp_path: Path, capsys):
+    (tmp_path / "bad.py").write_text("abc\ndefg\u200bh\n\u202e\n", encoding="utf-8")
+
+    with patch.object(check_unicode_safety, "_CHUNK_SIZE", 3):
+        assert _run(tmp_path) == 1
+
+    out = capsys.readouterr().out
+    assert "bad.py:2:5 U+200B ZERO WIDTH SPACE" in out
+    assert "bad.py:3:1 U+202E RIGHT-TO-LEFT OVERRIDE" in out
@@ -2,42 +2,30 @@
 
 from __future__ import annotations
 
-import importlib.util
 from pathlib import Path
-from unittest.mock import patch
-
-
-SCRIPT_PATH = Path(__file__).resolve().parent / "scripts" / "binja-cli.py"
-SPEC = importlib.util.spec_from_file_location("binja_cli_script_auto_errors", SCRIPT_PATH)
-assert SPEC is not None and SPEC.loader is not None
-binja_cli = importlib.util.module_from_spec(SPEC)
-SPEC.loader.exec_module(binja_cli)
-
-
-def _new_app():
-    app = binja_cli.BinaryNinjaCLI("binja-mcp")
-    app.server_url = "http://localhost:9009"
-    app.request_timeout = 1.0
-    app.verbose = False
-    app.json_output = True
-    app.no_auto_errors = False
-    app.fail_on_new_errors = False
-    app.error_probe_count = 50
-    return app
-
-
-def _ui_open_contract(filepath: str) -> dict:
-    return {
-        "ok": True,
-        "schema_version": 1,
-        "endpoint": "/ui/open",
-        "actions": ["scheduled_open_workflow_on_main_thread"],
-        "warnings": [],
-        "errors": [],
-        "state": {"loaded_filename": filepath},
-        "result": {"ok": True, "input": {"filepath": filepath}},
-        "_api_version": 2,
+from types import MappingProxyType
+from unittest.mock import Mock, patch
+
+import pytest
+
+import binja_cli_script as binja_cli  # registered by conftest.py
+
+
+# Read-only snapshots shared by the error-report tests; the CLI must not mutate them.
+_EMPTY_SNAPSHOT = MappingProxyType(
+    {"count": 50, "console_errors": (), "log_errors": (), "probe_warnings": ()}
+)
+_NEW_CONSOLE_ERROR_SNAPSHOT = MappingProxyType(
+    {
+        **_EMPTY_SNAPSHOT,
+        "console_errors": ({"type": "error", "text": "new console error"},),
     }
+)
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app(request_timeout=1.0, no_auto_errors=False)
 
 
 def test_new_error_entries_detects_incremental_duplicates():
@@ -61,8 +49,43 @@ def test_new_error_entries_detects_incremental_duplicates():
     assert new_entries[1].get("text") == "different"
 
 
-def test_apply_post_command_error_report_attaches_new_errors_to_payload():
-    app = _new_app()
+def test_new_error_entries_matches_entries_without_known_fields():
+    before = [{"code": 1}, "plain"]
+    after = [{"code": 1}, {"code": 2}, "plain", "plain"]
+
+    new_entries = binja_cli.BinaryNinjaCLI._new_error_entries(before, after, source="log")
+
+    assert new_entries == [{"code": 2}, "plain"]
+
+
+def test_format_error_entry_without_known_fields_uses_sorted_stdlib_json():
+    entry = {"path": Path("/tmp/x"), "code": 2}
+
+    assert binja_cli.BinaryNinjaCLI._format_error_entry(entry) == ('{"code": 2, "path": "/tmp/x"}')
+
+
+def test_new_error_entries_unchanged_snapshot_skips_signatures():
+    entries = [{"type": "error", "text": "boom"}, "plain"]
+
+    with patch.object(binja_cli.BinaryNinjaCLI, "_error_entry_signature") as sig_mock:
+        new_entries = binja_cli.BinaryNinjaCLI._new_error_entries(
+            entries, list(entries), source="console"
+        )
+
+    assert new_entries == []
+    sig_mock.assert_not_called()
+
+
+def test_new_error_entries_matches_reordered_keys_and_unserializable_values():
+    before = [{"b": 2, "a": "object"}, {"path": Path("/tmp/x")}]
+    after = [{"a": "object", "b": 2}, {"path": Path("/tmp/x")}, {"path": Path("/tmp/y")}]
+
+    new_entries = binja_cli.BinaryNinjaCLI._new_error_entries(before, after, source="log")
+
+    assert new_entries == [{"path": Path("/tmp/y")}]
+
+
+def test_apply_post_command_error_report_attaches_new_errors_to_payload(app):
     before_snapshot = {
         "count": 50,
         "console_errors": [{"type": "error", "text": "old console error"}],
@@ -98,74 +121,107 @@ def test_apply_post_command_error_report_attaches_new_errors_to_payload():
     assert report.get("new_error_count") == 2
 
 
-def test_apply_post_command_error_report_respects_fail_on_new_errors():
-    app = _new_app()
+def test_apply_post_command_error_report_respects_fail_on_new_errors(app):
     app.fail_on_new_errors = True
+
+    with patch.object(app, "_capture_error_snapshot", return_value=_NEW_CONSOLE_ERROR_SNAPSHOT):
+        should_fail = app._apply_post_command_error_report("assembly", _EMPTY_SNAPSHOT)
+
+    assert should_fail is True
+
+
+def test_apply_post_command_error_report_trusts_incremental_probe(app):
     before_snapshot = {
-        "count": 50,
-        "console_errors": [],
-        "log_errors": [],
-        "probe_warnings": [],
+        **_EMPTY_SNAPSHOT,
+        "console_errors": [{"id": 1, "type": "error", "text": "boom"}],
     }
+    # Same text as the old entry, but the server vouched that it was logged afterwards.
     after_snapshot = {
-        "count": 50,
-        "console_errors": [{"type": "error", "text": "new console error"}],
-        "log_errors": [],
-        "probe_warnings": [],
+        **_EMPTY_SNAPSHOT,
+        "console_errors": [{"id": 2, "type": "error", "text": "boom"}],
+        "console_errors_since": 1,
     }
+    payload = {"success": True}
 
-    with patch.object(app, "_capture_error_snapshot", return_value=after_snapshot):
-        should_fail = app._apply_post_command_error_report("assembly", before_snapshot)
+    with patch.object(app, "_capture_error_snapshot", return_value=after_snapshot) as capture_mock:
+        app._apply_post_command_error_report("decompile", before_snapshot, output_payload=payload)
 
-    assert should_fail is True
+    assert capture_mock.call_args.kwargs["since"] == {"console": 1, "log": None}
+    assert payload["new_errors"]["new_console_errors"] == after_snapshot["console_errors"]
+
+
+@pytest.mark.parametrize(("echoed", "expected"), [(4, 4), (None, None)])
+def test_probe_error_endpoint_reports_whether_start_id_was_applied(app, echoed, expected):
+    body = {"errors": [{"id": 5, "type": "error", "text": "new"}], "_api_version": 1}
+    if echoed is not None:
+        body["start_id"] = echoed
+    response = Mock(**{"json.return_value": body})
+
+    with patch.object(binja_cli.requests, "get", return_value=response) as get_mock:
+        entries, probe_error, applied = app._probe_error_endpoint(
+            "console/errors", count=50, timeout=1.0, start_id=4
+        )
 
+    assert get_mock.call_args.kwargs["params"]["start_id"] == 4
+    assert entries == body["errors"]
+    assert probe_error is None
+    assert applied == expected
 
-def test_open_json_includes_new_errors_and_fails_when_requested():
-    app = _new_app()
+
+def test_apply_post_command_error_report_skips_probe_when_report_is_unused(app):
+    with patch.object(app, "_capture_error_snapshot") as capture_mock:
+        should_fail = app._apply_post_command_error_report("assembly", _EMPTY_SNAPSHOT)
+
+    assert should_fail is False
+    capture_mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("json_output", "verbose", "fail_on_new_errors", "probes"),
+    [
+        (False, False, False, False),
+        (True, False, False, True),
+        (False, True, False, True),
+        (False, False, True, True),
+    ],
+)
+def test_capture_error_snapshot_probes_only_when_the_report_has_a_consumer(
+    app, json_output, verbose, fail_on_new_errors, probes
+):
+    app.json_output = json_output
+    app.verbose = verbose
+    app.fail_on_new_errors = fail_on_new_errors
+
+    with patch.object(app, "_probe_error_endpoint", return_value=([], None, None)) as probe_mock:
+        snapshot = app._capture_error_snapshot()
+
+    assert (snapshot is not None) is probes
+    assert probe_mock.call_count == (2 if probes else 0)
+
+
+def test_open_json_includes_new_errors_and_fails_when_requested(
+    mocked_app, make_open_cmd, ui_open_contract
+):
+    app = mocked_app.app
     app.server_url = "http://testserver:9009"
     app.fail_on_new_errors = True
     target = "/tmp/target.bin"
-    open_cmd = binja_cli.Open("open")
-    open_cmd.parent = app
-    open_cmd.platform = None
-    open_cmd.view_type = None
-    open_cmd.no_click = False
-    open_cmd.inspect_only = False
-    open_cmd.wait_open_target = 0.0
-    open_cmd.wait_analysis = False
-    open_cmd.analysis_timeout = 120.0
+    open_cmd = make_open_cmd(app, wait_open_target=0.0)
+    mocked_app.request.return_value = ui_open_contract(target)
+    mocked_app.capture_error_snapshot.side_effect = [_EMPTY_SNAPSHOT, _NEW_CONSOLE_ERROR_SNAPSHOT]
 
-    before_snapshot = {
-        "count": 50,
-        "console_errors": [],
-        "log_errors": [],
-        "probe_warnings": [],
-    }
-    after_snapshot = {
-        "count": 50,
-        "console_errors": [{"type": "error", "text": "new console error"}],
-        "log_errors": [],
-        "probe_warnings": [],
-    }
-
-    with (
-        patch.object(app, "_ensure_server_for_open", return_value={"ok": True}),
-        patch.object(app, "_request", return_value=_ui_open_contract(target)),
-        patch.object(app, "_capture_error_snapshot", side_effect=[before_snapshot, after_snapshot]),
-        patch.object(app, "_output") as output_mock,
-    ):
-        rc = open_cmd.main(target)
+    rc = open_cmd.main(target)
 
     assert rc == 1
-    out = output_mock.call_args.args[0]
+    out = mocked_app.output.call_args.args[0]
     report = out.get("new_errors")
     assert isinstance(report, dict)
     assert report.get("command") == "open"
     assert report.get("new_error_count") == 1
 
 
-def test_python_execute_json_fails_on_new_errors_when_requested():
-    app = _new_app()
+def test_python_execute_json_fails_on_new_errors_when_requested(mocked_app):
+    app = mocked_app.app
     app.fail_on_new_errors = True
     py_cmd = binja_cli.Python("python")
     py_cmd.parent = app
@@ -174,36 +230,19 @@ def test_python_execute_json_fails_on_new_errors_when_requested():
     py_cmd.stdin = False
     py_cmd.complete = None
     py_cmd.exec_timeout = 30.0
-
-    before_snapshot = {
-        "count": 50,
-        "console_errors": [],
-        "log_errors": [],
-        "probe_warnings": [],
-    }
-    after_snapshot = {
-        "count": 50,
-        "console_errors": [{"type": "error", "text": "new console error"}],
-        "log_errors": [],
-        "probe_warnings": [],
-    }
-    execute_result = {
+    mocked_app.request.return_value = {
         "success": True,
         "stdout": "",
         "stderr": "",
         "return_value": None,
         "variables": {},
     }
+    mocked_app.capture_error_snapshot.side_effect = [_EMPTY_SNAPSHOT, _NEW_CONSOLE_ERROR_SNAPSHOT]
 
-    with (
-        patch.object(app, "_request", return_value=execute_result),
-        patch.object(app, "_capture_error_snapshot", side_effect=[before_snapshot, after_snapshot]),
-        patch.object(app, "_output") as output_mock,
-    ):
-        rc = py_cmd.main("print('hello')")
+    rc = py_cmd.main("print('hello')")
 
     assert rc == 1
-    out = output_mock.call_args.args[0]
+    out = mocked_app.output.call_args.args[0]
     report = out.get("new_errors")
     assert isinstance(report, dict)
     assert report.get("command") == "python.execute"
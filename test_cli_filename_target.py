@@ -2,18 +2,16 @@
 
 from __future__ import annotations
 
-import subprocess
 import sys
-from pathlib import Path
 
+import pytest
 
-def test_cli_injects_filename_target_into_requests() -> None:
-    root = Path(__file__).resolve().parent
-    script = root / "scripts" / "binja-cli.py"
+import binja_cli_script as binja_cli  # registered by conftest.py
 
-    cmd = [
-        sys.executable,
-        str(script),
+
+def test_cli_injects_filename_target_into_requests(monkeypatch, capsys) -> None:
+    argv = [
+        "binja-cli.py",
         "--server",
         "http://127.0.0.1:1",
         "--filename",
@@ -21,8 +19,13 @@ def test_cli_injects_filename_target_into_requests() -> None:
         "--verbose",
         "status",
     ]
-    proc = subprocess.run(cmd, capture_output=True, text=True, timeout=20)
+    # The top-level app decides whether to show help from sys.argv.
+    monkeypatch.setattr(sys, "argv", argv)
+
+    with pytest.raises(SystemExit) as exc:
+        binja_cli.BinaryNinjaCLI.run(argv)
 
-    assert proc.returncode != 0
-    assert "Params: {'filename': 'primary.bin'" in proc.stderr
-    assert "Data: {'filename': 'primary.bin'" in proc.stderr
+    stderr = capsys.readouterr().err
+    assert exc.value.code != 0
+    assert "Params: {'filename': 'primary.bin'" in stderr
+    assert "Data: {'filename': 'primary.bin'" in stderr
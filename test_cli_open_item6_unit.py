@@ -2,60 +2,31 @@
 
 from __future__ import annotations
 
-import importlib.util
-import subprocess
 import sys
-from pathlib import Path
 from unittest.mock import patch
 
+import pytest
 
-SCRIPT_PATH = Path(__file__).resolve().parent / "scripts" / "binja-cli.py"
-SPEC = importlib.util.spec_from_file_location("binja_cli_script_open_item6", SCRIPT_PATH)
-assert SPEC is not None and SPEC.loader is not None
-binja_cli = importlib.util.module_from_spec(SPEC)
-SPEC.loader.exec_module(binja_cli)
-
-
-def _new_app():
-    app = binja_cli.BinaryNinjaCLI("binja-mcp")
-    app.server_url = "http://localhost:9009"
-    app.request_timeout = 5.0
-    app.verbose = False
-    app.json_output = True
-    app.no_auto_errors = True
-    app.fail_on_new_errors = False
-    app.error_probe_count = 50
-    return app
-
-
-def _ui_open_contract(filepath: str) -> dict:
-    return {
-        "ok": True,
-        "schema_version": 1,
-        "endpoint": "/ui/open",
-        "actions": ["scheduled_open_workflow_on_main_thread"],
-        "warnings": [],
-        "errors": [],
-        "state": {"loaded_filename": filepath},
-        "result": {"ok": True, "input": {"filepath": filepath}},
-        "_api_version": 2,
-    }
-
-
-def _ui_open_contract_with_state(
-    filepath: str,
-    *,
-    loaded_filename: str | None = None,
-    warnings: list[str] | None = None,
-) -> dict:
-    payload = _ui_open_contract(filepath)
-    payload["state"]["loaded_filename"] = (
-        loaded_filename if loaded_filename is not None else filepath
-    )
-    payload["warnings"] = list(warnings or [])
-    payload["result"]["warnings"] = list(warnings or [])
-    payload["result"]["state"] = dict(payload["state"])
-    return payload
+import binja_cli_script  # registered by conftest.py
+
+
+# Every wait/poll loop in this module runs against a fake clock instead of real sleeps.
+pytestmark = pytest.mark.usefixtures("fake_clock")
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def idle_state(app, monkeypatch):
+    """Pin the runtime ``AnalysisState.IdleState`` value the wait loop compares against."""
+
+    def _set(value: int) -> None:
+        monkeypatch.setattr(app, "_resolve_idle_analysis_state_value", lambda **_: value)
+
+    return _set
 
 
 class _MockStateCode:
@@ -69,14 +40,23 @@ class _MockStateCode:
         return str(self.value)
 
 
-def test_wait_for_open_target_in_views_matches_requested_file():
-    app = _new_app()
+class _Replies:
+    """Stand-in for ``app._request`` that returns ``payloads`` in order and records each call."""
+
+    def __init__(self, payloads: list[dict]):
+        self._payloads = iter(payloads)
+        self.calls: list[tuple[tuple, dict]] = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return next(self._payloads)
+
+
+def test_wait_for_open_target_in_views_matches_requested_file(app, monkeypatch):
     target = "/tmp/target.bin"
 
-    with patch.object(
-        app,
-        "_request",
-        side_effect=[
+    replies = _Replies(
+        [
             {
                 "views": [
                     {
@@ -101,89 +81,93 @@ def test_wait_for_open_target_in_views_matches_requested_file():
                 "current_view_id": "22",
                 "_api_version": 1,
             },
-        ],
-    ):
-        out = app._wait_for_open_target_in_views(target, timeout=0.3, poll_interval=0.01)
+        ]
+    )
+    monkeypatch.setattr(app, "_request", replies)
+    out = app._wait_for_open_target_in_views(target, timeout=0.3, poll_interval=0.01)
 
     assert out.get("ok") is True
     assert out.get("matched_view", {}).get("filename") == target
     assert out.get("matched_view", {}).get("view_id") == "22"
 
 
-def test_open_help_does_not_expose_no_ui_switch():
-    result = subprocess.run(
-        [sys.executable, str(SCRIPT_PATH), "open", "--help"],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    assert result.returncode == 0
-    text = (result.stdout or "") + (result.stderr or "")
+def _run_cli(monkeypatch, capsys, *args: str) -> tuple[int, str]:
+    argv = ["binja-cli.py", *args]
+    # The top-level app decides whether to show help from sys.argv.
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(SystemExit) as exc:
+        binja_cli_script.BinaryNinjaCLI.run(argv)
+    captured = capsys.readouterr()
+    return exc.value.code, captured.out + captured.err
+
+
+def test_open_help_does_not_expose_no_ui_switch(monkeypatch, capsys):
+    code, text = _run_cli(monkeypatch, capsys, "open", "--help")
+    assert code == 0
     assert "--no-ui" not in text
     assert "UI-only open workflow" in text
 
 
-def test_open_rejects_no_ui_switch():
-    result = subprocess.run(
-        [sys.executable, str(SCRIPT_PATH), "open", "--no-ui"],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    assert result.returncode != 0
-    text = (result.stdout or "") + (result.stderr or "")
+def test_open_rejects_no_ui_switch(monkeypatch, capsys):
+    code, text = _run_cli(monkeypatch, capsys, "open", "--no-ui")
+    assert code != 0
     assert "Unknown switch --no-ui" in text
 
 
-def test_wait_for_analysis_on_target_polls_views_until_idle():
-    app = _new_app()
-    resolved_idle = 2
+@pytest.mark.parametrize(
+    ("busy_code", "resolved_idle"),
+    [
+        (5, 2),
+        # The idle value comes from the runtime enum, never a literal zero.
+        (6, 7),
+    ],
+)
+def test_wait_for_analysis_on_target_polls_views_until_idle(
+    app, idle_state, monkeypatch, busy_code, resolved_idle
+):
+    busy_token = str(busy_code)
     idle_token = str(resolved_idle)
 
-    with (
-        patch.object(app, "_resolve_idle_analysis_state_value", return_value=resolved_idle),
-        patch.object(
-            app,
-            "_request",
-            side_effect=[
-                {
-                    "views": [
-                        {
-                            "filename": "/tmp/target.bin",
-                            "view_id": "22",
-                            "analysis_state_code": 5,
-                            "analysis_status": "5",
-                        }
-                    ],
-                    "_api_version": 1,
-                },
-                {
-                    "views": [
-                        {
-                            "filename": "/tmp/target.bin",
-                            "view_id": "22",
-                            "analysis_state_code": resolved_idle,
-                            "analysis_status": idle_token,
-                        }
-                    ],
-                    "_api_version": 1,
-                },
-            ],
-        ) as req_mock,
-    ):
-        out = app._wait_for_analysis_on_target(
-            filename="/tmp/target.bin",
-            view_id="22",
-            timeout=2.0,
-        )
+    idle_state(resolved_idle)
+    replies = _Replies(
+        [
+            {
+                "views": [
+                    {
+                        "filename": "/tmp/target.bin",
+                        "view_id": "22",
+                        "analysis_state_code": busy_code,
+                        "analysis_status": busy_token,
+                    }
+                ],
+                "_api_version": 1,
+            },
+            {
+                "views": [
+                    {
+                        "filename": "/tmp/target.bin",
+                        "view_id": "22",
+                        "analysis_state_code": resolved_idle,
+                        "analysis_status": idle_token,
+                    }
+                ],
+                "_api_version": 1,
+            },
+        ]
+    )
+    monkeypatch.setattr(app, "_request", replies)
+    out = app._wait_for_analysis_on_target(
+        filename="/tmp/target.bin",
+        view_id="22",
+        timeout=2.0,
+    )
 
     assert out.get("success") is True
     assert out.get("analysis_status") == idle_token
     assert out.get("selected_view_filename") == "/tmp/target.bin"
     assert out.get("selected_view_id") == "22"
-    assert req_mock.call_count == 2
-    for call in req_mock.call_args_list:
-        args, kwargs = call
+    assert len(replies.calls) == 2
+    for args, kwargs in replies.calls:
         assert args[0] == "GET"
         assert args[1] == "views"
         params = kwargs.get("params", {})
@@ -191,93 +175,46 @@ def test_wait_for_analysis_on_target_polls_views_until_idle():
         assert params.get("view_id") == "22"
 
 
-def test_wait_for_analysis_uses_runtime_idle_enum_value_not_literal_zero():
-    app = _new_app()
-    resolved_idle = 7
-
-    with (
-        patch.object(app, "_resolve_idle_analysis_state_value", return_value=resolved_idle),
-        patch.object(
-            app,
-            "_request",
-            side_effect=[
-                {
-                    "views": [
-                        {
-                            "filename": "/tmp/target.bin",
-                            "view_id": "22",
-                            "analysis_state_code": 6,
-                            "analysis_status": "6",
-                        }
-                    ],
-                    "_api_version": 1,
-                },
-                {
-                    "views": [
-                        {
-                            "filename": "/tmp/target.bin",
-                            "view_id": "22",
-                            "analysis_state_code": resolved_idle,
-                            "analysis_status": "7",
-                        }
-                    ],
-                    "_api_version": 1,
-                },
-            ],
-        ),
-    ):
-        out = app._wait_for_analysis_on_target(
-            filename="/tmp/target.bin",
-            view_id="22",
-            timeout=2.0,
-        )
-
-    assert out.get("success") is True
-    assert out.get("analysis_status") == "7"
-
-
-def test_wait_for_analysis_prefers_analysis_state_code_over_status_text():
-    app = _new_app()
+def test_wait_for_analysis_prefers_analysis_state_code_over_status_text(
+    app, idle_state, monkeypatch
+):
     resolved_idle = 2
 
-    with (
-        patch.object(app, "_resolve_idle_analysis_state_value", return_value=resolved_idle),
-        patch.object(
-            app,
-            "_request",
-            side_effect=[
-                {
-                    "views": [
-                        {
-                            "filename": "/tmp/target.bin",
-                            "view_id": "22",
-                            "analysis_state_code": 5,
-                            "analysis_state_name": "AnalyzeState",
-                            "analysis_status": "still-running",
-                        }
-                    ],
-                    "_api_version": 1,
-                },
-                {
-                    "views": [
-                        {
-                            "filename": "/tmp/target.bin",
-                            "view_id": "22",
-                            "analysis_state_code": 2,
-                            "analysis_state_name": "IdleState",
-                            "analysis_status": "still-running",
-                        }
-                    ],
-                    "_api_version": 1,
-                },
-            ],
-        ),
-    ):
-        out = app._wait_for_analysis_on_target(
-            filename="/tmp/target.bin",
-            view_id="22",
-            timeout=2.0,
-        )
+    idle_state(resolved_idle)
+    replies = _Replies(
+        [
+            {
+                "views": [
+                    {
+                        "filename": "/tmp/target.bin",
+                        "view_id": "22",
+                        "analysis_state_code": 5,
+                        "analysis_state_name": "AnalyzeState",
+                        "analysis_status": "still-running",
+                    }
+                ],
+                "_api_version": 1,
+            },
+            {
+                "views": [
+                    {
+                        "filename": "/tmp/target.bin",
+                        "view_id": "22",
+                        "analysis_state_code": 2,
+                        "analysis_state_name": "IdleState",
+                        "analysis_status": "still-running",
+                    }
+                ],
+                "_api_version": 1,
+            },
+        ]
+    )
+    monkeypatch.setattr(app, "_request", replies)
+    out = app._wait_for_analysis_on_target(
+        filename="/tmp/target.bin",
+        view_id="22",
+        timeout=2.0,
+    )
 
     assert out.get("success") is True
     assert out.get("analysis_state_code") == 2
@@ -286,69 +223,66 @@ def test_wait_for_analysis_prefers_analysis_state_code_over_status_text():
     assert out.get("analysis_status") == "still-running"
 
 
-def test_wait_for_analysis_transition_5_6_2_succeeds_with_mock_state_types():
-    app = _new_app()
+def test_wait_for_analysis_transition_5_6_2_succeeds_with_mock_state_types(
+    app, idle_state, monkeypatch
+):
     resolved_idle = 2
 
-    with (
-        patch.object(app, "_resolve_idle_analysis_state_value", return_value=resolved_idle),
-        patch.object(
-            app,
-            "_request",
-            side_effect=[
-                {
-                    "views": [
-                        {
-                            "filename": "/tmp/target.bin",
-                            "view_id": "22",
-                            "analysis_state_code": _MockStateCode(5),
-                            "analysis_state_name": "AnalyzeState",
-                            "analysis_status": "running",
-                        }
-                    ],
-                    "_api_version": 1,
-                },
-                {
-                    "views": [
-                        {
-                            "filename": "/tmp/target.bin",
-                            "view_id": "22",
-                            "analysis_state_code": _MockStateCode(6),
-                            "analysis_state_name": "ExtendedAnalyzeState",
-                            "analysis_status": "running",
-                        }
-                    ],
-                    "_api_version": 1,
-                },
-                {
-                    "views": [
-                        {
-                            "filename": "/tmp/target.bin",
-                            "view_id": "22",
-                            "analysis_state_code": _MockStateCode(2),
-                            "analysis_state_name": "IdleState",
-                            "analysis_status": "running",
-                        }
-                    ],
-                    "_api_version": 1,
-                },
-            ],
-        ) as req_mock,
-    ):
-        out = app._wait_for_analysis_on_target(
-            filename="/tmp/target.bin",
-            view_id="22",
-            timeout=11.0,
-        )
+    idle_state(resolved_idle)
+    replies = _Replies(
+        [
+            {
+                "views": [
+                    {
+                        "filename": "/tmp/target.bin",
+                        "view_id": "22",
+                        "analysis_state_code": _MockStateCode(5),
+                        "analysis_state_name": "AnalyzeState",
+                        "analysis_status": "running",
+                    }
+                ],
+                "_api_version": 1,
+            },
+            {
+                "views": [
+                    {
+                        "filename": "/tmp/target.bin",
+                        "view_id": "22",
+                        "analysis_state_code": _MockStateCode(6),
+                        "analysis_state_name": "ExtendedAnalyzeState",
+                        "analysis_status": "running",
+                    }
+                ],
+                "_api_version": 1,
+            },
+            {
+                "views": [
+                    {
+                        "filename": "/tmp/target.bin",
+                        "view_id": "22",
+                        "analysis_state_code": _MockStateCode(2),
+                        "analysis_state_name": "IdleState",
+                        "analysis_status": "running",
+                    }
+                ],
+                "_api_version": 1,
+            },
+        ]
+    )
+    monkeypatch.setattr(app, "_request", replies)
+    out = app._wait_for_analysis_on_target(
+        filename="/tmp/target.bin",
+        view_id="22",
+        timeout=11.0,
+    )
 
     assert out.get("success") is True
     assert int(out.get("analysis_state_code")) == 2
     assert out.get("analysis_state_name") == "IdleState"
-    assert req_mock.call_count == 3
+    assert len(replies.calls) == 3
 
 
-def test_wait_for_analysis_persistent_5_6_times_out_with_mock_state_types():
-    app = _new_app()
+def test_wait_for_analysis_persistent_5_6_times_out_with_mock_state_types(app, idle_state):
     resolved_idle = 2
     call_count = {"value": 0}
 
@@ -369,8 +303,8 @@ def test_wait_for_analysis_persistent_5_6_times_out_with_mock_state_types():
             "_api_version": 1,
         }
 
+    idle_state(resolved_idle)
     with (
-        patch.object(app, "_resolve_idle_analysis_state_value", return_value=resolved_idle),
         patch.object(app, "_request", side_effect=_views_payload),
     ):
         out = app._wait_for_analysis_on_target(
@@ -387,9 +321,7 @@ def test_wait_for_analysis_persistent_5_6_times_out_with_mock_state_types():
     assert "analysis wait timed out" in err.get("message", "")
 
 
-def test_resolve_idle_analysis_state_value_queries_console_execute():
-    app = _new_app()
-
+def test_resolve_idle_analysis_state_value_queries_console_execute(app):
     with (
         patch.object(
             app,
@@ -416,11 +348,23 @@ def test_resolve_idle_analysis_state_value_queries_console_execute():
     assert payload.get("view_id") == "22"
 
 
-def test_wait_for_analysis_returns_contract_error_when_state_code_missing():
-    app = _new_app()
+def test_resolve_idle_analysis_state_value_is_resolved_once_per_run(app):
+    with patch.object(
+        app,
+        "_request",
+        return_value={"success": True, "stdout": "2\n", "_api_version": 1},
+    ) as req_mock:
+        first = app._resolve_idle_analysis_state_value(filename="/tmp/a.bin", view_id="1")
+        # IdleState is a runtime-wide enum value, so other views reuse it too.
+        second = app._resolve_idle_analysis_state_value(filename="/tmp/b.bin", view_id="2")
+
+    assert first == second == 2
+    assert req_mock.call_count == 1
 
+
+def test_wait_for_analysis_returns_contract_error_when_state_code_missing(app, idle_state):
+    idle_state(2)
     with (
-        patch.object(app, "_resolve_idle_analysis_state_value", return_value=2),
         patch.object(
             app,
             "_request",
@@ -449,53 +393,39 @@ def test_wait_for_analysis_returns_contract_error_when_state_code_missing():
     assert "analysis_state_code" in err.get("message", "")
 
 
-def test_open_main_confirms_target_and_reports_view_context():
-    app = _new_app()
+def test_open_main_confirms_target_and_reports_view_context(
+    mocked_app, make_open_cmd, ui_open_contract
+):
+    app = mocked_app.app
     app.server_url = "http://testserver:9009"
-    open_cmd = binja_cli.Open("open")
-    open_cmd.parent = app
-    open_cmd.platform = None
-    open_cmd.view_type = None
-    open_cmd.no_click = False
-    open_cmd.inspect_only = False
-    open_cmd.wait_open_target = 0.5
-    open_cmd.wait_analysis = False
-    open_cmd.analysis_timeout = 120.0
+    open_cmd = make_open_cmd(app)
 
     target = "/tmp/target.bin"
-
-    with (
-        patch.object(app, "_ensure_server_for_open", return_value={"ok": True}),
-        patch.object(
-            app,
-            "_request",
-            side_effect=[
-                _ui_open_contract(target),
+    mocked_app.request.side_effect = [
+        ui_open_contract(target),
+        {
+            "views": [
                 {
-                    "views": [
-                        {
-                            "filename": target,
-                            "view_id": "44",
-                            "basename": "target.bin",
-                            "is_current": True,
-                        }
-                    ],
-                    "current_filename": target,
-                    "current_view_id": "44",
-                    "_api_version": 1,
-                },
+                    "filename": target,
+                    "view_id": "44",
+                    "basename": "target.bin",
+                    "is_current": True,
+                }
             ],
-        ) as req_mock,
-        patch.object(app, "_output") as output_mock,
-    ):
-        rc = open_cmd.main(target)
+            "current_filename": target,
+            "current_view_id": "44",
+            "_api_version": 1,
+        },
+    ]
+
+    rc = open_cmd.main(target)
 
     assert rc is None
-    args0, kwargs0 = req_mock.call_args_list[0]
+    args0, kwargs0 = mocked_app.request.call_args_list[0]
     assert args0[:2] == ("POST", "ui/open")
     assert "prefer_ui_open" not in kwargs0.get("data", {})
 
-    out = output_mock.call_args.args[0]
+    out = mocked_app.output.call_args.args[0]
     open_result = out.get("open_result", {})
     state = open_result.get("state", {})
     assert state.get("confirmed_target_filename") == target
@@ -507,56 +437,40 @@ def test_open_main_confirms_target_and_reports_view_context():
     assert "confirmed_target_via_views" in open_result.get("actions", [])
 
 
-def test_open_main_uses_confirmed_target_as_effective_when_loaded_filename_is_stale():
-    app = _new_app()
+def test_open_main_uses_confirmed_target_as_effective_when_loaded_filename_is_stale(
+    mocked_app, make_open_cmd, ui_open_contract
+):
+    app = mocked_app.app
     app.server_url = "http://testserver:9009"
-    open_cmd = binja_cli.Open("open")
-    open_cmd.parent = app
-    open_cmd.platform = None
-    open_cmd.view_type = None
-    open_cmd.no_click = False
-    open_cmd.inspect_only = False
-    open_cmd.wait_open_target = 0.5
-    open_cmd.wait_analysis = False
-    open_cmd.analysis_timeout = 120.0
+    open_cmd = make_open_cmd(app)
 
     target = "/tmp/target.bin"
     stale_loaded = "/tmp/other.bin"
-
-    with (
-        patch.object(app, "_ensure_server_for_open", return_value={"ok": True}),
-        patch.object(
-            app,
-            "_request",
-            side_effect=[
-                _ui_open_contract_with_state(
-                    target,
-                    loaded_filename=stale_loaded,
-                    warnings=[
-                        f"loaded filename differs (expected {target}, got {stale_loaded})",
-                    ],
-                ),
+    mocked_app.request.side_effect = [
+        ui_open_contract(
+            target,
+            loaded_filename=stale_loaded,
+            warnings=(f"loaded filename differs (expected {target}, got {stale_loaded})",),
+        ),
+        {
+            "views": [
                 {
-                    "views": [
-                        {
-                            "filename": target,
-                            "view_id": "77",
-                            "basename": "target.bin",
-                            "is_current": True,
-                        }
-                    ],
-                    "current_filename": target,
-                    "current_view_id": "77",
-                    "_api_version": 1,
-                },
+                    "filename": target,
+                    "view_id": "77",
+                    "basename": "target.bin",
+                    "is_current": True,
+                }
             ],
-        ),
-        patch.object(app, "_output") as output_mock,
-    ):
-        rc = open_cmd.main(target)
+            "current_filename": target,
+            "current_view_id": "77",
+            "_api_version": 1,
+        },
+    ]
+
+    rc = open_cmd.main(target)
 
     assert rc is None
-    out = output_mock.call_args.args[0]
+    out = mocked_app.output.call_args.args[0]
     open_result = out.get("open_result", {})
     state = open_result.get("state", {})
     assert state.get("confirmed_target_filename") == target
@@ -571,51 +485,39 @@ def test_open_main_uses_confirmed_target_as_effective_when_loaded_filename_is_st
     assert out.get("effective_target_view_id") == "77"
 
 
-def test_open_main_returns_structured_error_when_target_not_confirmed():
-    app = _new_app()
+def test_open_main_returns_structured_error_when_target_not_confirmed(
+    mocked_app, make_open_cmd, ui_open_contract
+):
+    app = mocked_app.app
     app.server_url = "http://testserver:9009"
-    open_cmd = binja_cli.Open("open")
-    open_cmd.parent = app
-    open_cmd.platform = None
-    open_cmd.view_type = None
-    open_cmd.no_click = False
-    open_cmd.inspect_only = False
-    open_cmd.wait_open_target = 0.1
-    open_cmd.wait_analysis = False
-    open_cmd.analysis_timeout = 120.0
+    open_cmd = make_open_cmd(app, wait_open_target=0.1)
 
     target = "/tmp/target.bin"
+    mocked_app.request.return_value = ui_open_contract(target)
 
-    with (
-        patch.object(app, "_ensure_server_for_open", return_value={"ok": True}),
-        patch.object(app, "_request", return_value=_ui_open_contract(target)),
-        patch.object(
-            app,
-            "_wait_for_open_target_in_views",
-            return_value={
-                "ok": False,
-                "observed_current_filename": "/tmp/other.bin",
-                "observed_current_view_id": "77",
-                "views": [{"filename": "/tmp/other.bin", "view_id": "77"}],
-            },
-        ),
-        patch.object(app, "_output") as output_mock,
+    with patch.object(
+        app,
+        "_wait_for_open_target_in_views",
+        return_value={
+            "ok": False,
+            "observed_current_filename": "/tmp/other.bin",
+            "observed_current_view_id": "77",
+            "views": [{"filename": "/tmp/other.bin", "view_id": "77"}],
+        },
     ):
         rc = open_cmd.main(target)
 
     assert rc == 1
-    out = output_mock.call_args.args[0]
+    out = mocked_app.output.call_args.args[0]
     assert out.get("error") == "open target confirmation failed"
     assert out.get("requested_filename") == target
     assert out.get("observed_current_filename") == "/tmp/other.bin"
     assert isinstance(out.get("views"), list)
 
 
-def test_wait_for_analysis_on_target_times_out_with_structured_error():
-    app = _new_app()
-
+def test_wait_for_analysis_on_target_times_out_with_structured_error(app, idle_state, fake_clock):
+    idle_state(2)
     with (
-        patch.object(app, "_resolve_idle_analysis_state_value", return_value=2),
         patch.object(
             app,
             "_request",
@@ -630,7 +532,7 @@ def test_wait_for_analysis_on_target_times_out_with_structured_error():
                 ],
                 "_api_version": 1,
             },
-        ),
+        ) as req_mock,
     ):
         out = app._wait_for_analysis_on_target(
             filename="/tmp/target.bin",
@@ -638,8 +540,24 @@ def test_wait_for_analysis_on_target_times_out_with_structured_error():
             timeout=1.0,
         )
 
+    # One poll, one sleep clipped to the deadline, one final poll; no real time passes.
+    assert req_mock.call_count == 2
+    assert fake_clock[0] == 1.0
     assert out.get("success") is False
     assert out.get("analysis_status") == "5"
     err = out.get("error", {})
     assert err.get("type") == "TimeoutError"
     assert "analysis wait timed out" in err.get("message", "")
+
+
+def test_wait_for_open_target_in_views_times_out_on_the_deadline(app, fake_clock):
+    with patch.object(
+        app,
+        "_request",
+        return_value={"views": [{"filename": "/tmp/other.bin"}], "_api_version": 1},
+    ) as req_mock:
+        out = app._wait_for_open_target_in_views("/tmp/target.bin", timeout=1.0, poll_interval=0.25)
+
+    assert out.get("ok") is False
+    assert req_mock.call_count == 5
+    assert fake_clock[0] == 1.0
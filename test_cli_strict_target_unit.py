@@ -2,94 +2,224 @@
 
 from __future__ import annotations
 
-import importlib.util
+import functools
 import json
-from pathlib import Path
+from contextlib import ExitStack
+from collections.abc import Mapping
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import patch
 
 import pytest
 
+import binja_cli_script as binja_cli  # registered by conftest.py
 
-SCRIPT_PATH = Path(__file__).resolve().parent / "scripts" / "binja-cli.py"
-SPEC = importlib.util.spec_from_file_location("binja_cli_script_unit", SCRIPT_PATH)
-assert SPEC is not None and SPEC.loader is not None
-binja_cli = importlib.util.module_from_spec(SPEC)
-SPEC.loader.exec_module(binja_cli)
+
+@pytest.fixture
+def app(make_app):
+    return make_app(request_timeout=120.0, connect_timeout=5.0)
+
+
+# Bodies shared by many tests; read-only because _FakeResponse decodes a fresh copy per call.
+_STATUS_LOADED = MappingProxyType({"loaded": True, "_api_version": 1})
+_EXECUTE_OK = MappingProxyType({"success": True, "_api_version": 1})
 
 
 class _FakeResponse:
-    def __init__(self, payload: dict, *, status_code: int = 200, api_version: int = 1):
-        self._payload = payload
+    def __init__(self, payload: Mapping, *, status_code: int = 200, api_version: int = 1):
         self.status_code = status_code
         self.headers = {"X-Binja-MCP-Api-Version": str(api_version)}
-        self.text = str(payload)
+        self.content = json.dumps(dict(payload)).encode("utf-8")
+
+    @property
+    def text(self) -> str:
+        # Only the CLI's HTTP error paths read the body as text.
+        return self.content.decode("utf-8")
 
     def raise_for_status(self):
         if self.status_code >= 400:
             raise binja_cli.requests.exceptions.HTTPError(response=self)
 
     def json(self):
-        return self._payload
+        return json.loads(self.content)
 
 
-def _new_app():
-    app = binja_cli.BinaryNinjaCLI("binja-mcp")
-    app.server_url = "http://localhost:9009"
-    app.request_timeout = 120.0
-    app.connect_timeout = 5.0
-    app.verbose = False
-    app.json_output = True
-    app.no_auto_errors = True
-    app.fail_on_new_errors = False
-    app.error_probe_count = 50
-    return app
+class _Routes(dict):
+    """``{"GET <url>": response}`` table standing in for the HTTP server.
+
+    Unrouted URLs answer an empty 404, like a server without that endpoint, and a routed
+    exception is raised instead of returned. ``calls`` records ``(method, url, kwargs)`` for
+    every request in order.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.calls: list[tuple[str, str, dict]] = []
+
+    def send(self, method: str, url: str, **kwargs):
+        self.calls.append((method, url, kwargs))
+        response = self.get(f"{method} {url}")
+        if isinstance(response, BaseException):
+            raise response
+        return response if response is not None else _FakeResponse({}, status_code=404)
+
+    def sent(self, route: str) -> list[dict]:
+        """Request kwargs of every call made to ``route``, in order."""
+        return [kwargs for method, url, kwargs in self.calls if f"{method} {url}" == route]
+
+
+@pytest.fixture(autouse=True)
+def routes(monkeypatch):
+    """Serve ``binja_cli.requests.get``/``post`` from one routing table per test.
+
+    Autouse, so no test in this module can reach a real server by accident.
+    """
+    table = _Routes()
+    monkeypatch.setattr(binja_cli.requests, "get", functools.partial(table.send, "GET"))
+    monkeypatch.setattr(binja_cli.requests, "post", functools.partial(table.send, "POST"))
+    return table
+
+
+@pytest.fixture
+def server_mocks(app):
+    """Mock ``app``'s open preflight and ``_request`` so a test can assert neither is reached."""
+    with ExitStack() as stack:
+        yield SimpleNamespace(
+            ensure_server_for_open=stack.enter_context(
+                patch.object(app, "_ensure_server_for_open")
+            ),
+            request=stack.enter_context(patch.object(app, "_request")),
+        )
+
+
+def _instance_response(instance_id: str, port: int) -> _FakeResponse:
+    return _FakeResponse(
+        {
+            "service": "binary_ninja_mcp",
+            "instance_id": instance_id,
+            "base_url": f"http://localhost:{port}",
+            "_api_version": 1,
+        }
+    )
+
+
+def _views_response(view_id: str, filename: str) -> _FakeResponse:
+    return _FakeResponse(
+        {"views": [{"view_id": view_id, "filename": filename}], "count": 1, "_api_version": 1}
+    )
 
 
-def test_filename_match_allows_basename_for_non_path_requests():
-    app = _new_app()
+def test_filename_match_allows_basename_for_non_path_requests(app):
     assert app._filename_matches_requested("/tmp/a/secondary.bin", "secondary.bin")
     assert not app._filename_matches_requested("/tmp/a/primary.bin", "secondary.bin")
 
 
-def test_request_uses_separate_connect_and_action_timeouts():
-    app = _new_app()
+def test_request_uses_separate_connect_and_action_timeouts(app, routes):
+    routes["GET http://localhost:9009/status"] = _FakeResponse(_STATUS_LOADED)
 
-    with patch.object(
-        binja_cli.requests,
-        "get",
-        return_value=_FakeResponse({"loaded": True, "_api_version": 1}),
-    ) as get_mock:
-        out = app._request("GET", "status")
+    out = app._request("GET", "status")
 
     assert out.get("loaded") is True
-    assert get_mock.call_args.kwargs["timeout"] == (5.0, 120.0)
+    assert routes.sent("GET http://localhost:9009/status")[-1]["timeout"] == (5.0, 120.0)
 
 
-def test_request_timeout_override_keeps_fast_connect_timeout():
-    app = _new_app()
+def test_request_timeout_override_keeps_fast_connect_timeout(app, routes):
+    routes["GET http://localhost:9009/status"] = _FakeResponse(_STATUS_LOADED)
 
-    with patch.object(
-        binja_cli.requests,
-        "get",
-        return_value=_FakeResponse({"loaded": True, "_api_version": 1}),
-    ) as get_mock:
-        out = app._request("GET", "status", timeout=30.0)
+    out = app._request("GET", "status", timeout=30.0)
 
     assert out.get("loaded") is True
-    assert get_mock.call_args.kwargs["timeout"] == (5.0, 30.0)
+    assert routes.sent("GET http://localhost:9009/status")[-1]["timeout"] == (5.0, 30.0)
 
 
-def test_connect_timeout_reports_explicit_connection_timeout(capsys):
-    app = _new_app()
+@pytest.mark.parametrize(("no_compress", "accept_encoding"), [(True, "identity"), (False, None)])
+def test_no_compress_asks_the_server_for_an_identity_body(
+    app, routes, no_compress, accept_encoding
+):
+    app.no_compress = no_compress
+    routes["GET http://localhost:9009/status"] = _FakeResponse(_STATUS_LOADED)
 
-    with (
-        patch.object(
-            binja_cli.requests,
-            "get",
-            side_effect=binja_cli.requests.exceptions.ConnectTimeout(),
-        ),
-        pytest.raises(SystemExit) as exc_info,
-    ):
+    app._request("GET", "status")
+
+    sent_headers = routes.sent("GET http://localhost:9009/status")[-1]["headers"]
+    assert sent_headers.get("Accept-Encoding") == accept_encoding
+
+
+def test_request_stream_text_returns_unread_chunks_for_text_bodies(app, routes):
+    app.json_output = False
+    response = _FakeResponse({})
+    response.headers["Content-Type"] = "text/plain; charset=utf-8"
+    response.iter_content = lambda chunk_size, decode_unicode: iter(["int main", "() {}"])
+    routes["GET http://localhost:9009/decompile"] = response
+
+    out = app._request("GET", "decompile", {"name": "main"}, stream_text=True)
+
+    sent = routes.sent("GET http://localhost:9009/decompile")[-1]
+    assert sent["stream"] is True
+    assert sent["headers"]["Accept"].startswith("text/plain")
+    assert "".join(out["text_chunks"]) == "int main() {}"
+
+
+def test_request_stream_text_falls_back_to_json_envelope(app, routes):
+    app.json_output = False
+    routes["GET http://localhost:9009/decompile"] = _FakeResponse(
+        {"decompiled": "int main() {}", "_api_version": 1}
+    )
+
+    out = app._request("GET", "decompile", {"name": "main"}, stream_text=True)
+
+    assert "text_chunks" not in out
+    assert out["decompiled"] == "int main() {}"
+
+
+def _text_response(text: str) -> _FakeResponse:
+    response = _FakeResponse({})
+    response.headers["Content-Type"] = "text/plain; charset=utf-8"
+    response.iter_content = lambda chunk_size, decode_unicode: iter([text])
+    return response
+
+
+def _resolved_target_response(filename: str, view_id: str) -> _FakeResponse:
+    return _FakeResponse(
+        {"resolved": True, "target": {"view_id": view_id, "filename": filename}, "_api_version": 1}
+    )
+
+
+def test_streamed_decompile_still_refuses_a_mismatched_strict_target(app, routes):
+    # A text body has no envelope to check, so the strict precheck is the only guard.
+    app.json_output = False
+    app.target_filename = "/tmp/target.bin"
+    app.strict_target = True
+    routes["GET http://localhost:9009/target/resolve"] = _resolved_target_response(
+        "/tmp/other.bin", "view-9"
+    )
+    routes["GET http://localhost:9009/decompile"] = _text_response("int main() {}")
+
+    with pytest.raises(SystemExit):
+        app._request("GET", "decompile", {"name": "main"}, stream_text=True)
+
+    assert routes.sent("GET http://localhost:9009/decompile") == []
+
+
+def test_streamed_decompile_reports_the_precheck_target(app, routes):
+    app.json_output = False
+    app.target_filename = "/tmp/target.bin"
+    app.strict_target = True
+    routes["GET http://localhost:9009/target/resolve"] = _resolved_target_response(
+        "/tmp/target.bin", "view-1"
+    )
+    routes["GET http://localhost:9009/decompile"] = _text_response("int main() {}")
+
+    out = app._request("GET", "decompile", {"name": "main"}, stream_text=True)
+
+    assert "".join(out["text_chunks"]) == "int main() {}"
+    assert out["selected_view_filename"] == "/tmp/target.bin"
+    assert out["selected_view_id"] == "view-1"
+
+
+def test_connect_timeout_reports_explicit_connection_timeout(app, routes, capsys):
+    routes["GET http://localhost:9009/status"] = binja_cli.requests.exceptions.ConnectTimeout()
+
+    with pytest.raises(SystemExit) as exc_info:
         app._request("GET", "status")
 
     assert exc_info.value.code == 1
@@ -97,299 +227,195 @@ def test_connect_timeout_reports_explicit_connection_timeout(capsys):
     assert "Connection to server at http://localhost:9009 timed out after 5s" in err
 
 
-def test_strict_target_blocks_mismatched_view_before_command():
-    app = _new_app()
+def test_strict_target_blocks_mismatched_view_before_command(app, routes):
     app.target_filename = "/tmp/target.bin"
     app.strict_target = True
+    routes["GET http://localhost:9009/target/resolve"] = _FakeResponse(
+        {
+            "error_code": "TARGET_NOT_FOUND",
+            "error": "Requested filename is not loaded",
+            "filename": "/tmp/target.bin",
+            "_api_version": 1,
+        },
+        status_code=404,
+    )
 
-    with (
-        patch.object(
-            binja_cli.requests,
-            "get",
-            return_value=_FakeResponse(
-                {
-                    "error_code": "TARGET_NOT_FOUND",
-                    "error": "Requested filename is not loaded",
-                    "filename": "/tmp/target.bin",
-                    "_api_version": 1,
-                },
-                status_code=404,
-            ),
-        ),
-        patch.object(binja_cli.requests, "post") as post_mock,
-        pytest.raises(SystemExit),
-    ):
+    with pytest.raises(SystemExit):
         app._request("POST", "console/execute", data={"command": "1 + 1"})
 
-    post_mock.assert_not_called()
+    assert all(method == "GET" for method, _url, _kwargs in routes.calls)
 
 
-def test_target_defaults_to_strict_and_blocks_mismatch():
-    app = _new_app()
+def test_target_defaults_to_strict_and_blocks_mismatch(app, routes):
     app.target_filename = "/tmp/target.bin"
+    routes["GET http://localhost:9009/target/resolve"] = _FakeResponse(
+        {
+            "error_code": "TARGET_NOT_FOUND",
+            "error": "Requested filename is not loaded",
+            "filename": "/tmp/target.bin",
+            "_api_version": 1,
+        },
+        status_code=404,
+    )
 
-    with (
-        patch.object(
-            binja_cli.requests,
-            "get",
-            return_value=_FakeResponse(
-                {
-                    "error_code": "TARGET_NOT_FOUND",
-                    "error": "Requested filename is not loaded",
-                    "filename": "/tmp/target.bin",
-                    "_api_version": 1,
-                },
-                status_code=404,
-            ),
-        ),
-        patch.object(binja_cli.requests, "post") as post_mock,
-        pytest.raises(SystemExit),
-    ):
+    with pytest.raises(SystemExit):
         app._request("POST", "console/execute", data={"command": "1 + 1"})
 
-    post_mock.assert_not_called()
+    assert all(method == "GET" for method, _url, _kwargs in routes.calls)
 
 
-def test_filename_strict_precheck_uses_target_resolve_endpoint():
-    app = _new_app()
+def test_filename_strict_precheck_uses_target_resolve_endpoint(app, routes):
     app.target_filename = "/tmp/target.bin"
     app.strict_target = True
+    routes["GET http://localhost:9009/target/resolve"] = _FakeResponse(
+        {
+            "resolved": True,
+            "target": {
+                "view_id": "view-1234",
+                "filename": "/tmp/target.bin",
+                "target_hint": "--view-id view-1234",
+            },
+            "_api_version": 1,
+        }
+    )
+    routes["POST http://localhost:9009/console/execute"] = _FakeResponse(_EXECUTE_OK)
 
-    with patch.object(
-        binja_cli.requests,
-        "get",
-        return_value=_FakeResponse(
-            {
-                "resolved": True,
-                "target": {
-                    "view_id": "view-1234",
-                    "filename": "/tmp/target.bin",
-                    "target_hint": "--view-id view-1234",
-                },
-                "_api_version": 1,
-            }
-        ),
-    ) as get_mock:
-        with patch.object(
-            binja_cli.requests,
-            "post",
-            return_value=_FakeResponse({"success": True, "_api_version": 1}),
-        ):
-            out = app._request("POST", "console/execute", data={"command": "1 + 1"})
-
-    assert get_mock.call_args.args[0] == "http://localhost:9009/target/resolve"
+    out = app._request("POST", "console/execute", data={"command": "1 + 1"})
+
+    get_urls = [url for method, url, _kwargs in routes.calls if method == "GET"]
+    assert get_urls[-1] == "http://localhost:9009/target/resolve"
     assert out.get("selected_view_filename") == "/tmp/target.bin"
 
 
-def test_filename_strict_precheck_selects_matching_view_from_multiple_open_views():
-    app = _new_app()
+def test_filename_strict_precheck_selects_matching_view_from_multiple_open_views(app, routes):
     app.target_filename = "/tmp/target.bin"
     app.strict_target = True
+    routes["GET http://localhost:9009/target/resolve"] = _FakeResponse(
+        {
+            "resolved": True,
+            "target": {
+                "view_id": "view-1234",
+                "filename": "/tmp/target.bin",
+                "target_hint": "--view-id view-1234",
+            },
+            "open_views": [
+                {"view_id": "view-2222", "filename": "/tmp/other.bin", "is_current": True},
+                {"view_id": "view-1234", "filename": "/tmp/target.bin", "is_current": False},
+            ],
+            "_api_version": 1,
+        }
+    )
+    routes["POST http://localhost:9009/console/execute"] = _FakeResponse(_EXECUTE_OK)
 
-    with patch.object(
-        binja_cli.requests,
-        "get",
-        return_value=_FakeResponse(
-            {
-                "resolved": True,
-                "target": {
-                    "view_id": "view-1234",
-                    "filename": "/tmp/target.bin",
-                    "target_hint": "--view-id view-1234",
-                },
-                "open_views": [
-                    {"view_id": "view-2222", "filename": "/tmp/other.bin", "is_current": True},
-                    {"view_id": "view-1234", "filename": "/tmp/target.bin", "is_current": False},
-                ],
-                "_api_version": 1,
-            }
-        ),
-    ):
-        with patch.object(
-            binja_cli.requests,
-            "post",
-            return_value=_FakeResponse({"success": True, "_api_version": 1}),
-        ):
-            out = app._request("POST", "console/execute", data={"command": "1 + 1"})
+    out = app._request("POST", "console/execute", data={"command": "1 + 1"})
 
     assert out.get("selected_view_filename") == "/tmp/target.bin"
     assert out.get("selected_view_id") == "view-1234"
 
 
-def test_strict_target_passes_and_sets_selected_view_context_fields():
-    app = _new_app()
+def test_strict_target_passes_and_sets_selected_view_context_fields(app, routes):
     app.target_filename = "/tmp/target.bin"
     app.strict_target = True
+    routes["GET http://localhost:9009/target/resolve"] = _FakeResponse(
+        {
+            "resolved": True,
+            "target": {"view_id": "view-1234", "filename": "/tmp/target.bin"},
+            "_api_version": 1,
+        }
+    )
+    routes["POST http://localhost:9009/console/execute"] = _FakeResponse(_EXECUTE_OK)
 
-    with patch.object(
-        binja_cli.requests,
-        "get",
-        return_value=_FakeResponse(
-            {
-                "resolved": True,
-                "target": {"view_id": "view-1234", "filename": "/tmp/target.bin"},
-                "_api_version": 1,
-            }
-        ),
-    ):
-        with patch.object(
-            binja_cli.requests,
-            "post",
-            return_value=_FakeResponse({"success": True, "_api_version": 1}),
-        ):
-            out = app._request("POST", "console/execute", data={"command": "1 + 1"})
+    out = app._request("POST", "console/execute", data={"command": "1 + 1"})
 
     assert out.get("success") is True
     assert out.get("selected_view_filename") == "/tmp/target.bin"
     assert "selected_view_id" in out
 
 
-def test_strict_target_open_uses_response_state_without_precheck():
-    app = _new_app()
+def test_strict_target_open_uses_response_state_without_precheck(app, routes):
     app.server_url = "http://testserver:9009"
     app.target_filename = "/tmp/target.bin"
     app.strict_target = True
+    routes["POST http://testserver:9009/ui/open"] = _FakeResponse(
+        {
+            "ok": True,
+            "state": {"loaded_filename": "/tmp/target.bin"},
+            "_api_version": 2,
+        },
+        api_version=2,
+    )
 
-    with patch.object(binja_cli.requests, "get") as get_mock:
-        with patch.object(
-            binja_cli.requests,
-            "post",
-            return_value=_FakeResponse(
-                {
-                    "ok": True,
-                    "state": {"loaded_filename": "/tmp/target.bin"},
-                    "_api_version": 2,
-                },
-                api_version=2,
-            ),
-        ):
-            out = app._request("POST", "ui/open", data={"filepath": "/tmp/target.bin"})
+    out = app._request("POST", "ui/open", data={"filepath": "/tmp/target.bin"})
 
-    get_mock.assert_not_called()
+    assert [method for method, _url, _kwargs in routes.calls] == ["POST"]
     assert out.get("selected_view_filename") == "/tmp/target.bin"
 
 
-def test_strict_target_open_falls_back_to_status_when_response_has_no_filename():
-    app = _new_app()
+def test_strict_target_open_falls_back_to_status_when_response_has_no_filename(app, routes):
     app.server_url = "http://testserver:9009"
     app.target_filename = "/tmp/target.bin"
     app.strict_target = True
+    routes["POST http://testserver:9009/ui/open"] = _FakeResponse(
+        {
+            "ok": True,
+            "state": {"loaded_filename": None},
+            "_api_version": 2,
+        },
+        api_version=2,
+    )
+    routes["GET http://testserver:9009/target/resolve"] = _FakeResponse(
+        {
+            "resolved": True,
+            "target": {"view_id": "view-1234", "filename": "/tmp/target.bin"},
+            "_api_version": 1,
+        }
+    )
 
-    with patch.object(
-        binja_cli.requests,
-        "post",
-        return_value=_FakeResponse(
-            {
-                "ok": True,
-                "state": {"loaded_filename": None},
-                "_api_version": 2,
-            },
-            api_version=2,
-        ),
-    ):
-        with patch.object(
-            binja_cli.requests,
-            "get",
-            return_value=_FakeResponse(
-                {
-                    "resolved": True,
-                    "target": {"view_id": "view-1234", "filename": "/tmp/target.bin"},
-                    "_api_version": 1,
-                },
-                api_version=1,
-            ),
-        ) as get_mock:
-            out = app._request("POST", "ui/open", data={"filepath": "/tmp/target.bin"})
+    out = app._request("POST", "ui/open", data={"filepath": "/tmp/target.bin"})
 
-    assert get_mock.call_count == 1
+    assert [method for method, _url, _kwargs in routes.calls].count("GET") == 1
     assert out.get("selected_view_filename") == "/tmp/target.bin"
 
 
-def test_console_execute_injects_view_id_target():
-    app = _new_app()
+def test_console_execute_injects_view_id_target(app, routes):
     app.server_url = "http://testserver:9009"
     app.target_view_id = "0x1234"
     app.allow_target_fallback = True
+    routes["POST http://testserver:9009/console/execute"] = _FakeResponse(
+        {"success": True, "selected_view_id": "0x1234", "_api_version": 1}
+    )
 
-    with patch.object(
-        binja_cli.requests,
-        "post",
-        return_value=_FakeResponse(
-            {"success": True, "selected_view_id": "0x1234", "_api_version": 1}
-        ),
-    ) as post_mock:
-        out = app._request("POST", "console/execute", data={"command": "id(bv)"})
+    out = app._request("POST", "console/execute", data={"command": "id(bv)"})
 
-    sent_json = post_mock.call_args.kwargs.get("json", {})
+    sent_json = routes.sent("POST http://testserver:9009/console/execute")[-1].get("json", {})
     assert sent_json.get("view_id") == "0x1234"
     assert out.get("selected_view_id") == "0x1234"
 
 
-def test_global_view_id_routes_to_discovered_instance_and_sends_local_id():
-    app = _new_app()
+def test_global_view_id_routes_to_discovered_instance_and_sends_local_id(app, routes):
     app.target_view_id = "inst-b:view-22"
     app.allow_target_fallback = True
+    routes["GET http://localhost:9001/meta/instance"] = _instance_response("inst-b", 9001)
+    routes["POST http://localhost:9001/console/execute"] = _FakeResponse(
+        {"success": True, "selected_view_id": "view-22", "_api_version": 1}
+    )
 
-    def fake_get(url, **kwargs):
-        if url.endswith("/meta/instance"):
-            if ":9001/" in url:
-                return _FakeResponse(
-                    {
-                        "service": "binary_ninja_mcp",
-                        "instance_id": "inst-b",
-                        "base_url": "http://localhost:9001",
-                        "_api_version": 1,
-                    }
-                )
-            return _FakeResponse({}, status_code=404)
-        return _FakeResponse({}, status_code=404)
-
-    with (
-        patch.object(binja_cli.requests, "get", side_effect=fake_get),
-        patch.object(
-            binja_cli.requests,
-            "post",
-            return_value=_FakeResponse(
-                {"success": True, "selected_view_id": "view-22", "_api_version": 1}
-            ),
-        ) as post_mock,
-    ):
-        out = app._request("POST", "console/execute", data={"command": "id(bv)"})
+    out = app._request("POST", "console/execute", data={"command": "id(bv)"})
 
     assert app.server_url == "http://localhost:9001"
-    sent_json = post_mock.call_args.kwargs.get("json", {})
-    assert sent_json.get("view_id") == "view-22"
+    method, _url, kwargs = routes.calls[-1]
+    assert method == "POST"
+    assert kwargs.get("json", {}).get("view_id") == "view-22"
     assert out.get("selected_view_id") == "view-22"
 
 
-def test_local_view_id_fails_in_discovery_mode_and_lists_global_targets(capsys):
-    app = _new_app()
+def test_local_view_id_fails_in_discovery_mode_and_lists_global_targets(app, capsys, routes):
     app.target_view_id = "view-33"
     app.allow_target_fallback = True
+    routes["GET http://localhost:9002/meta/instance"] = _instance_response("inst-c", 9002)
+    routes["GET http://localhost:9002/views"] = _views_response("view-33", "/tmp/c.bin")
 
-    def fake_get(url, **kwargs):
-        if url.endswith("/meta/instance"):
-            if ":9002/" in url:
-                return _FakeResponse(
-                    {
-                        "service": "binary_ninja_mcp",
-                        "instance_id": "inst-c",
-                        "base_url": "http://localhost:9002",
-                        "_api_version": 1,
-                    }
-                )
-            return _FakeResponse({}, status_code=404)
-        if url.endswith("/views"):
-            return _FakeResponse(
-                {
-                    "views": [{"view_id": "view-33", "filename": "/tmp/c.bin"}],
-                    "count": 1,
-                    "_api_version": 1,
-                }
-            )
-        return _FakeResponse({}, status_code=404)
-
-    with patch.object(binja_cli.requests, "get", side_effect=fake_get), pytest.raises(SystemExit):
+    with pytest.raises(SystemExit):
         app._request("POST", "console/execute", data={"command": "id(bv)"})
 
     captured = capsys.readouterr()
@@ -397,102 +423,34 @@ def test_local_view_id_fails_in_discovery_mode_and_lists_global_targets(capsys):
     assert "inst-c:view-33  /tmp/c.bin" in captured.err
 
 
-def test_discovered_views_add_global_target_hints():
-    app = _new_app()
-
-    def fake_get(url, **kwargs):
-        if url.endswith("/meta/instance"):
-            if ":9000/" in url:
-                return _FakeResponse(
-                    {
-                        "service": "binary_ninja_mcp",
-                        "instance_id": "inst-a",
-                        "base_url": "http://localhost:9000",
-                        "_api_version": 1,
-                    }
-                )
-            return _FakeResponse({}, status_code=404)
-        if url.endswith("/views"):
-            return _FakeResponse(
-                {
-                    "views": [{"view_id": "view-11", "filename": "/tmp/a.bin"}],
-                    "count": 1,
-                    "_api_version": 1,
-                }
-            )
-        return _FakeResponse({}, status_code=404)
-
-    with patch.object(binja_cli.requests, "get", side_effect=fake_get):
-        views = app._get_discovered_views()
+def test_discovered_views_add_global_target_hints(app, routes):
+    routes["GET http://localhost:9000/meta/instance"] = _instance_response("inst-a", 9000)
+    routes["GET http://localhost:9000/views"] = _views_response("view-11", "/tmp/a.bin")
+
+    views = app._get_discovered_views()
 
     assert len(views) == 1
     assert views[0]["global_view_id"] == "inst-a:view-11"
     assert views[0]["target_hint"] == "--view-id inst-a:view-11"
 
 
-def test_discovery_includes_legacy_9009_alongside_new_instances():
-    app = _new_app()
-
-    def fake_get(url, **kwargs):
-        if url.endswith("/meta/instance"):
-            if ":9000/" in url:
-                return _FakeResponse(
-                    {
-                        "service": "binary_ninja_mcp",
-                        "instance_id": "inst-a",
-                        "base_url": "http://localhost:9000",
-                        "_api_version": 1,
-                    }
-                )
-            return _FakeResponse({}, status_code=404)
-        if url.endswith("/status") and url.startswith("http://localhost:9009/"):
-            return _FakeResponse({"loaded": True, "_api_version": 1})
-        return _FakeResponse({}, status_code=404)
-
-    with patch.object(binja_cli.requests, "get", side_effect=fake_get):
-        servers = app._discover_servers()
+def test_discovery_includes_legacy_9009_alongside_new_instances(app, routes):
+    routes["GET http://localhost:9000/meta/instance"] = _instance_response("inst-a", 9000)
+    routes["GET http://localhost:9009/status"] = _FakeResponse(_STATUS_LOADED)
+
+    servers = app._discover_servers()
 
     assert [server["instance_id"] for server in servers] == ["inst-a", "legacy-9009"]
     assert servers[1]["legacy"] is True
 
 
-def test_discovered_views_include_legacy_global_target_hint():
-    app = _new_app()
-
-    def fake_get(url, **kwargs):
-        if url.endswith("/meta/instance"):
-            if ":9000/" in url:
-                return _FakeResponse(
-                    {
-                        "service": "binary_ninja_mcp",
-                        "instance_id": "inst-a",
-                        "base_url": "http://localhost:9000",
-                        "_api_version": 1,
-                    }
-                )
-            return _FakeResponse({}, status_code=404)
-        if url.endswith("/status") and url.startswith("http://localhost:9009/"):
-            return _FakeResponse({"loaded": True, "_api_version": 1})
-        if url == "http://localhost:9000/views":
-            return _FakeResponse(
-                {
-                    "views": [{"view_id": "view-new", "filename": "/tmp/new.bin"}],
-                    "count": 1,
-                    "_api_version": 1,
-                }
-            )
-        if url == "http://localhost:9009/views":
-            return _FakeResponse(
-                {
-                    "views": [{"view_id": "view-old", "filename": "/tmp/old.bin"}],
-                    "count": 1,
-                    "_api_version": 1,
-                }
-            )
-        return _FakeResponse({}, status_code=404)
-
-    with patch.object(binja_cli.requests, "get", side_effect=fake_get):
-        views = app._get_discovered_views()
+def test_discovered_views_include_legacy_global_target_hint(app, routes):
+    routes["GET http://localhost:9000/meta/instance"] = _instance_response("inst-a", 9000)
+    routes["GET http://localhost:9009/status"] = _FakeResponse(_STATUS_LOADED)
+    routes["GET http://localhost:9000/views"] = _views_response("view-new", "/tmp/new.bin")
+    routes["GET http://localhost:9009/views"] = _views_response("view-old", "/tmp/old.bin")
+
+    views = app._get_discovered_views()
 
     assert [view["global_view_id"] for view in views] == [
         "inst-a:view-new",
@@ -500,8 +458,7 @@ def test_discovered_views_include_legacy_global_target_hint():
     ]
 
 
-def test_binary_view_scoped_command_requires_view_id_in_discovery_mode(capsys):
-    app = _new_app()
+def test_binary_view_scoped_command_requires_view_id_in_discovery_mode(app, routes, capsys):
     app._cached_discovered_servers = [
         {
             "instance_id": "inst-a",
@@ -523,21 +480,17 @@ def test_binary_view_scoped_command_requires_view_id_in_discovery_mode(capsys):
         },
     ]
 
-    with (
-        patch.object(binja_cli.requests, "post") as post_mock,
-        pytest.raises(SystemExit),
-    ):
+    with pytest.raises(SystemExit):
         app._request("POST", "console/execute", data={"command": "id(bv)"})
 
-    post_mock.assert_not_called()
+    assert not any(method == "POST" for method, _url, _kwargs in routes.calls)
     captured = capsys.readouterr()
     assert "missing required --view-id" in captured.err
     assert "inst-a:view-1  /tmp/a.bin" in captured.err
     assert "legacy-9009:view-2  /tmp/b.bin" in captured.err
 
 
-def test_non_view_scoped_status_does_not_require_view_id():
-    app = _new_app()
+def test_non_view_scoped_status_does_not_require_view_id(app, routes):
     app._cached_discovered_views = [
         {
             "global_view_id": "inst-a:view-1",
@@ -547,19 +500,14 @@ def test_non_view_scoped_status_does_not_require_view_id():
         }
     ]
 
-    with patch.object(
-        binja_cli.requests,
-        "get",
-        return_value=_FakeResponse({"loaded": True, "_api_version": 1}),
-    ) as get_mock:
-        out = app._request("GET", "status")
+    routes["GET http://localhost:9009/status"] = _FakeResponse(_STATUS_LOADED)
+
+    out = app._request("GET", "status")
 
     assert out.get("loaded") is True
-    assert get_mock.called
 
 
-def test_open_requires_view_id_in_discovery_mode():
-    app = _new_app()
+def test_open_requires_view_id_in_discovery_mode(app):
     app._cached_discovered_views = [
         {
             "global_view_id": "inst-a:view-1",
@@ -573,8 +521,7 @@ def test_open_requires_view_id_in_discovery_mode():
         app._request("POST", "ui/open", data={"filepath": "/tmp/new.bin"})
 
 
-def test_ensure_server_for_open_selects_instance_from_global_view_id():
-    app = _new_app()
+def test_ensure_server_for_open_selects_instance_from_global_view_id(app):
     app.target_view_id = "inst-a:view-1"
     app._cached_discovered_servers = [
         {
@@ -591,8 +538,9 @@ def test_ensure_server_for_open_selects_instance_from_global_view_id():
     probe_mock.assert_called_with("http://localhost:9000", timeout=1.0)
 
 
-def test_open_without_filepath_prints_help_without_contacting_server(capsys):
-    app = _new_app()
+def test_open_without_filepath_prints_help_without_contacting_server(
+    app, make_open_cmd, server_mocks, capsys
+):
     app.json_output = False
     app._cached_discovered_views = [
         {
@@ -602,19 +550,13 @@ def test_open_without_filepath_prints_help_without_contacting_server(capsys):
             "server_url": "http://localhost:9000",
         }
     ]
-    command = object.__new__(binja_cli.Open)
-    command.parent = app
-    command.inspect_only = False
+    command = make_open_cmd(app)
 
-    with (
-        patch.object(app, "_ensure_server_for_open") as ensure_mock,
-        patch.object(app, "_request") as request_mock,
-    ):
-        rc = command.main()
+    rc = command.main()
 
     assert rc == 1
-    ensure_mock.assert_not_called()
-    request_mock.assert_not_called()
+    server_mocks.ensure_server_for_open.assert_not_called()
+    server_mocks.request.assert_not_called()
     captured = capsys.readouterr()
     assert "missing file path for open" in captured.err
     assert "binja-mcp open --new-server <file>" in captured.err
@@ -622,31 +564,38 @@ def test_open_without_filepath_prints_help_without_contacting_server(capsys):
     assert "inst-a:view-1  /tmp/a.bin" in captured.err
 
 
-def test_open_without_filepath_json_outputs_help_without_contacting_server(capsys):
-    app = _new_app()
+def test_open_without_filepath_json_outputs_help_without_contacting_server(
+    app, make_open_cmd, server_mocks, capsys
+):
     app.json_output = True
     app._cached_discovered_views = []
-    command = object.__new__(binja_cli.Open)
-    command.parent = app
-    command.inspect_only = False
+    command = make_open_cmd(app)
 
-    with (
-        patch.object(app, "_ensure_server_for_open") as ensure_mock,
-        patch.object(app, "_request") as request_mock,
-    ):
-        rc = command.main()
+    rc = command.main()
 
     assert rc == 1
-    ensure_mock.assert_not_called()
-    request_mock.assert_not_called()
+    server_mocks.ensure_server_for_open.assert_not_called()
+    server_mocks.request.assert_not_called()
     payload = json.loads(capsys.readouterr().out)
     assert payload["error"] == "missing file path for open"
     assert "usage" in payload
     assert "binja-mcp open --new-server <file>" in payload["usage"]
 
 
-def test_open_with_file_without_target_prints_instance_selection_help(capsys):
-    app = _new_app()
+def test_json_output_is_stdlib_json_with_two_space_indent(app, capsys):
+    # Pinned byte-for-byte so --json output does not depend on which packages are installed.
+    app.json_output = True
+
+    app._output({"name": "caf\u00e9", "ratio": float("nan"), "big": 2**70})
+
+    assert capsys.readouterr().out == (
+        '{\n  "name": "caf\\u00e9",\n  "ratio": NaN,\n  "big": 1180591620717411303424\n}\n'
+    )
+
+
+def test_open_with_file_without_target_prints_instance_selection_help(
+    app, make_open_cmd, server_mocks, capsys
+):
     app.json_output = False
     app._cached_discovered_views = [
         {
@@ -656,19 +605,13 @@ def test_open_with_file_without_target_prints_instance_selection_help(capsys):
             "server_url": "http://localhost:9000",
         }
     ]
-    command = object.__new__(binja_cli.Open)
-    command.parent = app
-    command.inspect_only = False
+    command = make_open_cmd(app)
 
-    with (
-        patch.object(app, "_ensure_server_for_open") as ensure_mock,
-        patch.object(app, "_request") as request_mock,
-    ):
-        rc = command.main("/tmp/new.bin")
+    rc = command.main("/tmp/new.bin")
 
     assert rc == 1
-    ensure_mock.assert_not_called()
-    request_mock.assert_not_called()
+    server_mocks.ensure_server_for_open.assert_not_called()
+    server_mocks.request.assert_not_called()
     captured = capsys.readouterr()
     assert "target Binary Ninja instance required for open" in captured.err
     assert "binja-mcp open --new-server /tmp/new.bin" in captured.err
@@ -676,30 +619,24 @@ def test_open_with_file_without_target_prints_instance_selection_help(capsys):
     assert "binja-mcp --view-id inst-a:view-1 open /tmp/new.bin" in captured.err
 
 
-def test_open_with_file_without_target_json_outputs_instance_selection_help(capsys):
-    app = _new_app()
+def test_open_with_file_without_target_json_outputs_instance_selection_help(
+    app, make_open_cmd, server_mocks, capsys
+):
     app.json_output = True
     app._cached_discovered_views = []
-    command = object.__new__(binja_cli.Open)
-    command.parent = app
-    command.inspect_only = False
+    command = make_open_cmd(app)
 
-    with (
-        patch.object(app, "_ensure_server_for_open") as ensure_mock,
-        patch.object(app, "_request") as request_mock,
-    ):
-        rc = command.main("/tmp/new.bin")
+    rc = command.main("/tmp/new.bin")
 
     assert rc == 1
-    ensure_mock.assert_not_called()
-    request_mock.assert_not_called()
+    server_mocks.ensure_server_for_open.assert_not_called()
+    server_mocks.request.assert_not_called()
     payload = json.loads(capsys.readouterr().out)
     assert payload["error"] == "target Binary Ninja instance required for open"
     assert "binja-mcp open --new-server /tmp/new.bin" in payload["examples"]
 
 
-def test_views_command_falls_back_to_legacy_default_server_when_discovery_empty(capsys):
-    app = _new_app()
+def test_views_command_falls_back_to_legacy_default_server_when_discovery_empty(app, capsys):
     command = object.__new__(binja_cli.Views)
     command.parent = app
 
@@ -723,20 +660,15 @@ def test_views_command_falls_back_to_legacy_default_server_when_discovery_empty(
     assert "view-old" in captured.out
 
 
-def test_allow_target_fallback_disables_default_strict_behavior():
-    app = _new_app()
+def test_allow_target_fallback_disables_default_strict_behavior(app, routes):
     app.server_url = "http://testserver:9009"
     app.target_filename = "/tmp/target.bin"
     app.allow_target_fallback = True
+    routes["POST http://testserver:9009/console/execute"] = _FakeResponse(_EXECUTE_OK)
 
-    with patch.object(
-        binja_cli.requests,
-        "post",
-        return_value=_FakeResponse({"success": True, "_api_version": 1}),
-    ) as post_mock:
-        out = app._request("POST", "console/execute", data={"command": "1 + 1"})
+    out = app._request("POST", "console/execute", data={"command": "1 + 1"})
 
-    post_mock.assert_called_once()
+    assert len(routes.sent("POST http://testserver:9009/console/execute")) == 1
     assert out.get("success") is True
 
 
@@ -769,78 +701,58 @@ def test_print_target_views_hint_lists_open_views(capsys):
     assert "hint: --view-id view-202" in captured.err
 
 
-def test_views_endpoint_includes_filename_and_view_id_targets():
-    app = _new_app()
+def test_views_endpoint_includes_filename_and_view_id_targets(app, routes):
     app.target_filename = "primary.bin"
     app.target_view_id = "202"
+    routes["GET http://localhost:9009/views"] = _FakeResponse(
+        {"views": [], "count": 0, "_api_version": 1}
+    )
 
-    with patch.object(
-        binja_cli.requests,
-        "get",
-        return_value=_FakeResponse({"views": [], "count": 0, "_api_version": 1}),
-    ) as get_mock:
-        out = app._request("GET", "views")
+    out = app._request("GET", "views")
 
-    sent_params = get_mock.call_args.kwargs.get("params", {})
+    sent_params = routes.sent("GET http://localhost:9009/views")[-1].get("params", {})
     assert sent_params.get("filename") == "primary.bin"
     assert sent_params.get("view_id") == "202"
     assert out.get("count") == 0
 
 
-def test_strict_target_blocks_mismatched_view_id_before_command():
-    app = _new_app()
+def test_strict_target_blocks_mismatched_view_id_before_command(app, routes):
     app.target_view_id = "0x1234"
     app.strict_target = True
+    routes["GET http://localhost:9009/target/resolve"] = _FakeResponse(
+        {
+            "error_code": "TARGET_NOT_FOUND",
+            "error": "Requested BinaryView not found",
+            "view_id": "0x1234",
+            "_api_version": 1,
+        },
+        status_code=404,
+    )
 
-    with (
-        patch.object(
-            binja_cli.requests,
-            "get",
-            return_value=_FakeResponse(
-                {
-                    "error_code": "TARGET_NOT_FOUND",
-                    "error": "Requested BinaryView not found",
-                    "view_id": "0x1234",
-                    "_api_version": 1,
-                },
-                status_code=404,
-            ),
-        ),
-        patch.object(binja_cli.requests, "post") as post_mock,
-        pytest.raises(SystemExit),
-    ):
+    with pytest.raises(SystemExit):
         app._request("POST", "console/execute", data={"command": "1 + 1"})
 
-    post_mock.assert_not_called()
+    assert all(method == "GET" for method, _url, _kwargs in routes.calls)
 
 
-def test_strict_target_passes_for_view_id_and_sets_context_fields():
-    app = _new_app()
+def test_strict_target_passes_for_view_id_and_sets_context_fields(app, routes):
     app.server_url = "http://testserver:9009"
     app.target_view_id = "0x1234"
     app.strict_target = True
+    routes["GET http://testserver:9009/target/resolve"] = _FakeResponse(
+        {
+            "resolved": True,
+            "target": {
+                "view_id": "0x1234",
+                "filename": "/tmp/target.bin",
+                "target_hint": "--view-id 0x1234",
+            },
+            "_api_version": 1,
+        }
+    )
+    routes["POST http://testserver:9009/console/execute"] = _FakeResponse(_EXECUTE_OK)
 
-    with patch.object(
-        binja_cli.requests,
-        "get",
-        return_value=_FakeResponse(
-            {
-                "resolved": True,
-                "target": {
-                    "view_id": "0x1234",
-                    "filename": "/tmp/target.bin",
-                    "target_hint": "--view-id 0x1234",
-                },
-                "_api_version": 1,
-            }
-        ),
-    ):
-        with patch.object(
-            binja_cli.requests,
-            "post",
-            return_value=_FakeResponse({"success": True, "_api_version": 1}),
-        ):
-            out = app._request("POST", "console/execute", data={"command": "1 + 1"})
+    out = app._request("POST", "console/execute", data={"command": "1 + 1"})
 
     assert out.get("success") is True
     assert out.get("selected_view_id") == "0x1234"
@@ -40,6 +40,29 @@ class _NoExecuteBackend:
     pass
 
 
+class _FailingNewSignatureBackend:
+    def __init__(self):
+        self.calls = 0
+
+    def execute_command(self, command: str, *, binary_view=None, timeout: float = 30.0):
+        self.calls += 1
+        raise TypeError("error raised while running the command")
+
+
+class _OpaqueBackend:
+    """Backend whose execute_command signature cannot be inspected."""
+
+    def __init__(self):
+        self.execute_command = _OpaqueTwoArgCallable()
+
+
+class _OpaqueTwoArgCallable:
+    __signature__ = "not a signature"
+
+    def __call__(self, command, binary_view=None):
+        return {"path": "two", "command": command, "binary_view": binary_view}
+
+
 class TestConsoleCaptureAdapter(unittest.TestCase):
     def test_prefers_new_signature(self):
         adapter = ConsoleCaptureAdapter(_NewSignatureBackend())
@@ -60,6 +83,27 @@ class TestConsoleCaptureAdapter(unittest.TestCase):
         self.assertEqual(result["path"], "one")
         self.assertEqual(result["command"], "x = 1")
 
+    def test_backend_type_error_is_not_retried_with_legacy_signatures(self):
+        backend = _FailingNewSignatureBackend()
+        adapter = ConsoleCaptureAdapter(backend)
+        with self.assertRaisesRegex(TypeError, "while running the command"):
+            adapter.execute_command("x = 1", binary_view="bv", timeout=12.5)
+        self.assertEqual(backend.calls, 1)
+
+    def test_uninspectable_signature_falls_back_to_trial_calls(self):
+        adapter = ConsoleCaptureAdapter(_OpaqueBackend())
+        result = adapter.execute_command("x = 1", binary_view="bv", timeout=12.5)
+        self.assertEqual(result["path"], "two")
+        self.assertEqual(result["binary_view"], "bv")
+
+    def test_call_shape_is_resolved_once_per_backend_class(self):
+        adapter_mod._method_call_shape.cache_clear()
+        first = ConsoleCaptureAdapter(_TwoArgBackend())
+        second = ConsoleCaptureAdapter(_TwoArgBackend())
+        self.assertEqual(adapter_mod._method_call_shape.cache_info().misses, 1)
+        self.assertEqual(second.execute_command("x = 1", binary_view="bv")["path"], "two")
+        self.assertEqual(first.execute_command("y = 2")["path"], "two")
+
     def test_missing_execute_command_raises(self):
         adapter = ConsoleCaptureAdapter(_NoExecuteBackend())
         with self.assertRaises(RuntimeError):
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Handler-level unit tests for plugin/server/http_server.py with ``binaryninja`` stubbed."""
+
+from __future__ import annotations
+
+import gzip
+import importlib
+import io
+import json
+import sys
+import types
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from shared.endpoints_manifest import get_endpoint_registry_json
+
+
+PLUGIN_DIR = Path(__file__).resolve().parent / "plugin"
+
+
+def _import_plugin_module(name: str) -> types.ModuleType:
+    """Import ``plugin.<name>`` against a stub ``binaryninja`` without running the plugin init."""
+    bn_module = MagicMock(name="binaryninja")
+    plugin_pkg = types.ModuleType("plugin")
+    plugin_pkg.__path__ = [str(PLUGIN_DIR)]
+    stubs = {"binaryninja": bn_module, "binaryninja.enums": bn_module.enums, "plugin": plugin_pkg}
+    with patch.dict(sys.modules, stubs):
+        return importlib.import_module(f"plugin.{name}")
+
+
+@pytest.fixture(scope="module")
+def http_server():
+    return _import_plugin_module("server.http_server")
+
+
+def _make_handler(http_server, path: str, headers: dict | None = None):
+    """A request handler wired to an in-memory response stream instead of a socket."""
+    handler = object.__new__(http_server.MCPRequestHandler)
+    handler.path = path
+    handler.headers = dict(headers or {})
+    handler.command = "GET"
+    handler.request_version = "HTTP/1.0"
+    handler.requestline = f"GET {path} HTTP/1.0"
+    handler.client_address = ("127.0.0.1", 0)
+    handler.wfile = io.BytesIO()
+    return handler
+
+
+def _response(handler) -> tuple[int, dict[str, str], bytes]:
+    head, _, body = handler.wfile.getvalue().partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    headers = dict(line.split(": ", 1) for line in header_lines)
+    return int(status_line.split()[1]), headers, body
+
+
+def _versioned(http_server, path: str, query: str = "") -> str:
+    version = http_server.expected_api_version(path)
+    return f"{path}?_api_version={version}" + (f"&{query}" if query else "")
+
+
+@pytest.mark.parametrize(
+    ("errors", "start_id", "expected"),
+    [
+        (
+            [{"id": 1}, {"id": 2}, {"id": 3}],
+            1,
+            {"errors": [{"id": 2}, {"id": 3}], "start_id": 1},
+        ),
+        ([], 7, {"errors": [], "start_id": 7}),
+        ([{"id": 1}, {"id": 2}], None, {"errors": [{"id": 1}, {"id": 2}]}),
+        # Without integer ids on every entry the full list is sent and start_id is not echoed,
+        # so the client falls back to diffing.
+        ([{"id": 1}, {"text": "no id"}], 0, {"errors": [{"id": 1}, {"text": "no id"}]}),
+        ([{"id": "1"}], 0, {"errors": [{"id": "1"}]}),
+    ],
+)
+def test_error_probe_payload_filters_and_echoes_start_id(http_server, errors, start_id, expected):
+    assert http_server._error_probe_payload(errors, start_id) == expected
+
+
+@pytest.mark.parametrize(
+    ("path", "capture_getter"),
+    [("/logs/errors", "get_active_log_capture"), ("/console/errors", "get_console_capture")],
+)
+def test_error_endpoints_return_only_entries_after_start_id(
+    http_server, monkeypatch, path, capture_getter
+):
+    capture = MagicMock()
+    capture.get_latest_errors.return_value = [{"id": 4}, {"id": 5}, {"id": 6}]
+    monkeypatch.setattr(http_server, capture_getter, lambda: capture)
+    handler = _make_handler(http_server, _versioned(http_server, path, "count=3&start_id=4"))
+    handler._maybe_refresh_current_view = lambda *args, **kwargs: None
+
+    handler.do_GET()
+
+    status, _headers, body = _response(handler)
+    payload = json.loads(body)
+    assert status == 200
+    capture.get_latest_errors.assert_called_once_with(3)
+    assert payload["errors"] == [{"id": 5}, {"id": 6}]
+    assert payload["start_id"] == 4
+    assert payload["_endpoint"] == path
+
+
+def test_console_capture_ids_stay_monotonic_after_the_buffer_wraps():
+    module = _import_plugin_module("core.console_capture_simple")
+    capture = module.SimpleConsoleCapture(max_entries=3)
+    for index in range(5):
+        capture.add_output("error", f"error {index}")
+
+    assert [entry["id"] for entry in capture.get_output()] == [2, 3, 4]
+    assert [entry["id"] for entry in capture.get_output(start_id=2)] == [3, 4]
+    assert capture.get_output(start_id=4) == []
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "compressed"),
+    [
+        ("gzip, deflate", True),
+        ("deflate, gzip; q=0.5", True),
+        ("GZIP", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0.000", False),
+        # What binja-cli sends with --no-compress.
+        ("identity", False),
+        (None, False),
+    ],
+)
+def test_send_body_negotiates_gzip_for_large_bodies(http_server, accept_encoding, compressed):
+    headers = {} if accept_encoding is None else {"Accept-Encoding": accept_encoding}
+    handler = _make_handler(http_server, "/status", headers)
+    body = b'{"text": "' + b"x" * http_server.GZIP_MIN_BODY_BYTES + b'"}'
+
+    handler._send_body(body, "application/json", 200)
+
+    status, response_headers, sent = _response(handler)
+    assert status == 200
+    assert int(response_headers["Content-Length"]) == len(sent)
+    if compressed:
+        assert response_headers["Content-Encoding"] == "gzip"
+        assert response_headers["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(sent) == body
+    else:
+        assert "Content-Encoding" not in response_headers
+        assert sent == body
+
+
+def test_send_body_never_encodes_bodies_below_the_threshold(http_server):
+    handler = _make_handler(http_server, "/status", {"Accept-Encoding": "gzip"})
+    body = b"x" * (http_server.GZIP_MIN_BODY_BYTES - 1)
+
+    handler._send_body(body, "text/plain; charset=utf-8", 200)
+
+    _status, response_headers, sent = _response(handler)
+    assert "Content-Encoding" not in response_headers
+    assert int(response_headers["Content-Length"]) == len(body)
+    assert sent == body
+
+
+@pytest.mark.parametrize(
+    ("accept", "wants_text"),
+    [
+        ("text/plain, application/json;q=0.9", True),
+        ("Text/Plain", True),
+        ("application/json", False),
+        (None, False),
+    ],
+)
+def test_wants_text_response_follows_accept_header(http_server, accept, wants_text):
+    headers = {} if accept is None else {"Accept": accept}
+    assert _make_handler(http_server, "/decompile", headers)._wants_text_response() is wants_text
+
+
+@pytest.mark.parametrize(
+    ("path", "method_name", "field"),
+    [
+        ("/decompile", "decompile_function", "decompiled"),
+        ("/assembly", "get_assembly_function", "assembly"),
+    ],
+)
+@pytest.mark.parametrize("as_text", [True, False])
+def test_code_endpoints_send_bare_text_only_when_asked(
+    http_server, path, method_name, field, as_text
+):
+    headers = {"Accept": "text/plain, application/json;q=0.9"} if as_text else {}
+    handler = _make_handler(http_server, _versioned(http_server, path, "name=main"), headers)
+    handler.binary_ops = MagicMock()
+    handler.binary_ops.get_function_info.return_value = {"name": "main"}
+    getattr(handler.binary_ops, method_name).return_value = "int main() {}"
+    handler._resolve_request_view = lambda *args, **kwargs: (None, None, [], {})
+    handler._check_binary_loaded = lambda: True
+
+    handler.do_GET()
+
+    status, response_headers, body = _response(handler)
+    assert status == 200
+    if as_text:
+        assert response_headers["Content-Type"] == "text/plain; charset=utf-8"
+        assert body == b"int main() {}"
+    else:
+        assert response_headers["Content-Type"] == "application/json"
+        payload = json.loads(body)
+        assert payload[field] == "int main() {}"
+        assert payload["_api_version"] == http_server.expected_api_version(path)
+    assert response_headers["X-Binja-MCP-Api-Version"] == str(
+        http_server.expected_api_version(path)
+    )
+
+
+@pytest.mark.parametrize("accept_encoding", [None, "gzip"])
+def test_meta_endpoints_cached_body_matches_the_registry(http_server, accept_encoding):
+    headers = {} if accept_encoding is None else {"Accept-Encoding": accept_encoding}
+    handler = _make_handler(http_server, _versioned(http_server, "/meta/endpoints"), headers)
+
+    handler.do_GET()
+
+    status, response_headers, body = _response(handler)
+    assert status == 200
+    if accept_encoding == "gzip":
+        assert response_headers["Content-Encoding"] == "gzip"
+        body = gzip.decompress(body)
+    else:
+        assert "Content-Encoding" not in response_headers
+    assert json.loads(body) == {
+        "endpoints": get_endpoint_registry_json(),
+        "_endpoint": "/meta/endpoints",
+        "_api_version": http_server.expected_api_version("/meta/endpoints"),
+    }
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import os
+import select
+import signal
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from shared.platform import adapter as platform_adapter
+
+
+class _FakeAdapter(platform_adapter._BaseAdapter):
+    def __init__(self, processes: list[tuple[int, str]]):
+        super().__init__()
+        self.processes = processes
+
+    def iter_process_cmdlines(self):
+        yield from self.processes
+
+
+def test_base_adapter_parses_ps_output():
+    stdout = "  1 /sbin/init\n 42 /opt/binaryninja/binaryninja -p 9009\nbad line\n\n7\n"
+    with patch.object(
+        platform_adapter,
+        "_iter_command_output",
+        return_value=iter(stdout.splitlines(keepends=True)),
+    ):
+        rows = list(platform_adapter._BaseAdapter().iter_process_cmdlines())
+
+    assert rows == [(1, "/sbin/init"), (42, "/opt/binaryninja/binaryninja -p 9009")]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="requires /proc")
+def test_linux_adapter_reads_proc_cmdlines():
+    rows = dict(platform_adapter.LinuxAdapter().iter_process_cmdlines())
+
+    assert os.getpid() in rows
+    assert "pytest" in rows[os.getpid()] or "python" in rows[os.getpid()].lower()
+
+
+def test_iter_command_output_kills_process_when_closed_early():
+    script = "import itertools\nfor i in itertools.count():\n    print(i, flush=True)\n"
+    spawned: list[subprocess.Popen] = []
+    real_popen = subprocess.Popen
+
+    def _popen(*args, **kwargs):
+        spawned.append(real_popen(*args, **kwargs))
+        return spawned[-1]
+
+    with patch.object(platform_adapter.subprocess, "Popen", side_effect=_popen):
+        lines = platform_adapter._iter_command_output([sys.executable, "-c", script], timeout_s=10)
+        assert next(lines) == "0\n"
+        lines.close()
+
+    assert spawned and spawned[0].returncode is not None
+
+
+def test_iter_command_output_kills_process_after_timeout():
+    script = "import time\nprint('ready', flush=True)\ntime.sleep(30)\n"
+    started = time.monotonic()
+
+    lines = list(
+        platform_adapter._iter_command_output([sys.executable, "-c", script], timeout_s=0.2)
+    )
+
+    assert lines == ["ready\n"]
+    assert time.monotonic() - started < 10
+
+
+def test_iter_command_output_timeout_kills_forked_children():
+    script = (
+        "import subprocess, time\n"
+        "child = subprocess.Popen(['sleep', '30'])\n"
+        "print(child.pid, flush=True)\n"
+        "time.sleep(30)\n"
+    )
+
+    started = time.monotonic()
+    lines = list(
+        platform_adapter._iter_command_output([sys.executable, "-c", script], timeout_s=0.5)
+    )
+    grandchild = int(lines[0])
+
+    # The grandchild holds stdout open too, so only a group kill ends the read early.
+    assert time.monotonic() - started < 10
+
+    deadline = time.monotonic() + 5
+    while platform_adapter._pid_exists(grandchild) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not platform_adapter._pid_exists(grandchild)
+
+
+def test_find_binary_ninja_pids_matches_path_hint_and_tokens():
+    adapter = _FakeAdapter(
+        [
+            (1, "/opt/binaryninja/binaryninja"),
+            (100, "/opt/binaryninja/binaryninja -p 9009"),
+            (200, "/usr/bin/BinaryNinja --headless"),
+            (300, "/usr/bin/vim notes.txt"),
+        ]
+    )
+
+    hinted = platform_adapter.find_binary_ninja_pids(
+        binary_path="/opt/binaryninja/binaryninja", adapter=adapter
+    )
+    broad = platform_adapter.find_binary_ninja_pids(
+        binary_path="/opt/binaryninja/binaryninja", include_any=True, adapter=adapter
+    )
+
+    assert hinted == [100]
+    assert broad == [100, 200]
+
+
+def test_lower_process_name_tokens_are_computed_once():
+    adapter = platform_adapter.MacOSAdapter()
+
+    assert adapter.lower_process_name_tokens() == tuple(
+        token.lower() for token in adapter.process_name_tokens()
+    )
+    assert adapter.lower_process_name_tokens() is adapter.lower_process_name_tokens()
+
+
+def test_find_binary_ninja_pids_treats_path_hint_as_literal_text():
+    adapter = _FakeAdapter(
+        [
+            (100, "/opt/bin+ninja/binaryninja"),
+            (200, "/opt/binnninja/binaryninja"),
+        ]
+    )
+
+    pids = platform_adapter.find_binary_ninja_pids(
+        binary_path="/opt/bin+ninja/binaryninja", adapter=adapter
+    )
+
+    assert pids == [100]
+    assert platform_adapter.find_binary_ninja_pids(binary_path="", adapter=adapter) == []
+
+
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="requires pidfd_open")
+def test_terminate_pid_tree_returns_as_soon_as_process_exits():
+    proc = subprocess.Popen(["sleep", "30"], start_new_session=True)
+    try:
+        started = time.monotonic()
+        assert platform_adapter.terminate_pid_tree(proc.pid, grace_s=5.0) is True
+        assert time.monotonic() - started < 2.0
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def test_wait_for_pids_exit_times_out_for_live_process():
+    proc = subprocess.Popen(["sleep", "30"])
+    try:
+        assert platform_adapter._wait_for_pids_exit([proc.pid], 0.05) == {proc.pid}
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="requires pidfd_open")
+def test_terminate_pids_shares_one_grace_period():
+    script = "import signal, time\nsignal.signal(signal.SIGTERM, signal.SIG_IGN)\ntime.sleep(30)\n"
+    procs = [
+        subprocess.Popen([sys.executable, "-c", script], start_new_session=True) for _ in range(3)
+    ]
+    try:
+        time.sleep(0.3)
+        started = time.monotonic()
+        terminated = platform_adapter.terminate_pids([proc.pid for proc in procs], grace_s=0.3)
+        elapsed = time.monotonic() - started
+
+        assert sorted(terminated) == sorted(proc.pid for proc in procs)
+        assert elapsed < 0.3 * len(procs)
+    finally:
+        for proc in procs:
+            proc.kill()
+            proc.wait()
+
+
+def test_terminate_pids_skips_sigkill_when_process_exited_at_deadline():
+    with (
+        patch.object(platform_adapter, "_pid_exists", return_value=False),
+        patch.object(
+            platform_adapter, "_signal_pids", side_effect=lambda pids, _sig: list(pids)
+        ) as signal_pids,
+        patch.object(
+            platform_adapter, "_wait_for_pids_exit", side_effect=lambda pids, *_a, **_k: set(pids)
+        ),
+    ):
+        assert platform_adapter.terminate_pids([4242], grace_s=0.1) == [4242]
+
+    assert signal_pids.call_args_list[0].args == ([4242], signal.SIGTERM)
+    assert signal_pids.call_args_list[1].args == ([], signal.SIGKILL)
+
+
+def test_signal_pids_sends_one_killpg_per_led_group():
+    leader = subprocess.Popen(["sleep", "30"], process_group=0)
+    member = subprocess.Popen(["sleep", "30"], process_group=leader.pid)
+    loner = subprocess.Popen(["sleep", "30"])
+    try:
+        with patch.object(
+            platform_adapter, "signal_pid", wraps=platform_adapter.signal_pid
+        ) as signal_pid:
+            reached = platform_adapter._signal_pids(
+                [member.pid, leader.pid, loner.pid], signal.SIGTERM
+            )
+
+        assert reached == [member.pid, leader.pid, loner.pid]
+        assert sorted(call.args[0] for call in signal_pid.call_args_list) == sorted(
+            [leader.pid, loner.pid]
+        )
+        assert member.wait(timeout=5) == -signal.SIGTERM
+    finally:
+        for proc in (leader, member, loner):
+            proc.kill()
+            proc.wait()
+
+
+def test_resolve_binary_path_is_cached_while_binary_is_unchanged(tmp_path):
+    binary = tmp_path / "binaryninja"
+    binary.write_text("#!/bin/sh\n")
+    binary.chmod(0o755)
+    adapter = platform_adapter._BaseAdapter()
+    platform_adapter.invalidate_binary_path_cache()
+
+    assert adapter.resolve_binary_path(explicit_path=str(binary)) == str(binary)
+    with patch.object(adapter, "_resolve_binary_path_uncached") as resolve:
+        assert adapter.resolve_binary_path(explicit_path=str(binary)) == str(binary)
+    resolve.assert_not_called()
+
+    binary.chmod(0o644)
+    assert adapter.resolve_binary_path(explicit_path=str(binary)) is None
+    binary.unlink()
+    assert adapter.resolve_binary_path(explicit_path=str(binary)) is None
+
+
+def test_linux_default_binary_candidates_follow_home(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    candidates = platform_adapter.LinuxAdapter()._default_binary_candidates()
+
+    assert candidates[0] == str(tmp_path / "src" / "binja" / "binaryninja" / "binaryninja")
+    assert candidates[-1] == "/opt/binaryninja/binaryninja"
+
+
+def test_is_executable_regular_requires_regular_file_with_exec_bit(tmp_path):
+    binary = tmp_path / "binaryninja"
+    binary.write_text("#!/bin/sh\n")
+    binary.chmod(0o644)
+
+    assert not platform_adapter._is_executable_regular(str(binary))
+    binary.chmod(0o755)
+    assert platform_adapter._is_executable_regular(str(binary))
+    assert not platform_adapter._is_executable_regular(str(tmp_path))
+    assert not platform_adapter._is_executable_regular(str(tmp_path / "missing"))
+
+
+def test_display_token_pattern_matches_exact_display_number():
+    pattern = platform_adapter.LinuxAdapter._display_token_pattern(":1")
+
+    assert pattern is platform_adapter.LinuxAdapter._display_token_pattern("localhost:1.0")
+    assert pattern.search("xtigervnc :1 -geometry 1920x1080")
+    assert pattern.search("xtigervnc :1.0")
+    assert not pattern.search("xtigervnc :10")
+    assert platform_adapter.LinuxAdapter._display_token_pattern("wayland-0") is None
+
+
+def test_prepare_gui_env_returns_new_dict_without_mutating_source():
+    source = {"PATH": "/usr/bin", "BINJA_QPA_PLATFORM": " Offscreen "}
+
+    env = platform_adapter.MacOSAdapter().prepare_gui_env(source)
+
+    assert env == {**source, "QT_QPA_PLATFORM": "offscreen"}
+    assert "QT_QPA_PLATFORM" not in source
+
+
+def test_linux_prepare_gui_env_applies_wayland_defaults():
+    adapter = platform_adapter.LinuxAdapter()
+    source = {"DISPLAY": ":0", "XDG_RUNTIME_DIR": "/run/user/1234", "XDG_SESSION_TYPE": ""}
+
+    with patch.object(adapter, "_detect_display_backend", return_value=("wayland", "wayland-1")):
+        env = adapter.prepare_gui_env(source)
+
+    assert env == {
+        "WAYLAND_DISPLAY": "wayland-1",
+        "XDG_RUNTIME_DIR": "/run/user/1234",
+        "DBUS_SESSION_BUS_ADDRESS": "unix:path=/run/user/1234/bus",
+        "XDG_SESSION_TYPE": "wayland",
+        "QT_QPA_PLATFORM": "wayland",
+    }
+
+
+def test_linux_prepare_gui_env_overlay_lists_only_changes():
+    adapter = platform_adapter.LinuxAdapter()
+    source = {"PATH": "/usr/bin", "DISPLAY": ":1", "QT_QPA_PLATFORM": "xcb"}
+
+    with patch.object(adapter, "_detect_display_backend", return_value=("x11", ":1")):
+        overlay = adapter.prepare_gui_env_overlay(source)
+        env = adapter.prepare_gui_env(source)
+
+    assert overlay == {"QT_QPA_PLATFORM": None}
+    assert env == {"PATH": "/usr/bin", "DISPLAY": ":1"}
+
+
+def test_gui_launch_env_inherits_the_environment_when_nothing_changes(monkeypatch):
+    monkeypatch.delenv("BINJA_QPA_PLATFORM", raising=False)
+
+    assert platform_adapter.gui_launch_env(platform_adapter.MacOSAdapter()) is None
+
+
+def test_gui_launch_env_applies_the_overlay_to_a_copy(monkeypatch):
+    monkeypatch.setenv("QT_QPA_PLATFORM", "xcb")
+    monkeypatch.setenv("DISPLAY", ":1")
+    adapter = platform_adapter.LinuxAdapter()
+
+    with patch.object(adapter, "_detect_display_backend", return_value=("x11", ":1")):
+        env = platform_adapter.gui_launch_env(adapter)
+
+    assert "QT_QPA_PLATFORM" not in env
+    assert env["DISPLAY"] == ":1"
+    assert env["PATH"] == os.environ["PATH"]
+    assert os.environ["QT_QPA_PLATFORM"] == "xcb"
+
+
+def test_linux_display_backend_detection_is_cached_per_display_inputs():
+    adapter = platform_adapter.LinuxAdapter()
+    env = {"DISPLAY": "", "WAYLAND_DISPLAY": "", "XDG_RUNTIME_DIR": "/nonexistent-runtime"}
+
+    with patch.object(adapter, "_detect_tigervnc_display", return_value=":1") as detect:
+        assert adapter._detect_display_backend(env) == ("x11", ":1")
+        assert adapter._detect_display_backend(dict(env)) == ("x11", ":1")
+        assert detect.call_count == 1
+
+        adapter.refresh()
+        adapter._detect_display_backend(env)
+        assert detect.call_count == 2
+
+
+def test_linux_display_backend_detection_does_not_cache_misses():
+    adapter = platform_adapter.LinuxAdapter()
+    env = {"DISPLAY": "", "WAYLAND_DISPLAY": "", "XDG_RUNTIME_DIR": "/nonexistent-runtime"}
+
+    with patch.object(adapter, "_detect_tigervnc_display", side_effect=[None, ":1"]) as detect:
+        assert adapter._detect_display_backend(env) == (None, None)
+        assert adapter._detect_display_backend(env) == ("x11", ":1")
+        assert adapter._detect_display_backend(env) == ("x11", ":1")
+        assert detect.call_count == 2
+
+
+def test_get_platform_adapter_reuses_instances():
+    linux = platform_adapter.get_platform_adapter("linux")
+
+    assert platform_adapter.get_platform_adapter("linux2") is linux
+    assert isinstance(
+        platform_adapter.get_platform_adapter("darwin"), platform_adapter.MacOSAdapter
+    )
+
+
+def test_terminate_pid_tree_reaps_own_child_without_pidfd():
+    proc = subprocess.Popen(["sleep", "30"], start_new_session=True)
+    try:
+        with patch.object(platform_adapter.os, "pidfd_open", None, create=True):
+            assert platform_adapter.terminate_pid_tree(proc.pid, grace_s=5.0, reap=True) is True
+        assert not platform_adapter._pid_exists(proc.pid)
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def test_read_small_file_handles_short_and_long_contents(tmp_path):
+    short = tmp_path / "short"
+    short.write_bytes(b"a\x00b\x00")
+    long = tmp_path / "long"
+    long.write_bytes(b"x" * 100_000)
+
+    assert platform_adapter._read_small_file(str(short)) == b"a\x00b\x00"
+    assert platform_adapter._read_small_file(str(long)) == b"x" * 100_000
+
+
+def test_signal_pid_targets_group_only_for_group_leaders():
+    leader = platform_adapter.launch_with_new_session(["sleep", "30"])
+    child = subprocess.Popen(["sleep", "30"])
+    try:
+        with (
+            patch.object(platform_adapter.os, "killpg", wraps=os.killpg) as killpg,
+            patch.object(platform_adapter.os, "kill", wraps=os.kill) as kill,
+        ):
+            assert platform_adapter.signal_pid(leader.pid, signal.SIGTERM) is True
+            assert platform_adapter.signal_pid(child.pid, signal.SIGTERM) is True
+
+        killpg.assert_called_once_with(leader.pid, signal.SIGTERM)
+        kill.assert_called_once_with(child.pid, signal.SIGTERM)
+        assert leader.wait(timeout=5) == -signal.SIGTERM
+        assert child.wait(timeout=5) == -signal.SIGTERM
+    finally:
+        for proc in (leader, child):
+            proc.kill()
+            proc.wait()
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "pidfd_open") and not hasattr(select, "kqueue"),
+    reason="requires pidfd or kqueue support",
+)
+def test_exit_watcher_reports_process_exit():
+    proc = subprocess.Popen(["sleep", "30"])
+    watcher = platform_adapter._new_exit_watcher()
+    try:
+        assert watcher.watch(proc.pid) is True
+        assert watcher.wait(0) == []
+        proc.kill()
+        assert watcher.wait(5.0) == [proc.pid]
+    finally:
+        watcher.close()
+        proc.kill()
+        proc.wait()
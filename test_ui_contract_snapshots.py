@@ -13,6 +13,12 @@ from shared.api_versions import (
     UI_CONTRACT_SCHEMA_VERSION,
     expected_api_version,
 )
+from shared.endpoints_manifest import (
+    ENDPOINT_PATHS_BY_METHOD,
+    ENDPOINT_SPECS,
+    EndpointSpec,
+    lookup_endpoint,
+)
 
 THIS_DIR = Path(__file__).resolve().parent
 PLUGIN_DIR = THIS_DIR / "plugin"
@@ -101,6 +107,42 @@ class TestUIContractSnapshots(unittest.TestCase):
         self.assertEqual(payload["warnings"], ["dialog not visible"])
         self.assertEqual(payload["errors"], ["something failed"])
 
+    def test_endpoint_registry_json_matches_specs_and_serialized_bytes(self):
+        registry = api_contracts.get_endpoint_registry_json()
+        self.assertEqual(registry, [spec.as_dict() for spec in ENDPOINT_SPECS])
+        self.assertEqual(json.loads(api_contracts.get_endpoint_registry_json_bytes()), registry)
+
+        registry[0]["path"] = "/mutated"
+        self.assertNotEqual(api_contracts.get_endpoint_registry_json()[0]["path"], "/mutated")
+
+        index = next(i for i, entry in enumerate(registry) if "minimal_params" in entry)
+        registry[index]["minimal_params"]["mutated"] = 1
+        self.assertNotIn(
+            "mutated", api_contracts.get_endpoint_registry_json()[index]["minimal_params"]
+        )
+
+    def test_endpoint_spec_sample_payloads_are_read_only(self):
+        spec = next(spec for spec in ENDPOINT_SPECS if spec.minimal_params)
+        with self.assertRaises(TypeError):
+            spec.minimal_params["limit"] = 1
+        self.assertIsInstance(spec.as_dict()["minimal_params"], dict)
+
+    def test_lookup_endpoint_uses_method_and_normalized_path(self):
+        spec = lookup_endpoint("post", "/ui/open?x=1")
+        self.assertIsNotNone(spec)
+        self.assertEqual((spec.method, spec.path), ("POST", "/ui/open"))
+        self.assertIsNone(lookup_endpoint("GET", "/ui/open"))
+        self.assertIn("/ui/open", ENDPOINT_PATHS_BY_METHOD["POST"])
+        self.assertNotIn("/ui/open", ENDPOINT_PATHS_BY_METHOD["GET"])
+        self.assertEqual(
+            sum(len(paths) for paths in ENDPOINT_PATHS_BY_METHOD.values()), len(ENDPOINT_SPECS)
+        )
+
+    def test_endpoint_spec_canonicalizes_and_interns_method_and_path(self):
+        spec = EndpointSpec("post", "ui/open?inspect_only=1", False)
+        self.assertEqual((spec.method, spec.path), ("POST", "/ui/open"))
+        self.assertIs(spec.path, lookup_endpoint("POST", "/ui/open").path)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -20,9 +20,12 @@ from shared.api_versions import expected_api_version  # noqa: E402
 from shared.platform import (  # noqa: E402
     find_binary_ninja_pids,
     get_platform_adapter,
+    gui_launch_env,
+    launch_with_new_session,
     prepare_log_file,
     signal_pid,
     terminate_pid_tree,
+    terminate_pids,
 )
 
 from mcp_client import McpClient  # noqa: E402
@@ -115,14 +118,7 @@ def _find_running_binja_pids(binary_path: str, include_any: bool = False) -> lis
 
 def _kill_existing_binja_processes(binary_path: str, include_any: bool = False) -> int:
     pids = _find_running_binja_pids(binary_path=binary_path, include_any=include_any)
-    killed = 0
-    for pid in pids:
-        try:
-            terminate_pid_tree(pid, grace_s=0.1)
-            killed += 1
-        except Exception:
-            continue
-    return killed
+    return len(terminate_pids(pids, grace_s=0.1))
 
 
 def _terminate_process(proc: subprocess.Popen | None, grace_s: float = 8.0) -> None:
@@ -245,17 +241,16 @@ def binja_process(base_url: str) -> Generator[subprocess.Popen | None, None, Non
     log_path = os.environ.get("BINJA_LOG_PATH", "/tmp/binja-integration.log")
     pid_file = Path(os.environ.get("BINJA_PID_FILE", "/tmp/binja-integration.pid"))
     _prepare_clean_restart(binary_path=binja_binary, pid_file=pid_file)
-    launch_env = adapter.prepare_gui_env(os.environ.copy())
+    launch_env = gui_launch_env(adapter)
     try:
         prepare_log_file(log_path)
     except Exception:
         pass
     with open(log_path, "ab") as log_fp:
-        proc = subprocess.Popen(
+        proc = launch_with_new_session(
             [binja_binary],
             stdout=log_fp,
             stderr=subprocess.STDOUT,
-            start_new_session=True,
             env=launch_env,
         )
     try:
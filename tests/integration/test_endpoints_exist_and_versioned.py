@@ -53,18 +53,21 @@ def test_every_endpoint_rejects_mismatched_api_version(client, analysis_context)
         path = endpoint["path"]
         params = _resolve_placeholders(endpoint.get("minimal_params") or {}, analysis_context)
         payload = _resolve_placeholders(endpoint.get("minimal_json") or {}, analysis_context)
+        expected = int(endpoint["api_version"])
         response, body = client.request(
             method,
             path,
             params=params,
             json=payload,
-            version_override=int(endpoint["api_version"]) + 99,
+            version_override=expected + 99,
             timeout=20.0,
         )
         assert response.status_code == 409, (
             f"{method} {path} expected 409, got {response.status_code}"
         )
         assert body.get("error") == "Endpoint API version mismatch"
+        assert int(body.get("expected_api_version", -1)) == expected, body
+        assert int(body.get("received_api_version", -1)) == expected + 99, body
 
 
 def test_missing_version_policy(client, analysis_context):
@@ -88,3 +91,4 @@ def test_missing_version_policy(client, analysis_context):
         else:
             assert response.status_code == 400, f"{method} {path} expected 400 without version"
             assert body.get("error") == "Missing endpoint API version"
+            assert int(body.get("expected_api_version", -1)) == int(endpoint["api_version"]), body